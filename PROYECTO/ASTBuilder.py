@@ -1,60 +1,81 @@
 import os
-from Parser import parser, lexer  # Asegúrate de importar lexer desde tu Parser.py
+from Lexer import lexer
+from CompilerSession import CompilerSession
+from ASTNodes import Node
+from TokenDump import TokenDump, format_trace
+
+
+class TraceRecorder:
+    """Anota cada token que lee el parser en el formato de parse_trace"""
+    def __init__(self):
+        self.tokens = []
+
+    def record(self, tok):
+        self.tokens.append({
+            'type': tok.type,
+            'value': tok.value,
+            'lineno': tok.lineno,
+            'lexpos': tok.lexpos
+        })
 
 
 class ASTBuilder:
-    def __init__(self, lexer_error_file=None, parser_error_file=None, parser_trace_file=None):
+    def __init__(self, lexer_error_file=None, parser_error_file=None, parser_trace_file=None,
+                 grammar=None):
+        # Cada builder tiene su propia sesión: no comparte el lexer global con nadie
+        self.session = CompilerSession(grammar or os.environ.get('EVOLA_GRAMMAR', 'right'))
         self.parse_trace = []
+        self.token_dump = None
         self.ast = None
         self.lexer_error_file = lexer_error_file
         self.parser_error_file = parser_error_file
         self.parser_trace_file = parser_trace_file
 
-    def build_ast(self, input_code):
-        """Construye el AST a partir del código de entrada"""
+    def build_ast(self, input_code, trace=None):
+        """Construye el AST a partir del código de entrada
+
+        Con `trace` (un TokenDump o un TraceRecorder), los tokens quedan
+        registrados en la misma pasada. Sin él, si hay parser_trace_file, se
+        arma un TokenDump y se guarda ahí (se lee con `main.py tokens`).
+        """
         try:
-            lexer.input(input_code) # Ensure lexer is reset with the current input
-            self.ast = parser.parse(lexer=lexer) # input_code is implicitly used by lexer
+            dump = None
+            if trace is None and self.parser_trace_file:
+                trace = dump = TokenDump()
+            self.ast = self.session.parse(input_code, trace)
+            self.save_errors_to_files()
+            if dump is not None:
+                self.token_dump = dump
+                self.save_token_dump(self.parser_trace_file)
             return self.ast
         except Exception as e:
             print(f"Error al construir el AST: {str(e)}")
             raise
     
+    def build_ast_from_file(self, path):
+        """Como build_ast, pero leyendo el archivo por partes (CompilerSession.parse_file)"""
+        self.ast = self.session.parse_file(path)
+        self.save_errors_to_files()
+        return self.ast
+
     def trace_parse(self, input_code):
-        """Registra el recorrido del parser al construir el AST"""
-        self.parse_trace = []
-        
-        # Usamos una copia del lexer para el tracing
-        debug_lexer = lexer.clone()
-        debug_lexer.input(input_code)
-        
-        # Tokenización independiente
-        while True:
-            tok = debug_lexer.token()
-            if not tok:
-                break
-            self.parse_trace.append({
-                'type': tok.type,
-                'value': tok.value,
-                'lineno': tok.lineno,
-                'lexpos': tok.lexpos
-            })
-        
-        # Parse real
-        # Assuming lexer (the global one) state is managed correctly if trace_parse is called after build_ast
-        # or if debug_lexer (clone) should be used here too.
-        # For now, sticking to the request for build_ast, but applying same logic here.
-        # If lexer.input(input_code) was just called in build_ast, this parse might be problematic
-        # if it expects a fresh lexer or specific state.
-        # However, trace_parse has its own lexer.input(input_code) with debug_lexer.
-        # The original self.ast = parser.parse(input_code, lexer=lexer) in trace_parse
-        # likely intended to use the global lexer after it was set by a prior build_ast or similar.
-        # Let's assume it should use the global lexer which has been fed input_code.
-        # If trace_parse is independent, it should also call lexer.input(input_code) for the global lexer.
-        # Given build_ast now calls lexer.input(), this parse in trace_parse should also not pass input_code.
-        self.ast = parser.parse(lexer=lexer) # input_code is implicitly used by lexer
+        """Construye el AST y registra el recorrido del parser en una sola pasada
+
+        Los tokens se anotan a medida que el parser los lee (ver TraceRecorder):
+        la entrada se tokeniza y se analiza una sola vez.
+        """
+        recorder = TraceRecorder()
+        self.build_ast(input_code, recorder)
+        self.parse_trace = recorder.tokens
         return self.parse_trace
     
+    def save_errors_to_files(self):
+        """Agrega los errores léxicos y sintácticos de la última compilación a sus archivos"""
+        self.session.diagnostics.flush({
+            'lexico': self.lexer_error_file or "salida/errores_lexicos.txt",
+            'sintactico': self.parser_error_file or "salida/errores_sintacticos.txt",
+        })
+
     def save_ast_to_file(self, filename='salida/ast.txt'):
         """Guarda el AST en un archivo de texto"""
         os.makedirs('salida', exist_ok=True)
@@ -66,7 +87,11 @@ class ASTBuilder:
         if node is None:
             return
             
-        if isinstance(node, tuple):
+        if isinstance(node, Node):
+            file.write('  ' * indent + f"{node.tag}:\n")
+            for child in node.children():
+                self._write_node(file, child, indent + 1)
+        elif isinstance(node, tuple):
             file.write('  ' * indent + f"{node[0]}:\n")
             for child in node[1:]:
                 self._write_node(file, child, indent + 1)
@@ -76,16 +101,17 @@ class ASTBuilder:
         else:
             file.write('  ' * indent + str(node) + '\n')
     
+    def save_token_dump(self, filename='salida/parse_trace.evtk'):
+        """Guarda el volcado binario de tokens de la última compilación"""
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        self.token_dump.save(filename)
+
     def save_trace_to_file(self, filename='salida/parse_trace.txt'):
         """Guarda el recorrido del parser en un archivo de texto"""
         os.makedirs('salida', exist_ok=True)
         with open(filename, 'w', encoding='utf-8') as f:
-            for tok in self.parse_trace:
-                f.write(f"Token: {tok['type']}\n")
-                f.write(f"Valor: {tok['value']}\n")
-                f.write(f"Línea: {tok['lineno']}\n")
-                f.write(f"Posición: {tok['lexpos']}\n")
-                f.write("-" * 40 + "\n")
+            f.write(format_trace((tok['type'], tok['value'], tok['lineno'], tok['lexpos'])
+                                 for tok in self.parse_trace))
     
     def print_ast(self):
         """Imprime el AST de forma legible en consola"""
@@ -100,7 +126,11 @@ class ASTBuilder:
         if node is None:
             return
             
-        if isinstance(node, tuple):
+        if isinstance(node, Node):
+            print('  ' * indent + f"{node.tag}:")
+            for child in node.children():
+                self._print_node(child, indent + 1)
+        elif isinstance(node, tuple):
             print('  ' * indent + f"{node[0]}:")
             for child in node[1:]:
                 self._print_node(child, indent + 1)
@@ -124,26 +154,27 @@ class ASTBuilder:
             print(f"Posición: {tok['lexpos']}")
             print("-" * 40)
 
-def build_and_visualize_ast(input_code):
-    """Función conveniente para construir y visualizar el AST"""
-    builder = ASTBuilder()
+def build_and_visualize_ast(input_code, trace_file='salida/parse_trace.evtk'):
+    """Función conveniente para construir y visualizar el AST
+
+    El recorrido del parser se guarda como volcado binario en `trace_file`;
+    `python main.py tokens <trace_file>` lo muestra como texto.
+    """
+    builder = ASTBuilder(parser_trace_file=trace_file)
     
     try:
-        # Construir AST
+        # Construir AST y registrar el recorrido en la misma pasada
         ast = builder.build_ast(input_code)
         
-        # Registrar recorrido
-        trace = builder.trace_parse(input_code)
-        
         # Guardar resultados
         builder.save_ast_to_file()
-        builder.save_trace_to_file()
         
         # Mostrar en consola
         builder.print_ast()
-        builder.print_parse_trace()
+        print(f"\nRecorrido del parser: {builder.token_dump.count} tokens en {trace_file}"
+              f" (python main.py tokens {trace_file})")
         
-        return ast, trace
+        return ast, builder.token_dump
         
     except Exception as e:
         print(f"\nError durante el análisis: {str(e)}")
@@ -0,0 +1,225 @@
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+
+from ASTNodes import NODE_CLASS_BY_KIND, Node
+from TableCache import cache_dir
+
+# Caché en disco de ASTs: recompilar un archivo que no cambió no vuelve a pasar
+# por el lexer ni por el parser (ni, con checked=True, por SemanticAnalyzer).
+#
+# La clave es el SHA-256 de la fuente junto con la gramática y la versión del
+# front end: el hash del código de los módulos que deciden cómo queda el AST.
+# Cualquier cambio en ellos deja las entradas viejas sin usar, y el límite de
+# tamaño termina por borrarlas.
+#
+# Cada entrada es "EVAS" + versión + marshal de tuplas planas: un nodo es
+# (kind, línea, columna, campos...) y, si el AST está verificado, lleva además
+# su tipo y el índice de su símbolo en una tabla aparte, para que los nodos que
+# compartían un símbolo (la función y sus llamadas) lo sigan compartiendo.
+#
+# El orden LRU es el de la fecha de modificación de los archivos: cada acierto
+# la renueva. El directorio se recorre una sola vez, al primer guardado; desde
+# ahí store() y _remove() llevan la cuenta de bytes. Sólo cuando esa cuenta pasa
+# de max_bytes se vuelve a recorrer, y se borran las entradas más viejas hasta
+# bajar a EVICT_TO de max_bytes, para que los guardados siguientes no tengan
+# que desalojar otra vez.
+
+MAGIC = b"EVAS"
+FORMAT_VERSION = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+EVICT_TO = 0.75  # Fracción de max_bytes que queda ocupada tras desalojar
+# Módulos que determinan el AST (y sus anotaciones, para las entradas verificadas)
+FRONT_END_MODULES = ('Lexer', 'Parser', 'LeftParser', 'ASTNodes', 'SemanticAnalyzer',
+                     'ScopeChecker', 'TypeChecker')
+
+_front_end_version = None
+
+
+def front_end_version():
+    """Hash del código fuente de FRONT_END_MODULES (se calcula una vez por proceso)"""
+    global _front_end_version
+    if _front_end_version is None:
+        h = hashlib.sha256(f"v{FORMAT_VERSION};".encode('utf-8'))
+        for name in FRONT_END_MODULES:
+            __import__(name)
+            with open(sys.modules[name].__file__, 'rb') as f:
+                h.update(name.encode('utf-8') + b"\0" + f.read())
+        _front_end_version = h.hexdigest()[:16]
+    return _front_end_version
+
+
+def _encode(value, checked, symbols, symbol_ids):
+    if isinstance(value, Node):
+        if checked:
+            sym = value.sym
+            index = None
+            if sym is not None:
+                index = symbol_ids.get(id(sym))
+                if index is None:
+                    index = symbol_ids[id(sym)] = len(symbols)
+                    symbols.append(sym)
+            head = (value.kind, value.line, value.col, value.ty, index)
+        else:
+            head = (value.kind, value.line, value.col)
+        return head + tuple([_encode(getattr(value, field), checked, symbols, symbol_ids)
+                             for field in value.fields])
+    if isinstance(value, list):
+        return [_encode(item, checked, symbols, symbol_ids) for item in value]
+    return value
+
+
+def _decode(value, checked, symbols):
+    if isinstance(value, tuple):
+        start = 5 if checked else 3
+        node = NODE_CLASS_BY_KIND[value[0]](*[_decode(item, checked, symbols) for item in value[start:]],
+                                            line=value[1], col=value[2])
+        if checked:
+            node.ty = value[3]
+            if value[4] is not None:
+                node.sym = symbols[value[4]]
+        return node
+    if isinstance(value, list):
+        return [_decode(item, checked, symbols) for item in value]
+    return value
+
+
+def dump_ast(ast, checked=False):
+    """Bytes de un AST de nodos; con checked, también sus tipos y símbolos"""
+    symbols = []
+    tree = _encode(ast, checked, symbols, {})
+    return MAGIC + bytes([FORMAT_VERSION, int(checked)]) + marshal.dumps((tree, symbols))
+
+
+def load_ast(data):
+    """AST (nodos nuevos) a partir de los bytes de dump_ast"""
+    if data[:4] != MAGIC or len(data) < 6 or data[4] != FORMAT_VERSION:
+        raise ValueError(f"No es un AST de Evola (versión {FORMAT_VERSION})")
+    tree, symbols = marshal.loads(data[6:])
+    return _decode(tree, bool(data[5]), symbols)
+
+
+class ASTCache:
+    """ASTs guardados en disco por contenido de la fuente, con límite de tamaño LRU
+
+    `hits`, `misses`, `stores` y `evictions` cuentan lo ocurrido desde que se
+    creó el objeto (stats() los devuelve juntos).
+    """
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or os.path.join(cache_dir(), 'ast')
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._sizes = None  # ruta -> bytes de cada entrada; None hasta el primer recorrido
+        self._total = 0
+
+    def key(self, source, grammar='right', checked=False):
+        h = hashlib.sha256(source.encode('utf-8'))
+        h.update(f";{grammar};{front_end_version()};{int(checked)}".encode('utf-8'))
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.evast')
+
+    def load(self, source, grammar='right', checked=False):
+        """El AST guardado para esta fuente, o None"""
+        path = self._path(self.key(source, grammar, checked))
+        try:
+            with open(path, 'rb') as f:
+                ast = load_ast(f.read())
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, EOFError, TypeError, IndexError) as e:
+            # Entrada corrupta o de otra versión de Python: se descarta
+            print(f"Aviso: se descarta la entrada de caché {path}: {e}", file=sys.stderr)
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # Recién usada: la última en desalojarse
+        except OSError:
+            pass
+        self.hits += 1
+        return ast
+
+    def store(self, source, ast, grammar='right', checked=False):
+        """Guarda el AST (antes de que las fases siguientes lo modifiquen)"""
+        try:
+            data = dump_ast(ast, checked)
+        except ValueError as e:  # Un valor que marshal no sabe guardar
+            print(f"Aviso: no se pudo guardar el AST en la caché: {e}", file=sys.stderr)
+            return
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(self.key(source, grammar, checked))
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if self._sizes is None:
+                self._scan()
+            fd, tmpfile = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmpfile, path)  # Reemplazo atómico entre procesos
+        except OSError as e:
+            print(f"Aviso: no se pudo guardar el AST en la caché: {e}", file=sys.stderr)
+            return
+        self.stores += 1
+        self._total += len(data) - self._sizes.get(path, 0)
+        self._sizes[path] = len(data)
+        if self._total > self.max_bytes:
+            self._evict()
+
+    def _scan(self):
+        """Recorre el directorio: (mtime, bytes, ruta) de cada entrada, y rehace la cuenta"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.evast'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # Otro proceso la acaba de borrar
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        self._sizes = {path: size for _, size, path in entries}
+        self._total = sum(self._sizes.values())
+        return entries
+
+    def _evict(self):
+        # Se vuelve a recorrer: otros procesos pueden haber guardado o usado entradas
+        target = self.max_bytes * EVICT_TO
+        for _, _, path in sorted(self._scan()):
+            if self._total <= target:
+                break
+            if self._remove(path):
+                self.evictions += 1
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            return False
+        if self._sizes is not None:
+            self._total -= self._sizes.pop(path, 0)
+        return True
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.evast'):
+                    self._remove(entry.path)
+        self._sizes = None
+        self._total = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'stores': self.stores, 'evictions': self.evictions}
+
+    def format_stats(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return (f"Caché de AST: {self.hits} aciertos, {self.misses} fallos ({rate:.0f}% de aciertos), "
+                f"{self.stores} guardados, {self.evictions} desalojados")
@@ -0,0 +1,160 @@
+# Nodos del AST.
+#
+# Cada tipo de nodo es una clase con __slots__, una etiqueta entera (`kind`) y su
+# posición en la fuente (`line`, `col`). El análisis semántico anota además el
+# símbolo resuelto (`sym`) y el tipo (`ty`) de cada nodo, y Resolver la dirección
+# (`addr`) de cada variable.
+#
+# Los nodos siguen comportándose como las tuplas que producía antes el parser:
+# node[0] es el nombre del tipo ('if', '+', ...), node[1:] son los campos, se
+# pueden desempaquetar y se comparan igual que la tupla equivalente. as_tuple()
+# devuelve esa tupla simple.
+
+# Campos de cada tipo de nodo, en el orden de la tupla original
+NODE_SPECS = [
+    ('program', 'Program', ('functions',)),
+    ('function', 'Function', ('return_type', 'name', 'params', 'block')),
+    ('main_function', 'MainFunction', ('params', 'block')),
+    ('param', 'Param', ('param_type', 'name')),
+    ('block', 'Block', ('statements',)),
+    ('declaration', 'Declaration', ('var_type', 'name', 'init')),
+    ('assignment', 'Assignment', ('name', 'value')),
+    ('if', 'If', ('condition', 'then_block', 'else_block')),
+    ('while', 'While', ('condition', 'body')),
+    ('for', 'For', ('init', 'condition', 'update', 'body')),
+    ('return', 'Return', ('value',)),
+    ('print', 'Print', ('value',)),
+    ('call', 'Call', ('name', 'args')),
+    ('id', 'Id', ('name',)),
+    ('number', 'Number', ('value',)),
+    ('string', 'String', ('value',)),
+    ('bool', 'Bool', ('value',)),
+    ('or', 'Or', ('left', 'right')),
+    ('and', 'And', ('left', 'right')),
+    ('==', 'Eq', ('left', 'right')),
+    ('!=', 'Ne', ('left', 'right')),
+    ('<', 'Lt', ('left', 'right')),
+    ('>', 'Gt', ('left', 'right')),
+    ('<=', 'Le', ('left', 'right')),
+    ('>=', 'Ge', ('left', 'right')),
+    ('+', 'Add', ('left', 'right')),
+    ('-', 'Sub', ('left', 'right')),
+    ('*', 'Mul', ('left', 'right')),
+    ('/', 'Div', ('left', 'right')),
+    ('%', 'Mod', ('left', 'right')),
+]
+
+BINARY_OPERATORS = ('or', 'and', '==', '!=', '<', '>', '<=', '>=', '+', '-', '*', '/', '%')
+
+
+class Node:
+    """Base de todos los nodos del AST"""
+    __slots__ = ('line', 'col', 'ty', 'sym', 'addr')
+    kind = -1
+    tag = None
+    fields = ()
+
+    def __init__(self, line=None, col=None):
+        self.line = line
+        self.col = col
+        self.ty = None   # Tipo inferido por el análisis semántico
+        self.sym = None  # Símbolo resuelto (variable o función)
+        self.addr = None # (profundidad, ranura) de la variable, puesta por Resolver
+
+    # --- Vista de compatibilidad con las tuplas del parser original ---
+    def __getitem__(self, index):
+        if index == 0:
+            return self.tag
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        if index < 0:
+            index += len(self.fields) + 1
+        return getattr(self, self.fields[index - 1])
+
+    def __len__(self):
+        return len(self.fields) + 1
+
+    def __iter__(self):
+        yield self.tag
+        for field in self.fields:
+            yield getattr(self, field)
+
+    def __eq__(self, other):
+        if isinstance(other, (Node, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    # Mutables y con igualdad estructural: no se pueden hashear. Para usar un
+    # nodo como clave por identidad, se usa id(nodo).
+    __hash__ = None
+
+    def children(self):
+        return [getattr(self, field) for field in self.fields]
+
+    def as_tuple(self):
+        """Tupla simple equivalente (recursiva), como la del parser original"""
+        return (self.tag,) + tuple(_as_tuple(getattr(self, field)) for field in self.fields)
+
+    def __repr__(self):
+        return repr(self.as_tuple())
+
+
+def _as_tuple(value):
+    if isinstance(value, Node):
+        return value.as_tuple()
+    if isinstance(value, list):
+        return [_as_tuple(item) for item in value]
+    return value
+
+
+KIND_NAMES = []     # kind -> etiqueta ('program', 'if', '+', ...)
+KIND = {}           # etiqueta -> kind
+NODE_CLASSES = {}   # etiqueta -> clase
+NODE_CLASS_BY_KIND = []
+
+def _make_init(fields):
+    """Genera un __init__ con un parámetro por campo (evita setattr en bucle)"""
+    params = ''.join(f"{field}, " for field in fields)
+    body = ''.join(f"    self.{field} = {field}\n" for field in fields)
+    namespace = {}
+    exec(f"def __init__(self, {params}line=None, col=None):\n{body}"
+         f"    self.line = line\n    self.col = col\n"
+         f"    self.ty = None\n    self.sym = None\n    self.addr = None\n", namespace)
+    return namespace['__init__']
+
+for _kind, (_tag, _name, _fields) in enumerate(NODE_SPECS):
+    _cls = type(_name + 'Node', (Node,), {
+        '__slots__': _fields,
+        '__module__': __name__,
+        '__init__': _make_init(_fields),
+        'kind': _kind,
+        'tag': _tag,
+        'fields': _fields,
+    })
+    globals()[_cls.__name__] = _cls  # Nombre importable (pickle, depuración)
+    KIND_NAMES.append(_tag)
+    KIND[_tag] = _kind
+    NODE_CLASSES[_tag] = _cls
+    NODE_CLASS_BY_KIND.append(_cls)
+
+BINARY_KINDS = frozenset(KIND[op] for op in BINARY_OPERATORS)
+
+
+def node_at(pos, tag, *fields):
+    """Crea un nodo del tipo `tag` con la posición (línea, columna) dada"""
+    if pos is None:
+        return NODE_CLASSES[tag](*fields)
+    return NODE_CLASSES[tag](*fields, line=pos[0], col=pos[1])
+
+
+def node_position(node):
+    """Posición (línea, columna) de un nodo, o None si no la tiene"""
+    line = getattr(node, 'line', None)
+    if line is None:
+        return None
+    return line, getattr(node, 'col', None)
+
+
+def is_node(value):
+    """Verdadero para nodos del AST y para las tuplas del formato anterior"""
+    return isinstance(value, (Node, tuple))
@@ -0,0 +1,168 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ASTCache import ASTCache
+from CompilerSession import CompilerSession
+from Diagnostics import Diagnostic
+
+DEFAULT_EXTENSIONS = ('.evl', '.txt')
+
+# Sesión del proceso trabajador: se crea una sola vez en _init_worker
+_worker_session = None
+
+
+def collect_sources(patterns, extensions=DEFAULT_EXTENSIONS):
+    """Expande directorios y patrones glob a una lista ordenada de archivos"""
+    found = []
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = []
+            for root, _, files in os.walk(pattern):
+                candidates.extend(os.path.join(root, name) for name in files
+                                  if name.endswith(tuple(extensions)))
+            candidates.sort()
+        else:
+            candidates = sorted(glob.glob(pattern, recursive=True))
+        for path in candidates:
+            if os.path.isfile(path) and path not in seen:
+                seen.add(path)
+                found.append(path)
+    return found
+
+
+def _init_worker(grammar, cache_directory=None):
+    """Calienta el trabajador: lexer, tablas LALR y sesión se cargan una vez
+
+    El lote sólo informa diagnósticos, así que la sesión no optimiza: con la
+    caché llena, un archivo sólo se lee, se deserializa y se resuelve.
+    """
+    global _worker_session
+    cache = ASTCache(cache_directory) if cache_directory is not None else None
+    _worker_session = CompilerSession(grammar, optimize=False, cache=cache)
+
+
+def compile_file(path, session):
+    """Compila un archivo y devuelve un resumen serializable"""
+    start = time.perf_counter()
+    try:
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        hits = session.cache.hits if session.cache is not None else 0
+        result = session.compile(source)
+        cached = session.cache is not None and session.cache.hits > hits
+        errors = result.errors
+        if result.ast is None and not errors:
+            errors = [Diagnostic('sintactico', "No se pudo construir el AST")]
+    except Exception as e:  # Un archivo roto no debe tumbar todo el lote
+        errors = [Diagnostic('interno', f"{type(e).__name__}: {e}")]
+        cached = False
+    return {'path': path, 'errors': errors, 'seconds': time.perf_counter() - start, 'cached': cached}
+
+
+def _compile_chunk(paths):
+    return [compile_file(path, _worker_session) for path in paths]
+
+
+def compile_batch(paths, jobs=None, grammar='right', chunk_size=8, cache_directory=None):
+    """Reparte los archivos entre procesos y devuelve los resultados según terminan.
+
+    Los archivos se envían en lotes pequeños: los trabajadores libres toman el
+    siguiente lote de la cola compartida, así que los archivos lentos no frenan
+    a los demás núcleos. Con `cache_directory`, los trabajadores comparten una
+    ASTCache en ese directorio.
+    """
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(grammar, cache_directory)) as pool:
+        futures = [pool.submit(_compile_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+class BatchReport:
+    """Une los diagnósticos y tiempos de todos los archivos en un solo reporte"""
+    def __init__(self):
+        self.results = []
+        self.start = time.perf_counter()
+        self.wall_seconds = 0.0
+
+    def add(self, result):
+        self.results.append(result)
+
+    def finish(self):
+        self.wall_seconds = time.perf_counter() - self.start
+
+    @property
+    def failed(self):
+        return [r for r in self.results if r['errors']]
+
+    def summary(self):
+        total = len(self.results)
+        cpu = sum(r['seconds'] for r in self.results)
+        rate = total / self.wall_seconds if self.wall_seconds else 0.0
+        cached = sum(1 for r in self.results if r.get('cached'))
+        return (f"Archivos: {total}, con errores: {len(self.failed)}, "
+                f"tiempo total: {self.wall_seconds:.2f} s, tiempo por archivo (suma): {cpu:.2f} s, "
+                f"{rate:.1f} archivos/s" + (f", desde la caché de AST: {cached}" if cached else ""))
+
+    def to_text(self):
+        lines = ["=== REPORTE DE COMPILACIÓN POR LOTES ===", self.summary(), ""]
+        for result in sorted(self.results, key=lambda r: r['path']):
+            status = "ERROR" if result['errors'] else "OK"
+            lines.append(f"[{status}] {result['path']} ({result['seconds'] * 1000:.1f} ms)")
+            for diagnostic in result['errors']:
+                lines.append(f"  - ({diagnostic.phase}) " + diagnostic.format().replace("\n", "\n    "))
+        return "\n".join(lines) + "\n"
+
+    def save(self, filename):
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(self.to_text())
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(prog='main.py batch',
+                                         description="Compila muchos archivos en paralelo")
+    arg_parser.add_argument('paths', nargs='+', help="archivos, directorios o patrones glob")
+    arg_parser.add_argument('-j', '--jobs', type=int, default=None,
+                            help="número de procesos (por defecto, todos los núcleos)")
+    arg_parser.add_argument('--grammar', choices=('right', 'left'), default='right')
+    arg_parser.add_argument('--ext', action='append', default=None,
+                            help="extensión a buscar en directorios (repetible)")
+    arg_parser.add_argument('--reporte', default='salida/reporte_lote.txt')
+    arg_parser.add_argument('-q', '--quiet', action='store_true',
+                            help="no imprimir cada archivo al terminar")
+    arg_parser.add_argument('--cache', nargs='?', const='', default=None, metavar='DIRECTORIO',
+                            help="reutiliza los AST de corridas anteriores (por defecto, en la caché del usuario)")
+    args = arg_parser.parse_args(argv)
+
+    paths = collect_sources(args.paths, tuple(args.ext) if args.ext else DEFAULT_EXTENSIONS)
+    if not paths:
+        print("No se encontraron archivos para compilar.")
+        return 1
+
+    report = BatchReport()
+    cache_directory = None
+    if args.cache is not None:
+        cache_directory = args.cache or ASTCache().directory
+    for result in compile_batch(paths, jobs=args.jobs, grammar=args.grammar,
+                                cache_directory=cache_directory):
+        report.add(result)
+        if not args.quiet:
+            status = "❌" if result['errors'] else "✅"
+            print(f"{status} {result['path']} ({result['seconds'] * 1000:.1f} ms)")
+    report.finish()
+    report.save(args.reporte)
+
+    print(report.summary())
+    print(f"Reporte guardado en {args.reporte}")
+    return 1 if report.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
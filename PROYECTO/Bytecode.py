@@ -0,0 +1,429 @@
+import marshal
+from array import array
+
+from Interpreter import OPERATOR_FUNCTIONS, INT_OPERATOR_FUNCTIONS
+from Runtime import DEFAULT_VALUES, conversion
+from Visitor import Visitor
+
+# Código de bytes de pila.
+#
+# Cada instrucción ocupa cinco enteros de un array('i'): código de operación y
+# cuatro operandos (a, b, c, d; 0 los que no usa). Los literales
+# number/string/bool van a la tabla de constantes del programa y se cargan por
+# índice; las variables se leen y escriben por ranura (Resolver); las funciones
+# se llaman por índice. Los saltos llevan siempre su destino en d, contado en
+# instrucciones.
+#
+# Los operadores binarios comparten una sola instrucción cuyo argumento es el
+# índice del operador en OPERATORS; así el bucle de despacho es corto. El resto
+# son superinstrucciones para los patrones más comunes, que ahorran vueltas al
+# bucle de despacho:
+#
+#   x op k, x op y        LOAD_BINARY_CONST / LOAD_BINARY_LOAD
+#   x = k                 STORE_CONST
+#   x = x op e            UPDATE*, ADD* para + entre números y APPEND* para
+#                         cadenas (agrega al final sin copiar, ver VM)
+#   if (x op k) ...       JUMP_IF_* / JUMP_UNLESS_*: comparar y saltar
+#   if (x) ...            JUMP_IF_SLOT / JUMP_UNLESS_SLOT
+#   return x              RETURN_LOAD
+#
+# Los bucles evalúan la condición al final (un salto inicial lleva hasta ella),
+# así que cada vuelta termina en un solo salto condicional hacia el cuerpo.
+
+# Agrupados por rango (valores, actualizaciones, saltos, llamadas y el resto):
+# VM despacha primero por grupo y después dentro de él
+OPCODES = [
+    'LOAD',               # a: ranura -> apila la variable
+    'STORE',              # a: ranura <- desapila
+    'CONST',              # a: índice en la tabla de constantes
+    'STORE_CONST',        # ranura a <- constante b
+    'BINARY',             # a: operador; desapila los dos operandos
+    'BINARY_CONST',       # a: operador, b: constante (operando derecho)
+    'BINARY_LOAD',        # a: operador, b: ranura (operando derecho)
+    'LOAD_BINARY_CONST',  # apila ranura a (op b) constante c
+    'LOAD_BINARY_LOAD',   # apila ranura a (op b) ranura c
+
+    'UPDATE',             # ranura a = ranura a (op b) desapilado
+    'UPDATE_CONST',       # ranura a = ranura a (op b) constante c
+    'UPDATE_LOAD',        # ranura a = ranura a (op b) ranura c
+    'ADD',                # ranura a += desapilado (números)
+    'ADD_CONST',          # ranura a += constante b (números)
+    'APPEND',             # ranura a += desapilado (cadenas, sin copiar)
+    'APPEND_CONST',       # ranura a += constante b (cadenas, sin copiar)
+
+    'JUMP',               # d: destino
+    'JUMP_IF_FALSE',      # d: destino; desapila la condición
+    'JUMP_IF_TRUE',       # d: destino; desapila la condición
+    'JUMP_IF_CONST',      # salta a d si ranura a (op b) constante c
+    'JUMP_UNLESS_CONST',  # salta a d si no
+    'JUMP_IF_LOAD',       # salta a d si ranura a (op b) ranura c
+    'JUMP_UNLESS_LOAD',   # salta a d si no
+    'JUMP_IF_SLOT',       # salta a d si la ranura a es verdadera
+    'JUMP_UNLESS_SLOT',   # salta a d si no
+    'JUMP_IF_FALSE_OR_POP',  # && : si es falso salta a d y lo deja en la pila
+    'JUMP_IF_TRUE_OR_POP',   # || : si es verdadero salta a d y lo deja en la pila
+
+    'CALL',               # a: índice de función; los argumentos están en la pila
+    'RETURN',             # devuelve el tope de la pila
+    'RETURN_LOAD',        # devuelve la ranura a
+    'RETURN_DEFAULT',     # devuelve el valor por defecto del tipo de retorno
+    'PRINT',
+    'POP',
+    'TO_INT', 'TO_FLOAT',
+]
+for _code, _name in enumerate(OPCODES):
+    globals()[_name] = _code
+WIDTH = 5  # Enteros por instrucción
+
+# (símbolo, función); / y % aparecen dos veces: general y entera (semántica de C)
+OPERATORS = ([(op, function) for op, function in OPERATOR_FUNCTIONS.items()] +
+             [('i' + op, INT_OPERATOR_FUNCTIONS[op]) for op in ('/', '%')])
+OPERATOR_INDEX = {op: i for i, (op, _) in enumerate(OPERATORS)}
+
+# Qué es cada operando (a, b, c, d) de cada instrucción, para desensamblar y
+# para que VM los traduzca a valores: ranura, operador, constante, función o destino
+OPERANDS = {
+    LOAD: 's', STORE: 's', CONST: 'k', STORE_CONST: 'sk',
+    BINARY: 'o', BINARY_CONST: 'ok', BINARY_LOAD: 'os',
+    LOAD_BINARY_CONST: 'sok', LOAD_BINARY_LOAD: 'sos',
+    UPDATE: 'so', UPDATE_CONST: 'sok', UPDATE_LOAD: 'sos',
+    ADD: 's', ADD_CONST: 'sk', APPEND: 's', APPEND_CONST: 'sk',
+    JUMP: '...t', JUMP_IF_FALSE: '...t', JUMP_IF_TRUE: '...t',
+    JUMP_IF_CONST: 'sokt', JUMP_UNLESS_CONST: 'sokt',
+    JUMP_IF_LOAD: 'sost', JUMP_UNLESS_LOAD: 'sost',
+    JUMP_IF_SLOT: 's..t', JUMP_UNLESS_SLOT: 's..t',
+    JUMP_IF_FALSE_OR_POP: '...t', JUMP_IF_TRUE_OR_POP: '...t',
+    CALL: 'f', RETURN_LOAD: 's',
+}
+
+CONVERSION_OPCODES = {int: TO_INT, float: TO_FLOAT}
+_CONSTANT_TAGS = ('number', 'string', 'bool')
+
+MAGIC = b'EVBC'
+FORMAT_VERSION = 2
+
+
+class Function:
+    """Código de una función y lo necesario para crear su activación"""
+    __slots__ = ('name', 'param_count', 'frame_size', 'default', 'code')
+
+    def __init__(self, name, param_count, frame_size, default, code):
+        self.name = name
+        self.param_count = param_count
+        self.frame_size = frame_size
+        self.default = default  # Valor de RETURN_DEFAULT
+        self.code = code        # array('i')
+
+
+class Program:
+    """Programa compilado: funciones, tabla de constantes e índice por nombre"""
+    def __init__(self, functions, constants):
+        self.functions = functions
+        self.constants = constants
+        self.index = {function.name: i for i, function in enumerate(functions)}
+
+    def save(self, path):
+        """Escribe el programa en un archivo binario (.evbc)"""
+        functions = tuple((f.name, f.param_count, f.frame_size, f.default, f.code.tobytes())
+                          for f in self.functions)
+        with open(path, 'wb') as f:
+            f.write(MAGIC + bytes([FORMAT_VERSION]))
+            f.write(marshal.dumps((functions, tuple(self.constants))))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:4] != MAGIC or data[4] != FORMAT_VERSION:
+            raise ValueError(f"'{path}' no es código de bytes de Evola (versión {FORMAT_VERSION})")
+        functions, constants = marshal.loads(data[5:])
+        return cls([Function(name, param_count, frame_size, default, array('i', code))
+                    for name, param_count, frame_size, default, code in functions],
+                   list(constants))
+
+    def disassemble(self):
+        """Listado legible del código de cada función"""
+        lines = []
+        for function in self.functions:
+            lines.append(f"{function.name} (parámetros: {function.param_count}, "
+                         f"ranuras: {function.frame_size}):")
+            code = function.code
+            for index in range(len(code) // WIDTH):
+                op, *operands = code[index * WIDTH:(index + 1) * WIDTH]
+                parts = []
+                for kind, value in zip(OPERANDS.get(op, ''), operands):
+                    if kind == 's':
+                        parts.append(f"[{value}]")
+                    elif kind == 'o':
+                        parts.append(OPERATORS[value][0])
+                    elif kind == 'k':
+                        parts.append(repr(self.constants[value]))
+                    elif kind == 'f':
+                        parts.append(self.functions[value].name)
+                    elif kind == 't':
+                        parts.append(f"-> {value}")
+                lines.append(f"  {index:5d}  {OPCODES[op]:<22}{' '.join(parts)}".rstrip())
+        return "\n".join(lines)
+
+
+class BytecodeCompiler(Visitor):
+    """Traduce un AST verificado y resuelto (CompilationResult) a un Program"""
+    DISPATCH = {
+        'statement': {
+            'declaration': '_compile_declaration',
+            'assignment': '_compile_assignment',
+            'if': '_compile_if',
+            'while': '_compile_while',
+            'for': '_compile_for',
+            'return': '_compile_return',
+            'print': '_compile_print',
+            'call': '_compile_call_statement',
+        },
+        'expression': {
+            'number': '_compile_constant',
+            'string': '_compile_constant',
+            'bool': '_compile_constant',
+            'id': '_compile_id',
+            'call': '_compile_call',
+            'and': '_compile_and',
+            'or': '_compile_or',
+            **{op: '_compile_binary' for op in OPERATOR_FUNCTIONS},
+        },
+    }
+
+    def __init__(self):
+        self.constants = []
+        self._constant_index = {}  # (tipo, valor) -> índice; 1, 1.0 y true no se mezclan
+        self._function_index = {}
+        self._param_types = {}
+        self._code = None
+
+    def compile_program(self, ast, frame_sizes):
+        functions = []
+        for func in ast[1]:
+            name, return_type, params_list, _ = _signature(func)
+            self._function_index[name] = len(functions)
+            self._param_types[name] = [param[1] for param in params_list]
+            functions.append(Function(name, len(params_list), frame_sizes[name],
+                                      DEFAULT_VALUES.get(return_type), None))
+        for func, function in zip(ast[1], functions):
+            _, self._return_type, _, block_node = _signature(func)
+            self._code = []
+            self._compile_statements(block_node[1])
+            self._emit(RETURN_DEFAULT)
+            function.code = array('i', self._code)
+        return Program(functions, self.constants)
+
+    # --- Emisión ---
+
+    def _emit(self, op, a=0, b=0, c=0, d=0):
+        """Agrega una instrucción y devuelve su índice"""
+        self._code.extend((op, a, b, c, d))
+        return len(self._code) // WIDTH - 1
+
+    def _here(self):
+        return len(self._code) // WIDTH
+
+    def _patch(self, jumps, target=None):
+        """Apunta los saltos emitidos en `jumps` a `target` (por defecto, aquí)"""
+        target = self._here() if target is None else target
+        for at in jumps:
+            self._code[at * WIDTH + 4] = target
+
+    def _constant(self, value):
+        key = (type(value), value)
+        index = self._constant_index.get(key)
+        if index is None:
+            index = self._constant_index[key] = len(self.constants)
+            self.constants.append(value)
+        return index
+
+    # --- Instrucciones ---
+
+    def _compile_statements(self, statements):
+        for stmt in statements:
+            self.handler_for('statement', stmt)(self, stmt)
+
+    def _compile_declaration(self, decl):
+        _, var_type, _, init = decl
+        if init is None:
+            self._emit(STORE_CONST, decl.addr[1], self._constant(DEFAULT_VALUES[var_type]))
+        else:
+            self._compile_store(init, var_type, decl.addr[1])
+
+    def _compile_assignment(self, assign):
+        _, _, value = assign
+        slot = assign.addr[1]
+        if (value[0] in OPERATOR_FUNCTIONS and value[1][0] == 'id' and value[1].addr == assign.addr
+                and conversion(assign.ty, value.ty) is None):
+            # x = x op e: se actualiza la ranura sin apilar x
+            op, right = _operator(value), value[2]
+            if op == '+':
+                # Cadenas y números por separado: cada instrucción ve un solo tipo
+                single, popped = (APPEND_CONST, APPEND) if value.ty == 'string' else (ADD_CONST, ADD)
+                if right[0] in _CONSTANT_TAGS:
+                    self._emit(single, slot, self._constant(right[1]))
+                else:
+                    self._compile_expression(right)
+                    self._emit(popped, slot)
+            elif right[0] in _CONSTANT_TAGS:
+                self._emit(UPDATE_CONST, slot, OPERATOR_INDEX[op], self._constant(right[1]))
+            elif right[0] == 'id':
+                self._emit(UPDATE_LOAD, slot, OPERATOR_INDEX[op], right.addr[1])
+            else:
+                self._compile_expression(right)
+                self._emit(UPDATE, slot, OPERATOR_INDEX[op])
+            return
+        self._compile_store(value, assign.ty, slot)
+
+    def _compile_store(self, value, target_type, slot):
+        if value[0] in _CONSTANT_TAGS and conversion(target_type, value.ty) is None:
+            self._emit(STORE_CONST, slot, self._constant(value[1]))
+        else:
+            self._compile_converted(value, target_type)
+            self._emit(STORE, slot)
+
+    def _compile_if(self, if_stmt):
+        _, condition, then_block, else_block = if_stmt
+        to_else = self._compile_jump(condition, False)
+        self._compile_statements(then_block[1])
+        if else_block is None:
+            self._patch(to_else)
+            return
+        to_end = self._emit(JUMP)
+        self._patch(to_else)
+        self._compile_statements(else_block[1])
+        self._patch([to_end])
+
+    def _compile_loop(self, condition, statements, update=None):
+        # La condición va al final: cada vuelta termina en un solo salto
+        to_condition = self._emit(JUMP)
+        start = self._here()
+        self._compile_statements(statements)
+        if update is not None:
+            self._compile_assignment(update)
+        self._patch([to_condition])
+        self._patch(self._compile_jump(condition, True), start)
+
+    def _compile_while(self, while_stmt):
+        _, condition, body = while_stmt
+        self._compile_loop(condition, body[1])
+
+    def _compile_for(self, for_stmt):
+        _, init, condition, update, body = for_stmt
+        self._compile_assignment(init)
+        self._compile_loop(condition, body[1], update)
+
+    def _compile_jump(self, condition, when):
+        """Salta si la condición vale `when`; devuelve los saltos sin destino"""
+        tag = condition[0]
+        if tag in ('and', 'or'):
+            # && salta por falso si basta el izquierdo; || por verdadero
+            short_circuit = tag == 'or'
+            if when == short_circuit:
+                return self._compile_jump(condition[1], when) + self._compile_jump(condition[2], when)
+            skip = self._compile_jump(condition[1], short_circuit)
+            jumps = self._compile_jump(condition[2], when)
+            self._patch(skip)
+            return jumps
+        if tag == 'id':
+            return [self._emit(JUMP_IF_SLOT if when else JUMP_UNLESS_SLOT, condition.addr[1])]
+        if tag in OPERATOR_FUNCTIONS and condition[1][0] == 'id':
+            left, right = condition[1].addr[1], condition[2]
+            if right[0] in _CONSTANT_TAGS:
+                op = JUMP_IF_CONST if when else JUMP_UNLESS_CONST
+                return [self._emit(op, left, OPERATOR_INDEX[_operator(condition)], self._constant(right[1]))]
+            if right[0] == 'id':
+                op = JUMP_IF_LOAD if when else JUMP_UNLESS_LOAD
+                return [self._emit(op, left, OPERATOR_INDEX[_operator(condition)], right.addr[1])]
+        self._compile_expression(condition)
+        return [self._emit(JUMP_IF_TRUE if when else JUMP_IF_FALSE)]
+
+    def _compile_return(self, return_stmt):
+        value = return_stmt[1]
+        if value is None:
+            self._emit(RETURN_DEFAULT)
+        elif value[0] == 'id' and conversion(self._return_type, value.ty) is None:
+            self._emit(RETURN_LOAD, value.addr[1])
+        else:
+            self._compile_converted(value, self._return_type)
+            self._emit(RETURN)
+
+    def _compile_print(self, print_stmt):
+        self._compile_expression(print_stmt[1])
+        self._emit(PRINT)
+
+    def _compile_call_statement(self, call):
+        self._compile_call(call)
+        self._emit(POP)
+
+    # --- Expresiones ---
+
+    def _compile_expression(self, expr):
+        self.handler_for('expression', expr)(self, expr)
+
+    def _compile_converted(self, expr, target_type):
+        self._compile_expression(expr)
+        convert = conversion(target_type, expr.ty)
+        if convert is not None:
+            self._emit(CONVERSION_OPCODES[convert])
+
+    def _compile_constant(self, expr):
+        self._emit(CONST, self._constant(expr[1]))
+
+    def _compile_id(self, expr):
+        self._emit(LOAD, expr.addr[1])
+
+    def _compile_call(self, call):
+        for arg, param_type in zip(call[2], self._param_types[call[1]]):
+            self._compile_converted(arg, param_type)
+        self._emit(CALL, self._function_index[call[1]])
+
+    def _compile_and(self, expr):
+        self._compile_expression(expr[1])
+        to_end = self._emit(JUMP_IF_FALSE_OR_POP)
+        self._compile_expression(expr[2])
+        self._patch([to_end])
+
+    def _compile_or(self, expr):
+        self._compile_expression(expr[1])
+        to_end = self._emit(JUMP_IF_TRUE_OR_POP)
+        self._compile_expression(expr[2])
+        self._patch([to_end])
+
+    def _compile_binary(self, expr):
+        _, left, right = expr
+        operator_index = OPERATOR_INDEX[_operator(expr)]
+        if left[0] == 'id' and right[0] in _CONSTANT_TAGS:
+            self._emit(LOAD_BINARY_CONST, left.addr[1], operator_index, self._constant(right[1]))
+        elif left[0] == 'id' and right[0] == 'id':
+            self._emit(LOAD_BINARY_LOAD, left.addr[1], operator_index, right.addr[1])
+        else:
+            self._compile_expression(left)
+            if right[0] in _CONSTANT_TAGS:
+                self._emit(BINARY_CONST, operator_index, self._constant(right[1]))
+            elif right[0] == 'id':
+                self._emit(BINARY_LOAD, operator_index, right.addr[1])
+            else:
+                self._compile_expression(right)
+                self._emit(BINARY, operator_index)
+
+
+def _operator(expr):
+    """Símbolo en OPERATORS de un nodo binario: / y % enteros llevan 'i'"""
+    op = expr[0]
+    if op in ('/', '%') and expr[1].ty == 'int' and expr[2].ty == 'int':
+        return 'i' + op
+    return op
+
+
+def _signature(func):
+    """(nombre, tipo de retorno, parámetros, bloque) de una función o de main"""
+    if func[0] == 'function':
+        _, return_type, name, params_list, block_node = func
+        return name, return_type, params_list, block_node
+    return 'main', 'void', func[1], func[2]
+
+
+def compile_program(ast, frame_sizes):
+    return BytecodeCompiler().compile_program(ast, frame_sizes)
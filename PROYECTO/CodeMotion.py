@@ -0,0 +1,316 @@
+from ASTNodes import BINARY_KINDS, KIND, node_at, node_position
+from Optimizer import is_constant
+
+# Eliminación de subexpresiones comunes y movimiento de código invariante.
+#
+# Trabaja sobre el AST verificado, después de Optimizer y DeadCode y antes de
+# Resolver. Las variables se identifican por su símbolo (`sym`, el que puso el
+# análisis de ámbitos), no por su nombre: así una variable que oculta a otra no
+# se confunde con ella.
+#
+# Sólo se mueven o comparten expresiones binarias puras: sin llamadas (una
+# función del usuario puede imprimir o no terminar, así que se tratan como
+# opacas) y sin / o % cuyo divisor pueda ser 0 (adelantarlas podría adelantar
+# el error). Evaluarlas antes o una sola vez no cambia el resultado: el
+# lenguaje no tiene variables globales ni referencias, así que sólo una
+# asignación a uno de sus operandos puede cambiar su valor.
+#
+# - Invariantes de bucle: en un while o for, cada expresión máxima cuyos
+#   operandos no se asignan en ninguna parte del bucle (condición, cuerpo,
+#   bucles anidados, inicialización y paso del for) se calcula una vez en un
+#   temporal declarado justo antes del bucle. Los bucles se tratan de fuera
+#   hacia dentro, así una expresión invariante de ambos bucles sale de los dos.
+# - Subexpresiones comunes: en cada tramo de instrucciones sin saltos (un
+#   bloque básico), una expresión que se repite sin que cambien sus operandos
+#   entre una aparición y otra se calcula una vez en un temporal.
+#
+# Los temporales se llaman _t1, _t2, ..., saltando los nombres que ya usa el
+# programa, y llevan su propio símbolo y el tipo de la expresión, de modo que
+# las conversiones int<->float de los backends no cambian.
+
+_LOOPS = ('while', 'for')
+# Instrucciones que no saltan: forman los bloques básicos
+_STRAIGHT = ('declaration', 'assignment', 'print', 'call', 'return')
+_ID = KIND['id']
+
+
+def expression_key(expr):
+    """Clave estructural de una expresión pura, o None si no se puede mover"""
+    if expr.kind == _ID:
+        return ('id', id(expr.sym))
+    if is_constant(expr):
+        return ('const', type(expr[1]), expr[1])
+    if expr.kind not in BINARY_KINDS:
+        return None
+    if expr[0] in ('/', '%') and not (is_constant(expr.right) and expr.right[1] != 0):
+        return None
+    left, right = expression_key(expr.left), expression_key(expr.right)
+    if left is None or right is None:
+        return None
+    return (expr[0], left, right)
+
+
+def _reads(key, found):
+    """Símbolos (id) que lee la expresión de clave `key`"""
+    if key[0] == 'id':
+        found.add(key[1])
+    elif key[0] != 'const':
+        _reads(key[1], found)
+        _reads(key[2], found)
+    return found
+
+
+def _size(expr):
+    if expr.kind in BINARY_KINDS:
+        return 1 + _size(expr.left) + _size(expr.right)
+    return 1
+
+
+def _expressions(stmt):
+    """Expresiones que evalúa la instrucción misma (sin sus bloques anidados)"""
+    kind = stmt[0]
+    if kind == 'declaration':
+        return [stmt.init] if stmt.init is not None else []
+    if kind == 'assignment':
+        return [stmt.value]
+    if kind in ('print', 'return'):
+        return [stmt.value] if stmt.value is not None else []
+    if kind == 'call':
+        return list(stmt.args)
+    if kind in ('if', 'while'):
+        return [stmt.condition]
+    if kind == 'for':
+        return [stmt.init.value, stmt.condition, stmt.update.value]
+    return []
+
+
+def _nested_blocks(stmt):
+    kind = stmt[0]
+    if kind == 'if':
+        return [stmt.then_block] + ([stmt.else_block] if stmt.else_block is not None else [])
+    if kind in _LOOPS:
+        return [stmt.body]
+    return []
+
+
+def _assigned(stmt, found):
+    """Símbolos (id) que asigna o declara la instrucción, incluidos sus bloques"""
+    kind = stmt[0]
+    if kind in ('declaration', 'assignment'):
+        found.add(id(stmt.sym))
+    elif kind == 'for':
+        found.add(id(stmt.init.sym))
+        found.add(id(stmt.update.sym))
+    for block_node in _nested_blocks(stmt):
+        for inner in block_node[1]:
+            _assigned(inner, found)
+    return found
+
+
+def _subexpressions(expr, found):
+    """Subexpresiones binarias puras de `expr`, en orden de evaluación"""
+    if expr.kind in BINARY_KINDS:
+        _subexpressions(expr.left, found)
+        _subexpressions(expr.right, found)
+        key = expression_key(expr)
+        if key is not None:
+            found.append((key, expr))
+    elif expr[0] == 'call':
+        for arg in expr.args:
+            _subexpressions(arg, found)
+    return found
+
+
+def _replace(expr, replace):
+    """Reescribe `expr` de arriba abajo: replace(nodo) devuelve el sustituto o None"""
+    new = replace(expr)
+    if new is not None:
+        return new
+    if expr.kind in BINARY_KINDS:
+        expr.left = _replace(expr.left, replace)
+        expr.right = _replace(expr.right, replace)
+    elif expr[0] == 'call':
+        expr.args = [_replace(arg, replace) for arg in expr.args]
+    return expr
+
+
+def _replace_in_statement(stmt, replace):
+    kind = stmt[0]
+    if kind == 'declaration':
+        if stmt.init is not None:
+            stmt.init = _replace(stmt.init, replace)
+    elif kind == 'assignment':
+        stmt.value = _replace(stmt.value, replace)
+    elif kind in ('print', 'return'):
+        if stmt.value is not None:
+            stmt.value = _replace(stmt.value, replace)
+    elif kind == 'call':
+        stmt.args = [_replace(arg, replace) for arg in stmt.args]
+    elif kind in ('if', 'while'):
+        stmt.condition = _replace(stmt.condition, replace)
+    elif kind == 'for':
+        stmt.init.value = _replace(stmt.init.value, replace)
+        stmt.condition = _replace(stmt.condition, replace)
+        stmt.update.value = _replace(stmt.update.value, replace)
+
+
+def _names(node, found):
+    """Nombres de variables y parámetros declarados en el programa"""
+    if isinstance(node, list):
+        for item in node:
+            _names(item, found)
+    elif hasattr(node, 'fields'):
+        if node[0] in ('declaration', 'param'):
+            found.add(node[2])
+        for child in node.children():
+            _names(child, found)
+    return found
+
+
+class Temporaries:
+    """Variables nuevas (_t1, _t2, ...) que no chocan con los nombres del programa"""
+    def __init__(self, ast):
+        self._taken = _names(ast, set())
+        self._counter = 0
+
+    def declare(self, var_type, init, like):
+        """Declaración de un temporal nuevo, con su propio símbolo, en la posición de `like`"""
+        self._counter += 1
+        while f"_t{self._counter}" in self._taken:
+            self._counter += 1
+        name = f"_t{self._counter}"
+        self._taken.add(name)
+        decl = node_at(node_position(like), 'declaration', var_type, name, init)
+        decl.sym = {'type': var_type, 'value': None, 'scope': 'local', 'temporary': True}
+        decl.ty = var_type
+        return decl
+
+    @staticmethod
+    def use(decl, like):
+        """Identificador que lee la variable declarada en `decl`"""
+        node = node_at(node_position(like), 'id', decl[2])
+        node.sym, node.ty = decl.sym, decl.ty
+        return node
+
+
+class CodeMotion:
+    """Reescribe el AST en su lugar; cuenta las expresiones sacadas y compartidas"""
+    def __init__(self):
+        self.hoisted = 0  # Expresiones invariantes sacadas de un bucle
+        self.shared = 0   # Apariciones repetidas reemplazadas por un temporal
+        self._temporaries = None
+
+    def optimize_program(self, ast):
+        self._temporaries = Temporaries(ast)
+        for func in ast[1]:
+            self._optimize_block(func[4] if func[0] == 'function' else func[2])
+        return ast
+
+    def _optimize_block(self, block_node):
+        statements = []
+        for stmt in block_node[1]:
+            if stmt[0] in _LOOPS:
+                statements.extend(self._hoist_invariants(stmt))
+            statements.append(stmt)
+            for nested in _nested_blocks(stmt):
+                self._optimize_block(nested)
+        block_node.statements = statements
+        self._share_common(block_node)
+
+    def _temporary(self, expr):
+        return self._temporaries.declare(expr.ty, expr, expr)
+
+    def _use(self, decl, like):
+        return self._temporaries.use(decl, like)
+
+    # --- Código invariante ---
+
+    def _hoist_invariants(self, loop):
+        """Declaraciones de los temporales que se calculan antes del bucle"""
+        assigned = _assigned(loop, set())
+        temporaries = {}  # clave -> declaración
+
+        def replace(expr):
+            if expr.kind not in BINARY_KINDS:
+                return None
+            key = expression_key(expr)
+            if key is None or _reads(key, set()) & assigned:
+                return None
+            if key not in temporaries:
+                temporaries[key] = self._temporary(expr)
+                self.hoisted += 1
+            return self._use(temporaries[key], expr)
+
+        def visit(stmt):
+            _replace_in_statement(stmt, replace)
+            for block_node in _nested_blocks(stmt):
+                for inner in block_node[1]:
+                    visit(inner)
+
+        visit(loop)
+        return list(temporaries.values())
+
+    # --- Subexpresiones comunes ---
+
+    def _share_common(self, block_node):
+        statements = block_node[1]
+        start = 0
+        while start < len(statements):
+            if statements[start][0] in _LOOPS:
+                start += 1  # La condición y el paso se evalúan en cada vuelta
+                continue
+            end = start
+            while end < len(statements) and statements[end][0] in _STRAIGHT:
+                end += 1
+            if end < len(statements) and statements[end][0] == 'if':
+                end += 1  # La condición del if se evalúa en el mismo bloque
+            while self._share_one(statements, start, end):
+                end += 1  # Se insertó una declaración en el tramo
+            start = end
+        block_node.statements = statements
+
+    def _share_one(self, statements, start, end):
+        """Comparte la mayor expresión repetida del tramo; False si no hay ninguna"""
+        groups = {}      # (clave, generación) -> [(índice de instrucción, nodo)]
+        generation = {} # id(símbolo) -> número de asignaciones vistas
+        for index in range(start, end):
+            stmt = statements[index]
+            for expr in _expressions(stmt):
+                for key, node in _subexpressions(expr, []):
+                    stamp = tuple(sorted((sym, generation.get(sym, 0))
+                                         for sym in _reads(key, set())))
+                    groups.setdefault((key, stamp), []).append((index, node))
+            if stmt[0] in ('declaration', 'assignment'):
+                generation[id(stmt.sym)] = generation.get(id(stmt.sym), 0) + 1
+
+        repeated = [group for group in groups.values() if len(group) > 1]
+        if not repeated:
+            return False
+        group = max(repeated, key=lambda group: _size(group[0][1]))
+        first_index, first_node = group[0]
+        nodes = {id(node) for _, node in group}
+        # El temporal se calcula con una copia, para poder reemplazar el original
+        decl = self._temporary(_copy(first_node))
+        self.shared += len(group) - 1
+
+        def replace(expr):
+            return self._use(decl, expr) if id(expr) in nodes else None
+
+        for index in sorted({index for index, _ in group}):
+            _replace_in_statement(statements[index], replace)
+        statements.insert(first_index, decl)
+        return True
+
+
+def _copy(expr):
+    """Copia de una expresión pura (sólo binarios, identificadores y constantes)"""
+    if expr.kind in BINARY_KINDS:
+        node = node_at(node_position(expr), expr[0], _copy(expr.left), _copy(expr.right))
+    else:
+        node = node_at(node_position(expr), expr[0], expr[1])
+    node.sym, node.ty = expr.sym, expr.ty
+    return node
+
+
+def optimize_program(ast):
+    return CodeMotion().optimize_program(ast)
@@ -0,0 +1,421 @@
+from IR import Const, Var, build_ir
+
+# Generación de código para la máquina de registros de Machine.py.
+#
+# Parte de la representación intermedia sin SSA (build_ir(..., ssa=False)) y,
+# por función:
+#
+#   1. Baja cada bloque a código de tres direcciones sobre registros virtuales
+#      (v1, v2, ...): una variable de la IR es un registro virtual, y cada
+#      literal que usa una operación se carga antes en uno propio (li).
+#   2. Calcula la vida de cada registro virtual (análisis de variables vivas
+#      por bloques, iterativo) y la resume en un intervalo [inicio, fin] sobre
+#      el código lineal: si una variable está viva al entrar o salir de un
+#      bloque, el intervalo cubre ese extremo, así un bucle queda cubierto
+#      entero. La instrucción i lee en la posición 2i y escribe en 2i + 1, así
+#      el resultado puede ir al registro de un operando que muere ahí.
+#   3. Asignación por barrido lineal (Poletto y Sarkar): los intervalos se
+#      recorren por inicio; cuando no queda registro libre se derrama el que
+#      termina más tarde (el nuevo o uno activo) a una ranura del marco.
+#   4. Emite el ensamblador: los operandos derramados se cargan (ld) en los dos
+#      últimos registros, que se reservan para eso, y los resultados derramados
+#      se guardan (st) desde el primero de ellos.
+#
+# Cada llamada tiene su propio banco de registros (ver Machine.py), así que no
+# hace falta guardar registros alrededor de las llamadas.
+
+DEFAULT_REGISTERS = 8
+SCRATCH_REGISTERS = 2  # Para cargar los operandos derramados
+
+BINARY_OPCODES = {
+    '+': 'add', '-': 'sub', '*': 'mul', '/': 'div', '%': 'mod', 'i/': 'idiv', 'i%': 'imod',
+    '==': 'eq', '!=': 'ne', '<': 'lt', '>': 'gt', '<=': 'le', '>=': 'ge',
+}
+CONVERSION_OPCODES = {'to_int': 'ftoi', 'to_float': 'itof'}
+
+
+class VReg:
+    """Registro virtual"""
+    __slots__ = ('number',)
+
+    def __init__(self, number):
+        self.number = number
+
+    def __repr__(self):
+        return f"v{self.number}"
+
+
+class TAC:
+    """Instrucción de tres direcciones: dest = op srcs. `imm` lleva el literal,
+    la etiqueta, la función llamada o el índice del argumento"""
+    __slots__ = ('op', 'dest', 'srcs', 'imm')
+
+    def __init__(self, op, dest=None, srcs=(), imm=None):
+        self.op = op
+        self.dest = dest
+        self.srcs = list(srcs)
+        self.imm = imm
+
+    def __repr__(self):
+        operands = ([self.dest] if self.dest is not None else []) + self.srcs
+        text = ", ".join(map(repr, operands))
+        if self.imm is not None:
+            text = f"{text}, {self.imm!r}" if text else repr(self.imm)
+        return f"{self.op} {text}".rstrip()
+
+
+class Interval:
+    """Vida de un registro virtual y dónde quedó: registro físico o ranura"""
+    __slots__ = ('vreg', 'start', 'end', 'register', 'slot')
+
+    def __init__(self, vreg, position):
+        self.vreg = vreg
+        self.start = self.end = position
+        self.register = None
+        self.slot = None
+
+    def cover(self, position):
+        if position < self.start:
+            self.start = position
+        if position > self.end:
+            self.end = position
+
+    def __repr__(self):
+        where = f"r{self.register}" if self.register is not None else f"[{self.slot}]"
+        return f"{self.vreg!r} [{self.start}, {self.end}] -> {where}"
+
+
+class TACFunction:
+    """Código de tres direcciones de una función, por bloques en el orden de la IR"""
+    def __init__(self, name, param_count):
+        self.name = name
+        self.param_count = param_count
+        self.blocks = []     # [[TAC]] (el primero de cada bloque es su etiqueta, si la tiene)
+        self.succs = []      # [[índice de bloque]]
+        self.vreg_count = 0
+
+    def instructions(self):
+        for block in self.blocks:
+            yield from block
+
+    def dump(self):
+        lines = [f"function {self.name}:"]
+        for instr in self.instructions():
+            lines.append(f"{instr.imm}:" if instr.op == 'label' else f"    {instr!r}")
+        return "\n".join(lines)
+
+
+# --- 1. Código de tres direcciones ---
+
+class _Lowering:
+    """Baja un IRFunction (sin SSA) a un TACFunction"""
+    def __init__(self, function):
+        self.function = function
+        self.tac = TACFunction(function.name, len(function.params))
+        self.vregs = {}  # nombre de la IR -> VReg
+
+    def lower(self):
+        blocks = self.function.blocks
+        targeted = {target.index for block in blocks for target in block.terminator.targets}
+        for position, block in enumerate(blocks):
+            self.code = [TAC('label', imm=_label(block))] if block.index in targeted else []
+            for instr in block.instrs:
+                self._instruction(instr)
+            following = blocks[position + 1] if position + 1 < len(blocks) else None
+            self._terminator(block.terminator, following)
+            self.tac.blocks.append(self.code)
+            self.tac.succs.append([succ.index for succ in block.succs])
+        return self.tac
+
+    def _vreg(self, var):
+        vreg = self.vregs.get(var.name)
+        if vreg is None:
+            self.tac.vreg_count += 1
+            vreg = self.vregs[var.name] = VReg(self.tac.vreg_count)
+        return vreg
+
+    def _fresh(self):
+        self.tac.vreg_count += 1
+        return VReg(self.tac.vreg_count)
+
+    def _operand(self, value):
+        """Registro con el valor: los literales se cargan en uno nuevo"""
+        if isinstance(value, Var):
+            return self._vreg(value)
+        vreg = self._fresh()
+        self.code.append(TAC('li', vreg, imm=value.value))
+        return vreg
+
+    def _instruction(self, instr):
+        op = instr.op
+        if op == 'copy':
+            value = instr.args[0]
+            if isinstance(value, Const):
+                self.code.append(TAC('li', self._vreg(instr.dest), imm=value.value))
+            else:
+                self.code.append(TAC('mov', self._vreg(instr.dest), [self._vreg(value)]))
+        elif op == 'param':
+            self.code.append(TAC('param', self._vreg(instr.dest), imm=instr.args[0].value))
+        elif op == 'call':
+            sources = [self._operand(arg) for arg in instr.args]
+            for index, source in enumerate(sources):
+                self.code.append(TAC('arg', None, [source], imm=index))
+            dest = self._vreg(instr.dest) if instr.dest is not None else None
+            self.code.append(TAC('call', dest, imm=instr.callee))
+        elif op == 'print':
+            self.code.append(TAC('print', None, [self._operand(instr.args[0])]))
+        elif op in CONVERSION_OPCODES:
+            self.code.append(TAC(CONVERSION_OPCODES[op], self._vreg(instr.dest),
+                                 [self._operand(instr.args[0])]))
+        else:
+            left, right = (self._operand(arg) for arg in instr.args)
+            self.code.append(TAC(BINARY_OPCODES[op], self._vreg(instr.dest), [left, right]))
+
+    def _terminator(self, terminator, following):
+        op = terminator.op
+        if op == 'return':
+            value = terminator.args[0]
+            if isinstance(value, Const) and value.value is None:
+                self.code.append(TAC('ret'))
+            else:
+                self.code.append(TAC('ret', None, [self._operand(value)]))
+        elif op == 'jump':
+            if terminator.targets[0] is not following:
+                self.code.append(TAC('jmp', imm=_label(terminator.targets[0])))
+        else:
+            condition = self._operand(terminator.args[0])
+            true, false = terminator.targets
+            if true is following:
+                self.code.append(TAC('bf', None, [condition], imm=_label(false)))
+            else:
+                self.code.append(TAC('bt', None, [condition], imm=_label(true)))
+                if false is not following:
+                    self.code.append(TAC('jmp', imm=_label(false)))
+
+
+def _label(block):
+    return f"L{block.index}"
+
+
+# --- 2. Intervalos de vida ---
+
+def live_intervals(tac):
+    """[Interval] de los registros virtuales de `tac`, ordenados por inicio"""
+    uses, defs = [], []
+    for block in tac.blocks:
+        used, defined = set(), set()
+        for instr in block:
+            used.update(src.number for src in instr.srcs if src.number not in defined)
+            if instr.dest is not None:
+                defined.add(instr.dest.number)
+        uses.append(used)
+        defs.append(defined)
+
+    live_in = [set() for _ in tac.blocks]
+    live_out = [set() for _ in tac.blocks]
+    changed = True
+    while changed:
+        changed = False
+        for index in reversed(range(len(tac.blocks))):
+            out = set()
+            for succ in tac.succs[index]:
+                out |= live_in[succ]
+            new_in = uses[index] | (out - defs[index])
+            if out != live_out[index] or new_in != live_in[index]:
+                live_out[index], live_in[index] = out, new_in
+                changed = True
+
+    # La instrucción i lee en la posición 2i y escribe en 2i + 1; lo que sigue
+    # vivo al salir del bloque llega hasta la lectura de la instrucción siguiente
+    vregs = {}
+    for instr in tac.instructions():
+        for operand in instr.srcs + ([instr.dest] if instr.dest is not None else []):
+            vregs[operand.number] = operand
+    intervals = {}
+
+    def cover(number, position):
+        interval = intervals.get(number)
+        if interval is None:
+            intervals[number] = Interval(vregs[number], position)
+        else:
+            interval.cover(position)
+
+    index = 0
+    for block_index, block in enumerate(tac.blocks):
+        first = index
+        for instr in block:
+            for src in instr.srcs:
+                cover(src.number, 2 * index)
+            if instr.dest is not None:
+                cover(instr.dest.number, 2 * index + 1)
+            index += 1
+        for number in live_in[block_index]:
+            cover(number, 2 * first)
+        for number in live_out[block_index]:
+            cover(number, 2 * index)
+    return sorted(intervals.values(), key=lambda interval: (interval.start, interval.vreg.number))
+
+
+# --- 3. Barrido lineal ---
+
+def linear_scan(intervals, registers):
+    """Asigna `registers` registros físicos; devuelve el número de ranuras usadas"""
+    free = list(reversed(range(registers)))
+    active = []  # ordenados por fin
+    slots = 0
+    for interval in intervals:
+        # Libera los registros de los intervalos que ya terminaron
+        while active and active[0].end < interval.start:
+            free.append(active.pop(0).register)
+        if free:
+            interval.register = free.pop()
+            _insert(active, interval)
+            continue
+        victim = active[-1]
+        if victim.end > interval.end:
+            interval.register, victim.register = victim.register, None
+            victim.slot = slots
+            active.pop()
+            _insert(active, interval)
+        else:
+            interval.slot = slots
+        slots += 1
+    return slots
+
+
+def _insert(active, interval):
+    index = len(active)
+    while index > 0 and active[index - 1].end > interval.end:
+        index -= 1
+    active.insert(index, interval)
+
+
+# --- 4. Ensamblador ---
+
+class FunctionReport:
+    """Cifras de la asignación de registros de una función"""
+    __slots__ = ('name', 'vregs', 'spilled', 'loads', 'stores', 'instructions')
+
+    def __init__(self, name, vregs, spilled, loads, stores, instructions):
+        self.name = name
+        self.vregs = vregs
+        self.spilled = spilled          # Registros virtuales que fueron al marco
+        self.loads = loads              # Instrucciones ld y st de derrame emitidas
+        self.stores = stores
+        self.instructions = instructions
+
+
+class Assembly:
+    """Texto del ensamblador del programa y el informe de derrames por función"""
+    def __init__(self, text, reports, registers):
+        self.text = text
+        self.reports = reports  # [FunctionReport]
+        self.registers = registers
+
+    @property
+    def spills(self):
+        return sum(report.spilled for report in self.reports)
+
+    def spill_report(self):
+        lines = [f"{'función':<16} {'virtuales':>9} {'derramados':>10} {'ld':>5} {'st':>5} "
+                 f"{'instr.':>7}   ({self.registers} registros)"]
+        for r in self.reports:
+            lines.append(f"{r.name:<16} {r.vregs:>9} {r.spilled:>10} {r.loads:>5} {r.stores:>5} "
+                         f"{r.instructions:>7}")
+        return "\n".join(lines)
+
+
+def format_immediate(value):
+    """Literal tal como lo escribe el ensamblador (y lo lee Machine.assemble)"""
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, str):
+        escaped = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        return f'"{escaped}"'
+    return repr(value)
+
+
+def _emit_function(tac, registers, lines):
+    allocatable = registers - SCRATCH_REGISTERS
+    intervals = live_intervals(tac)
+    frame_size = linear_scan(intervals, allocatable)
+    where = {interval.vreg.number: interval for interval in intervals}
+    scratch = [allocatable, allocatable + 1]
+    loads = stores = 0
+
+    body = []
+    for instr in tac.instructions():
+        if instr.op == 'label':
+            body.append(f"{instr.imm}:")
+            continue
+        sources = []
+        loaded = {}
+        for src in instr.srcs:
+            interval = where[src.number]
+            if interval.register is not None:
+                sources.append(f"r{interval.register}")
+                continue
+            if src.number not in loaded:
+                loaded[src.number] = scratch[len(loaded)]
+                body.append(f"    ld r{loaded[src.number]}, [{interval.slot}]")
+                loads += 1
+            sources.append(f"r{loaded[src.number]}")
+        store = None
+        dest = None
+        if instr.dest is not None:
+            interval = where[instr.dest.number]
+            if interval.register is not None:
+                dest = f"r{interval.register}"
+            else:
+                dest = f"r{scratch[0]}"
+                store = f"    st r{scratch[0]}, [{interval.slot}]"
+        # Un mov entre registros virtuales que quedaron en el mismo físico sobra
+        if not (instr.op == 'mov' and dest == sources[0]):
+            body.append("    " + _format(instr, dest, sources))
+        if store is not None:
+            body.append(store)
+            stores += 1
+
+    lines.append(f".func {tac.name} params={tac.param_count} regs={registers} frame={frame_size}")
+    lines.extend(body)
+    lines.append(".end")
+    spilled = sum(1 for interval in intervals if interval.register is None)
+    return FunctionReport(tac.name, tac.vreg_count, spilled, loads, stores,
+                          sum(1 for line in body if not line.endswith(':')))
+
+
+def _format(instr, dest, sources):
+    op = instr.op
+    if op == 'li':
+        return f"li {dest}, {format_immediate(instr.imm)}"
+    if op == 'param':
+        return f"param {dest}, {instr.imm}"
+    if op == 'arg':
+        return f"arg {instr.imm}, {sources[0]}"
+    if op == 'call':
+        return f"call {dest}, {instr.imm}" if dest is not None else f"call {instr.imm}"
+    if op == 'jmp':
+        return f"jmp {instr.imm}"
+    if op in ('bt', 'bf'):
+        return f"{op} {sources[0]}, {instr.imm}"
+    operands = ([dest] if dest is not None else []) + sources
+    return f"{op} {', '.join(operands)}".rstrip()
+
+
+def lower_to_tac(module):
+    """[TACFunction] de un IRModule sin SSA"""
+    return [_Lowering(function).lower() for function in module.functions]
+
+
+def compile_to_assembly(ast, frame_sizes, registers=DEFAULT_REGISTERS):
+    """Assembly de un AST verificado y resuelto, para `registers` registros"""
+    if registers < SCRATCH_REGISTERS + 1:
+        raise ValueError(f"Hacen falta al menos {SCRATCH_REGISTERS + 1} registros")
+    module = build_ir(ast, frame_sizes, ssa=False)
+    lines = [f"; Evola -> máquina de registros ({registers} registros; ver Machine.py)"]
+    reports = []
+    for tac in lower_to_tac(module):
+        reports.append(_emit_function(tac, registers, lines))
+    return Assembly("\n".join(lines) + "\n", reports, registers)
@@ -0,0 +1,228 @@
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from Lexer import lexer as base_lexer
+from FastLexer import TokenStream, tokenize
+from SourceStream import DEFAULT_CHUNK_SIZE, ChunkedTokenStream
+from Parser import parser as right_parser, report_syntax_error
+from Diagnostics import DiagnosticCollector
+from ASTNodes import node_position
+from SemanticAnalyzer import SemanticAnalyzer
+from Optimizer import Optimizer
+from DeadCode import DeadCodeEliminator
+from CodeMotion import CodeMotion
+from Inliner import Inliner
+from Resolver import Resolver
+
+
+def get_parser(grammar='right'):
+    """Devuelve el parser de la gramática pedida ('right' o 'left')"""
+    if grammar == 'left':
+        from LeftParser import parser as left_parser  # Sólo se cargan sus tablas si se usa
+        return left_parser
+    if grammar != 'right':
+        raise ValueError(f"Gramática desconocida: '{grammar}'")
+    return right_parser
+
+
+class CompilationResult:
+    """Resultado de compilar una fuente: AST y diagnósticos"""
+    def __init__(self, ast, errors, frame_sizes=None, warnings=(), stats=None):
+        self.ast = ast
+        self.errors = errors  # [Diagnostic, ...]
+        self.warnings = list(warnings)  # Avisos (código eliminado por la optimización)
+        self.frame_sizes = frame_sizes  # {función: ranuras}, si el programa es válido
+        self.stats = dict(stats or {})  # Cambios de cada optimización: {nombre: cantidad}
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def errors_for(self, phase):
+        return [d.format() for d in self.errors if d.phase == phase]
+
+
+class CompilerSession:
+    """Sesión de compilación reentrante.
+
+    Cada sesión tiene su propio clon del lexer, su propio objeto parser (las tablas
+    LALR se comparten, son de sólo lectura) y su propio destino de errores, así que
+    varias sesiones pueden compilar a la vez en hilos distintos.
+    """
+    def __init__(self, grammar='right', optimize=True, inline=True, fast_lexer=False, cache=None):
+        self.grammar = grammar
+        self.optimize = optimize  # Inliner, Optimizer, DeadCode y CodeMotion antes de Resolver
+        self.inline = inline  # Sin él, la optimización deja las llamadas como están
+        self.fast_lexer = fast_lexer  # FastLexer en lugar de ply.lex (mismos tokens)
+        self.cache = cache  # ASTCache: las fuentes ya vistas no pasan por el front end
+        self.stats = {}  # Los de la última compilación (ver CompilationResult.stats)
+        self.lexer = base_lexer.clone()
+        self.diagnostics = DiagnosticCollector()
+        self.lexer.diagnostics = self.diagnostics
+        # Copia superficial: comparte acciones, goto y producciones con el parser base
+        self.parser = copy.copy(get_parser(grammar))
+        self.parser.errorfunc = self._syntax_error
+
+    def _syntax_error(self, p):
+        report_syntax_error(p, self.diagnostics, self._line_index.source)
+
+    @property
+    def errors(self):
+        return self.diagnostics.errors
+
+    def _next_token(self):
+        """Siguiente token con su (línea, columna) tomados del índice de líneas"""
+        tok = self.lexer.token()
+        if tok is not None:
+            tok.lineno, tok.col = self._line_index.position(tok.lexpos)
+        return tok
+
+    def parse(self, source, trace=None):
+        """Analiza léxica y sintácticamente la fuente y devuelve el AST (o None)
+
+        `trace`, si se da, recibe trace.record(tok) por cada token que lee el
+        parser (por ejemplo un TokenDump), en la misma pasada. Con caché, un
+        acierto devuelve el AST guardado sin tokenizar (y sin traza).
+        """
+        use_cache = self.cache is not None and trace is None
+        if use_cache:
+            ast = self._cached(source, checked=False)
+            if ast is not None:
+                return ast
+        ast = self._parse(source, trace)
+        if use_cache and ast is not None and not self.diagnostics.errors:
+            self.cache.store(source, ast, self.grammar)
+        return ast
+
+    def _cached(self, source, checked):
+        ast = self.cache.load(source, self.grammar, checked)
+        if ast is not None:
+            self.diagnostics.reset(source)
+            self._line_index = self.diagnostics.index
+        return ast
+
+    def _parse(self, source, trace=None):
+        self.diagnostics.reset(source)
+        self._line_index = self.diagnostics.index  # Una sola tabla para todas las fases
+        if self.fast_lexer:
+            # Todo el texto se tokeniza de una vez; los errores léxicos quedan primero
+            stream = TokenStream(tokenize(source, self.diagnostics), self._line_index)
+            return self.parser.parse(lexer=stream, tokenfunc=_traced(stream.token, trace))
+        self.lexer.input(source)
+        self.lexer.lineno = 1
+        return self.parser.parse(lexer=self.lexer, tokenfunc=_traced(self._next_token, trace))
+
+    def parse_file(self, path, chunk_size=DEFAULT_CHUNK_SIZE, trace=None):
+        """Como parse(), pero leyendo el archivo por partes (ver SourceStream.py)"""
+        stream = ChunkedTokenStream.from_file(path, self.diagnostics, chunk_size)
+        self.diagnostics.reset(None, index=stream)
+        self._line_index = stream
+        return self.parser.parse(lexer=stream, tokenfunc=_traced(stream.token, trace))
+
+    def compile(self, source):
+        """Ejecuta el pipeline completo: parser, ámbitos, tipos y optimización
+
+        Con caché se guarda el AST ya verificado (antes de optimizarlo), así que
+        un acierto salta el lexer, el parser y el análisis semántico.
+        """
+        self.stats = {}
+        if self.cache is None:
+            return self._check(self.parse(source))
+        ast = self._cached(source, checked=True)
+        if ast is not None:
+            return self._finish(ast)
+        return self._check(self._parse(source), source)
+
+    def compile_file(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        """compile() de un archivo sin cargarlo entero en memoria"""
+        self.stats = {}
+        return self._check(self.parse_file(path, chunk_size))
+
+    def _check(self, ast, cache_source=None):
+        """Fases que siguen al parser: ámbitos, tipos, optimización y direcciones
+
+        `cache_source`: la fuente con la que guardar en la caché el AST verificado.
+        """
+        if ast is None or self.diagnostics.errors:
+            return CompilationResult(ast, self.diagnostics.errors)
+
+        # Ámbitos y tipos en un solo recorrido; el AST queda anotado (sym, ty)
+        analyzer = SemanticAnalyzer()
+        analyzer.check_program(ast)
+        for error in analyzer.scope_errors:
+            self.diagnostics.report('ambito', error.message, position=node_position(error.node))
+        for message, node in analyzer.located_errors:
+            self.diagnostics.report('tipo', message, position=node_position(node))
+        if self.diagnostics.errors:
+            return CompilationResult(ast, self.diagnostics.errors)
+        if cache_source is not None:
+            self.cache.store(cache_source, ast, self.grammar, checked=True)
+        return self._finish(ast)
+
+    def _finish(self, ast):
+        """Optimización y direcciones de un AST ya verificado"""
+        if self.optimize:
+            self._optimize(ast)
+
+        # Direcciones (profundidad, ranura) de las variables para las fases siguientes
+        frame_sizes = Resolver().resolve_program(ast)
+        return CompilationResult(ast, self.diagnostics.errors, frame_sizes,
+                                 self.diagnostics.warnings, self.stats)
+
+    def _optimize(self, ast):
+        """Integra funciones, pliega constantes, poda el código muerto y saca las
+        expresiones invariantes o repetidas; lo eliminado queda como aviso"""
+        inliner = Inliner()
+        if self.inline:
+            inliner.optimize_program(ast)
+        optimizer = Optimizer()
+        optimizer.optimize_program(ast)
+        eliminator = DeadCodeEliminator(inliner.inlined_functions)
+        eliminator.eliminate_program(ast)
+        motion = CodeMotion()
+        motion.optimize_program(ast)
+        self.stats = {
+            'inlined': inliner.inlined,
+            'tail_calls': inliner.tail_calls,
+            'folded': optimizer.rewrites,
+            'removed': len(optimizer.removed) + len(eliminator.removed),
+            'hoisted': motion.hoisted,
+            'shared': motion.shared,
+        }
+        for message, node in optimizer.removed + eliminator.removed:
+            self.diagnostics.report('optimizacion', message, severity='warning',
+                                    position=node_position(node))
+
+
+def _traced(tokenfunc, trace):
+    """tokenfunc que además pasa cada token a trace.record"""
+    if trace is None:
+        return tokenfunc
+    record = trace.record
+
+    def token():
+        tok = tokenfunc()
+        if tok is not None:
+            record(tok)
+        return tok
+    return token
+
+
+_thread_sessions = threading.local()
+
+
+def thread_session(grammar='right'):
+    """Devuelve la sesión del hilo actual, creándola la primera vez"""
+    sessions = getattr(_thread_sessions, 'sessions', None)
+    if sessions is None:
+        sessions = _thread_sessions.sessions = {}
+    if grammar not in sessions:
+        sessions[grammar] = CompilerSession(grammar)
+    return sessions[grammar]
+
+
+def compile_concurrently(sources, max_workers=None, grammar='right'):
+    """Compila varias fuentes en un pool de hilos; una sesión por hilo"""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda source: thread_session(grammar).compile(source), sources))
@@ -0,0 +1,232 @@
+from ASTNodes import BINARY_OPERATORS
+from Optimizer import is_constant
+from Visitor import Visitor
+
+# Eliminación de código muerto sobre el AST verificado (después de Optimizer).
+#
+# Quita, en este orden:
+#   1. las instrucciones que siguen a una que nunca continúa (return, un if cuyas
+#      dos ramas terminan, un while/for con condición constante verdadera: el
+#      lenguaje no tiene break, así que sólo salen por return);
+#   2. las funciones a las que no se llega desde main;
+#   3. las variables locales que nunca se leen, junto con sus asignaciones,
+#      cuando ni el inicializador ni los valores asignados tienen efectos
+#      (llamadas o divisiones que pueden fallar). Se repite hasta que no queda
+#      ninguna, porque quitar `int a = b;` puede dejar b sin lecturas.
+#
+# Cada eliminación queda en `removed` como (mensaje, nodo) para reportarla.
+
+
+def _may_fail(expr):
+    """Verdadero si la división puede lanzar un error de ejecución"""
+    return expr[0] in ('/', '%') and not (is_constant(expr[2]) and expr[2][1] != 0)
+
+
+class _Usage(Visitor):
+    """Lecturas de cada variable (por símbolo) y variables que no se pueden quitar"""
+    DISPATCH = {
+        'statement': {
+            'declaration': '_visit_declaration',
+            'assignment': '_visit_assignment',
+            'if': '_visit_if',
+            'while': '_visit_while',
+            'for': '_visit_for',
+            'return': '_visit_value',
+            'print': '_visit_value',
+            'call': '_visit_expression',
+        },
+        'expression': dict(
+            {op: '_visit_binary' for op in BINARY_OPERATORS},
+            id='_visit_id',
+            call='_visit_call',
+        ),
+    }
+
+    def __init__(self):
+        self.reads = {}     # id(símbolo) -> lecturas
+        self.pinned = set() # id(símbolo) de variables con efectos al escribirlas
+
+    def visit_block(self, block_node):
+        for stmt in block_node[1]:
+            self.handler_for('statement', stmt)(self, stmt)
+
+    def _visit_declaration(self, decl):
+        if decl.init is not None and not self._visit_expression(decl.init):
+            self.pinned.add(id(decl.sym))
+
+    def _visit_assignment(self, assign):
+        if not self._visit_expression(assign.value):
+            self.pinned.add(id(assign.sym))
+
+    def _visit_if(self, if_stmt):
+        self._visit_expression(if_stmt.condition)
+        self.visit_block(if_stmt.then_block)
+        if if_stmt.else_block is not None:
+            self.visit_block(if_stmt.else_block)
+
+    def _visit_while(self, while_stmt):
+        self._visit_expression(while_stmt.condition)
+        self.visit_block(while_stmt.body)
+
+    def _visit_for(self, for_stmt):
+        # La inicialización y el paso son parte del for: no se quitan por separado
+        self.pinned.add(id(for_stmt.init.sym))
+        self.pinned.add(id(for_stmt.update.sym))
+        self._visit_expression(for_stmt.init.value)
+        self._visit_expression(for_stmt.condition)
+        self._visit_expression(for_stmt.update.value)
+        self.visit_block(for_stmt.body)
+
+    def _visit_value(self, stmt):
+        if stmt.value is not None:
+            self._visit_expression(stmt.value)
+
+    def _visit_expression(self, expr):
+        """Registra las lecturas de la expresión; devuelve si no tiene efectos"""
+        handler = self.handler_for('expression', expr)
+        return True if handler is None else handler(self, expr)
+
+    def _visit_binary(self, expr):
+        pure_left = self._visit_expression(expr.left)
+        pure_right = self._visit_expression(expr.right)
+        return pure_left and pure_right and not _may_fail(expr)
+
+    def _visit_id(self, expr):
+        key = id(expr.sym)
+        self.reads[key] = self.reads.get(key, 0) + 1
+        return True
+
+    def _visit_call(self, call):
+        for arg in call.args:
+            self._visit_expression(arg)
+        return False
+
+
+def terminates(stmt):
+    """Verdadero si la ejecución nunca pasa a la instrucción siguiente"""
+    kind = stmt[0]
+    if kind == 'return':
+        return True
+    if kind == 'if':
+        return stmt.else_block is not None and \
+            _block_terminates(stmt.then_block) and _block_terminates(stmt.else_block)
+    if kind in ('while', 'for'):
+        return is_constant(stmt.condition) and stmt.condition[1] is True
+    return False
+
+
+def _block_terminates(block_node):
+    return any(terminates(stmt) for stmt in block_node[1])
+
+
+def _nested_blocks(stmt):
+    kind = stmt[0]
+    if kind == 'if':
+        return [stmt.then_block] + ([stmt.else_block] if stmt.else_block is not None else [])
+    if kind in ('while', 'for'):
+        return [stmt.body]
+    return []
+
+
+def _calls(node, found):
+    """Nombres de las funciones llamadas dentro de `node`"""
+    if isinstance(node, list):
+        for item in node:
+            _calls(item, found)
+    elif hasattr(node, 'fields'):
+        if node[0] == 'call':
+            found.add(node.name)
+        for child in node.children():
+            _calls(child, found)
+    return found
+
+
+class DeadCodeEliminator:
+    """Poda el AST en su lugar; `removed` lista lo que se quitó"""
+    def __init__(self, inlined=()):
+        self.removed = []  # [(mensaje, nodo)]
+        self.inlined = set(inlined)  # Funciones que Inliner copió en alguna llamada
+
+    def eliminate_program(self, ast):
+        bodies = [func[4] if func[0] == 'function' else func[2] for func in ast[1]]
+        for block_node in bodies:
+            self._prune_unreachable(block_node)
+        self._prune_functions(ast)
+        self._prune_unused_variables(ast)
+        return ast
+
+    def _prune_unreachable(self, block_node):
+        statements = block_node[1]
+        for i, stmt in enumerate(statements):
+            for nested in _nested_blocks(stmt):
+                self._prune_unreachable(nested)
+            if terminates(stmt) and i + 1 < len(statements):
+                dropped = len(statements) - i - 1
+                text = "se eliminó 1 instrucción" if dropped == 1 else f"se eliminaron {dropped} instrucciones"
+                self.removed.append((f"Código inalcanzable: {text}",
+                                     statements[i + 1]))
+                block_node.statements = statements[:i + 1]
+                return
+
+    def _prune_functions(self, ast):
+        bodies = {}
+        for func in ast[1]:
+            name = func[2] if func[0] == 'function' else 'main'
+            bodies[name] = func
+        reachable, pending = set(), ['main']
+        while pending:
+            name = pending.pop()
+            if name in reachable or name not in bodies:
+                continue
+            reachable.add(name)
+            pending.extend(_calls(bodies[name], set()))
+        kept = []
+        for func in ast[1]:
+            if func[0] == 'function' and func[2] not in reachable:
+                if func[2] in self.inlined:
+                    message = f"La función '{func[2]}' quedó integrada en todas sus llamadas; se eliminó"
+                else:
+                    message = f"La función '{func[2]}' no se usa desde main; se eliminó"
+                self.removed.append((message, func))
+            else:
+                kept.append(func)
+        ast.functions = kept
+
+    def _prune_unused_variables(self, ast):
+        bodies = [func[4] if func[0] == 'function' else func[2] for func in ast[1]]
+        while True:
+            usage = _Usage()
+            for block_node in bodies:
+                usage.visit_block(block_node)
+            dead = {}
+            for block_node in bodies:
+                self._find_unused(block_node, usage, dead)
+            if not dead:
+                return
+            for block_node in bodies:
+                self._drop(block_node, dead)
+
+    def _find_unused(self, block_node, usage, dead):
+        for stmt in block_node[1]:
+            if stmt[0] == 'declaration':
+                key = id(stmt.sym)
+                if key not in usage.reads and key not in usage.pinned:
+                    dead[key] = stmt
+            for nested in _nested_blocks(stmt):
+                self._find_unused(nested, usage, dead)
+
+    def _drop(self, block_node, dead):
+        kept = []
+        for stmt in block_node[1]:
+            if stmt[0] in ('declaration', 'assignment') and id(stmt.sym) in dead:
+                if stmt[0] == 'declaration' and not stmt.sym.get('temporary'):
+                    self.removed.append((f"La variable '{stmt.name}' no se lee; se eliminó", stmt))
+                continue
+            for nested in _nested_blocks(stmt):
+                self._drop(nested, dead)
+            kept.append(stmt)
+        block_node.statements = kept
+
+
+def eliminate_dead_code(ast):
+    return DeadCodeEliminator().eliminate_program(ast)
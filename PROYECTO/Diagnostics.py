@@ -0,0 +1,130 @@
+from bisect import bisect_right
+
+PHASE_LABELS = {
+    'lexico': "Error léxico",
+    'sintactico': "Error sintáctico",
+    'ambito': "Error de ámbito",
+    'tipo': "Error de tipo",
+    'optimizacion': "Aviso de optimización",
+}
+
+
+class LineIndex:
+    """Tabla de inicios de línea de una fuente, construida en una sola pasada.
+
+    Convierte un desplazamiento en (línea, columna) con búsqueda binaria, ambos
+    contados desde 1.
+    """
+    __slots__ = ('source', 'starts')
+
+    def __init__(self, source):
+        self.source = source
+        starts = [0]
+        find = source.find
+        pos = find('\n')
+        while pos >= 0:
+            starts.append(pos + 1)
+            pos = find('\n', pos + 1)
+        self.starts = starts
+
+    def line_of(self, offset):
+        return bisect_right(self.starts, offset)
+
+    def position(self, offset):
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+    def line_text(self, line):
+        start = self.starts[line - 1]
+        end = self.starts[line] - 1 if line < len(self.starts) else len(self.source)
+        return self.source[start:end]
+
+
+class Diagnostic:
+    """Un error (o aviso) con fase, mensaje y posición en la fuente"""
+    __slots__ = ('phase', 'message', 'line', 'column', 'context', 'severity')
+
+    def __init__(self, phase, message, line=None, column=None, context=None, severity='error'):
+        self.phase = phase
+        self.message = message
+        self.line = line
+        self.column = column
+        self.context = context  # Texto de la línea donde ocurrió el error
+        self.severity = severity
+
+    def format(self):
+        label = PHASE_LABELS.get(self.phase, self.phase)
+        if self.line is None:
+            return f"{label}: {self.message}"
+        text = f"{label} en línea {self.line}: {self.message}"
+        if self.context is not None and self.column is not None:
+            text += f"\n{self.context}\n{' ' * (self.column - 1)}^"
+        return text
+
+    def __repr__(self):
+        return f"Diagnostic({self.phase!r}, {self.message!r}, line={self.line}, column={self.column})"
+
+
+class DiagnosticCollector:
+    """Acumula los diagnósticos de una compilación en memoria.
+
+    Los errores se escriben a disco de una sola vez con flush(), en lugar de
+    abrir el archivo de errores por cada error.
+    """
+    def __init__(self, source=None):
+        self.diagnostics = []
+        self.index = LineIndex(source) if source is not None else None
+
+    def reset(self, source, index=None):
+        """Vacía el colector; `index` reemplaza al LineIndex de `source` (SourceStream)"""
+        del self.diagnostics[:]
+        self.index = index if index is not None else LineIndex(source)
+
+    def line_index(self, source):
+        """Índice de líneas de `source`, reconstruido sólo si cambió la fuente"""
+        if self.index is None or self.index.source is not source:
+            self.index = LineIndex(source)
+        return self.index
+
+    def report(self, phase, message, offset=None, source=None, severity='error', position=None):
+        """Registra un diagnóstico ubicado por desplazamiento o por (línea, columna)"""
+        line = column = context = None
+        if offset is not None:
+            index = self.line_index(source) if source is not None else self.index
+            line, column = index.position(offset)
+            context = index.line_text(line)
+        elif position is not None:
+            line, column = position
+            if self.index is not None and column is not None:
+                context = self.index.line_text(line)
+        diagnostic = Diagnostic(phase, message, line, column, context, severity)
+        self.diagnostics.append(diagnostic)
+        return diagnostic
+
+    def add(self, diagnostic):
+        self.diagnostics.append(diagnostic)
+
+    def for_phase(self, phase):
+        return [d for d in self.diagnostics if d.phase == phase]
+
+    @property
+    def errors(self):
+        return [d for d in self.diagnostics if d.severity == 'error']
+
+    @property
+    def warnings(self):
+        return [d for d in self.diagnostics if d.severity == 'warning']
+
+    def flush(self, files):
+        """Escribe los diagnósticos de cada fase en su archivo ({fase: ruta})"""
+        for phase, path in files.items():
+            diagnostics = self.for_phase(phase)
+            if diagnostics:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("".join(f"{d.format()}\n\n" for d in diagnostics))
+
+    def __len__(self):
+        return len(self.diagnostics)
+
+    def __iter__(self):
+        return iter(self.diagnostics)
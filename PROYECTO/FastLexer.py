@@ -0,0 +1,195 @@
+import re
+from array import array
+
+import Lexer
+from Diagnostics import LineIndex
+
+# Lexer rápido: una sola expresión regular maestra construida a partir de las
+# mismas reglas de Lexer.py, sin crear un LexToken por token.
+#
+# Cada coincidencia es un token precedido de los espacios y saltos de línea que
+# lo separan del anterior (t_ignore y t_newline no producen token), así que hay
+# una coincidencia por token y no dos. Después del prefijo, las alternativas van
+# en el orden en que las prueba ply.lex: primero las reglas función en el orden
+# en que están definidas y luego las reglas cadena de la más larga a la más
+# corta (así '==' gana a '='), éstas en un solo grupo porque el texto basta para
+# saber el tipo. Al final, un carácter cualquiera para reportar los ilegales y
+# el fin del texto, para que los espacios finales no obliguen a buscar más allá.
+#
+# El resultado son arreglos paralelos: tipo (índice en Lexer.tokens), posición
+# en la fuente y valor. El valor sólo se guarda para identificadores, números
+# y cadenas; el de los símbolos y palabras reservadas es su propio texto
+# (TokenArrays.value lo reconstruye). TokenStream los entrega al parser de PLY
+# uno a uno, con objetos mínimos.
+
+TOKEN_TYPES = tuple(Lexer.tokens)
+TYPE_IDS = {name: index for index, name in enumerate(TOKEN_TYPES)}
+_ID = TYPE_IDS['ID']
+
+# Reemplazos de patrones de Lexer.py que reconocen lo mismo sin un grupo por
+# carácter: el (.|\n)*? del comentario y el ([^\\\"]|\\.)* de la cadena
+_FAST_PATTERNS = {
+    't_COMMENT': r'//.*|/\*[\s\S]*?\*/',
+    't_STRING_LITERAL': r'"[^\\"]*(?:\\.[^\\"]*)*"',
+}
+
+# Acciones de los grupos de la expresión maestra que no son un tipo de token
+_SKIP, _ERROR, _SYMBOL = -1, -2, -3
+# Conversiones del valor según la regla función
+_CONVERSIONS = {
+    'FLOAT_NUM': float,
+    'INT_NUM': int,
+    'STRING_LITERAL': lambda text: text[1:-1].replace('\\n', '\n').replace('\\t', '\t'),
+}
+
+
+def _rules():
+    """[(nombre del grupo, patrón, acción)] en el orden de ply.lex, sin t_newline"""
+    functions, strings = [], []
+    for name in dir(Lexer):
+        if not name.startswith('t_') or name in ('t_ignore', 't_error', 't_newline'):
+            continue
+        rule = getattr(Lexer, name)
+        if callable(rule):
+            functions.append((rule.__code__.co_firstlineno, name, _FAST_PATTERNS.get(name, rule.__doc__)))
+        else:
+            strings.append(rule)
+    rules = []
+    for _, name, pattern in sorted(functions):
+        token = name[2:]
+        # t_COMMENT no devuelve token
+        rules.append((token, pattern, TYPE_IDS.get(token, _SKIP)))
+    strings.sort(key=len, reverse=True)
+    rules.append(('SYMBOL', "|".join(strings), _SYMBOL))
+    rules.append(('error', r'.', _ERROR))
+    rules.append(('end', r'\Z', _SKIP))
+    return rules
+
+
+def _build():
+    rules = _rules()
+    skip = f"[{re.escape(Lexer.t_ignore)}\\n]*"
+    master = re.compile(skip + "(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern, _ in rules) + ")")
+    # Acción de cada grupo por su número (lastindex)
+    actions = [None] * (master.groups + 1)
+    for name, _, action in rules:
+        actions[master.groupindex[name]] = action
+    # Texto fijo de los símbolos y de las palabras reservadas
+    fixed = [None] * len(TOKEN_TYPES)
+    for name in dir(Lexer):
+        rule = getattr(Lexer, name)
+        if name.startswith('t_') and isinstance(rule, str) and name != 't_ignore':
+            fixed[TYPE_IDS[name[2:]]] = re.sub(r'\\(.)', r'\1', rule)
+    for word, token in Lexer.reserved.items():
+        fixed[TYPE_IDS[token]] = word
+    return master, actions, fixed
+
+
+MASTER, _ACTIONS, FIXED_TEXT = _build()
+_RESERVED_IDS = {word: TYPE_IDS[token] for word, token in Lexer.reserved.items()}
+_SYMBOL_IDS = {text: kind for kind, text in enumerate(FIXED_TEXT)
+               if text is not None and text not in Lexer.reserved}
+_CONVERTERS = {TYPE_IDS[name]: function for name, function in _CONVERSIONS.items()}
+
+
+class TokenArrays:
+    """Tokens de una fuente en arreglos paralelos"""
+    __slots__ = ('source', 'types', 'offsets', 'values')
+
+    def __init__(self, source):
+        self.source = source
+        self.types = array('B')    # Índice en TOKEN_TYPES
+        self.offsets = array('l')  # Posición del primer carácter (lexpos)
+        self.values = []           # Valor, o None si es FIXED_TEXT[tipo]
+
+    def __len__(self):
+        return len(self.types)
+
+    def value(self, i):
+        value = self.values[i]
+        return FIXED_TEXT[self.types[i]] if value is None else value
+
+    def type_name(self, i):
+        return TOKEN_TYPES[self.types[i]]
+
+
+def tokenize(source, diagnostics=None):
+    """TokenArrays de `source`; los caracteres ilegales van a `diagnostics`"""
+    tokens = TokenArrays(source)
+    types = tokens.types.append
+    offsets = tokens.offsets.append
+    values = tokens.values.append
+    actions = _ACTIONS
+    reserved = _RESERVED_IDS.get
+    symbols = _SYMBOL_IDS
+    converters = _CONVERTERS
+    for match in MASTER.finditer(source):
+        group = match.lastindex
+        action = actions[group]
+        if action == _ID:
+            text = match.group(group)
+            action = reserved(text, _ID)
+            values(text if action == _ID else None)
+        elif action == _SYMBOL:
+            action = symbols[match.group(group)]
+            values(None)
+        elif action < 0:
+            if action == _ERROR and diagnostics is not None:
+                diagnostics.report('lexico', f"Carácter ilegal '{match.group(group)}'",
+                                   offset=match.start(group), source=source)
+            continue
+        else:
+            values(converters[action](match.group(group)))
+        types(action)
+        offsets(match.start(group))
+    return tokens
+
+
+class FastToken:
+    """Lo que el parser de PLY lee de un token (y `lexer`, que fija al reportar errores)"""
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'col', 'lexer')
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+class TokenStream:
+    """Entrega los tokens de un TokenArrays al parser: stream.token() como lexer.token()
+
+    Se pasa a parser.parse(lexer=stream, tokenfunc=stream.token). La línea y la
+    columna salen de los inicios de línea de `line_index` (Diagnostics.LineIndex,
+    que se construye si no se da); como los tokens llegan en orden, la línea
+    sólo avanza y no hace falta buscarla.
+    """
+    def __init__(self, tokens, line_index=None):
+        self.tokens = tokens
+        self.line_index = line_index if line_index is not None else LineIndex(tokens.source)
+        self.lexdata = tokens.source
+        self.lineno = 1
+        self.lexpos = 0
+        self._next = 0
+        self._count = len(tokens.types)
+        self._starts = self.line_index.starts + [len(tokens.source) + 1]
+
+    def token(self):
+        i = self._next
+        if i >= self._count:
+            return None
+        self._next = i + 1
+        tokens = self.tokens
+        tok = FastToken()
+        kind = tokens.types[i]
+        tok.type = TOKEN_TYPES[kind]
+        value = tokens.values[i]
+        tok.value = FIXED_TEXT[kind] if value is None else value
+        tok.lexpos = self.lexpos = offset = tokens.offsets[i]
+        starts = self._starts
+        line = self.lineno
+        while starts[line] <= offset:
+            line += 1
+        tok.lineno = self.lineno = line
+        tok.col = offset - starts[line - 1] + 1
+        return tok
+
+    def __iter__(self):
+        return iter(self.token, None)
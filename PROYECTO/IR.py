@@ -0,0 +1,424 @@
+import time
+
+from Runtime import DEFAULT_VALUES, conversion
+from Visitor import Visitor
+
+# Representación intermedia: grafo de flujo de control de bloques básicos.
+#
+# Cada función es una lista de BasicBlock; blocks[0] es el de entrada. Un bloque
+# tiene instrucciones de tres direcciones (dest = op args) y termina en una sola
+# instrucción de salto: jump, branch o return. Los operandos son Var (variable
+# del programa o temporal) o Const.
+#
+# Las variables del programa se nombran <nombre>_<ranura> (ranuras de Resolver),
+# los temporales %1, %2, ... Al construir el grafo una variable puede asignarse
+# en varios bloques; SSA.to_ssa() la renombra a una versión por asignación e
+# inserta las funciones phi.
+
+# Operaciones que no son operadores binarios (los binarios usan su símbolo; 'i/'
+# y 'i%' son la división y el residuo enteros, como en Bytecode)
+UNARY_OPS = ('copy', 'to_int', 'to_float')
+TERMINATORS = ('jump', 'branch', 'return')
+CONVERSION_OPS = {int: 'to_int', float: 'to_float'}
+
+
+class Var:
+    """Variable o temporal; `version` la pone SSA (0 = valor sin definir)"""
+    __slots__ = ('name', 'version')
+
+    def __init__(self, name, version=None):
+        self.name = name
+        self.version = version
+
+    def __eq__(self, other):
+        return isinstance(other, Var) and (self.name, self.version) == (other.name, other.version)
+
+    def __hash__(self):
+        return hash((self.name, self.version))
+
+    def __repr__(self):
+        return self.name if self.version is None else f"{self.name}.{self.version}"
+
+
+class Const:
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, Const) and type(self.value) is type(other.value) \
+            and self.value == other.value
+
+    def __hash__(self):
+        return hash((type(self.value), self.value))
+
+    def __repr__(self):
+        if self.value is True:
+            return "true"
+        if self.value is False:
+            return "false"
+        return repr(self.value)
+
+
+class Instr:
+    """dest = op args. `callee` para call; `targets` (bloques) para jump y branch.
+
+    En una phi, args[i] es el valor que llega desde block.preds[i].
+    """
+    __slots__ = ('op', 'dest', 'args', 'targets', 'callee')
+
+    def __init__(self, op, dest=None, args=(), targets=(), callee=None):
+        self.op = op
+        self.dest = dest
+        self.args = list(args)
+        self.targets = list(targets)
+        self.callee = callee
+
+    def uses(self):
+        return [arg for arg in self.args if isinstance(arg, Var)]
+
+    def __repr__(self):
+        args = ", ".join(map(repr, self.args))
+        if self.op == 'phi':
+            return f"{self.dest!r} = phi [{args}]"
+        if self.op == 'jump':
+            return f"jump b{self.targets[0].index}"
+        if self.op == 'branch':
+            true, false = self.targets
+            return f"branch {args} b{true.index} b{false.index}"
+        if self.op == 'return':
+            return f"return {args}".rstrip()
+        if self.op == 'print':
+            return f"print {args}"
+        if self.op == 'call':
+            text = f"call {self.callee}({args})"
+        elif self.op == 'param':
+            text = f"param {args}"
+        elif self.op in UNARY_OPS:
+            text = args if self.op == 'copy' else f"{self.op} {args}"
+        else:
+            left, right = self.args
+            text = f"{left!r} {self.op} {right!r}"
+        return text if self.dest is None else f"{self.dest!r} = {text}"
+
+
+class BasicBlock:
+    __slots__ = ('index', 'phis', 'instrs', 'terminator', 'preds', 'succs')
+
+    def __init__(self, index):
+        self.index = index
+        self.phis = []
+        self.instrs = []
+        self.terminator = None
+        self.preds = []
+        self.succs = []
+
+    def __repr__(self):
+        return f"b{self.index}"
+
+
+class IRFunction:
+    """Grafo de una función; `idom` y `frontiers` los llena SSA"""
+    def __init__(self, name, params, return_type):
+        self.name = name
+        self.params = params          # [Var]
+        self.return_type = return_type
+        self.blocks = []
+        self.idom = None              # [índice del dominador inmediato de cada bloque]
+        self.frontiers = None         # [{índices de la frontera de dominancia}]
+        self.ssa = False
+
+    @property
+    def entry(self):
+        return self.blocks[0]
+
+    def instruction_count(self):
+        return sum(len(b.phis) + len(b.instrs) + 1 for b in self.blocks)
+
+    def dump(self):
+        params = ", ".join(map(repr, self.params))
+        lines = [f"function {self.name}({params}) -> {self.return_type}:"]
+        for block in self.blocks:
+            preds = ", ".join(map(repr, block.preds))
+            header = f"  {block!r}:"
+            if block.preds:
+                header = f"{header:<10}; preds: {preds}"
+            if self.idom is not None and block.index != 0:
+                header += f"  idom: b{self.idom[block.index]}"
+            lines.append(header)
+            for instr in block.phis + block.instrs + [block.terminator]:
+                lines.append(f"    {instr!r}")
+        return "\n".join(lines)
+
+
+class IRModule:
+    """Funciones del programa y tiempo acumulado por fase ({fase: segundos})"""
+    def __init__(self, functions, timings):
+        self.functions = functions
+        self.timings = timings
+
+    def function(self, name):
+        return next(f for f in self.functions if f.name == name)
+
+    def dump(self):
+        return "\n\n".join(function.dump() for function in self.functions)
+
+    def timing_report(self):
+        total = sum(self.timings.values())
+        instructions = sum(f.instruction_count() for f in self.functions)
+        lines = [f"{phase:<12} {seconds * 1000:9.3f} ms" for phase, seconds in self.timings.items()]
+        lines.append(f"{'total':<12} {total * 1000:9.3f} ms  ({instructions} instrucciones, "
+                     f"{sum(len(f.blocks) for f in self.functions)} bloques)")
+        return "\n".join(lines)
+
+
+class Timer:
+    """Acumula en timings[fase] el tiempo del bloque with"""
+    def __init__(self, timings, phase):
+        self.timings = timings
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.timings[self.phase] = self.timings.get(self.phase, 0.0) + elapsed
+
+
+def _variable(node):
+    """Nombre IR de la variable de una declaración, parámetro o uso"""
+    name = node[2] if node[0] in ('declaration', 'param') else node[1]
+    return f"{name}_{node.addr[1]}"
+
+
+def _signature(func):
+    if func[0] == 'function':
+        _, return_type, name, params_list, block_node = func
+        return name, return_type, params_list, block_node
+    return 'main', 'void', func[1], func[2]
+
+
+class CFGBuilder(Visitor):
+    """Baja el AST verificado y resuelto de una función a bloques básicos"""
+    DISPATCH = {
+        'statement': {
+            'declaration': '_lower_declaration',
+            'assignment': '_lower_assignment',
+            'if': '_lower_if',
+            'while': '_lower_while',
+            'for': '_lower_for',
+            'return': '_lower_return',
+            'print': '_lower_print',
+            'call': '_lower_call_statement',
+        },
+        'expression': {
+            'number': '_lower_constant',
+            'string': '_lower_constant',
+            'bool': '_lower_constant',
+            'id': '_lower_id',
+            'call': '_lower_call',
+            'and': '_lower_logical',
+            'or': '_lower_logical',
+            **{op: '_lower_binary' for op in
+               ('==', '!=', '<', '>', '<=', '>=', '+', '-', '*', '/', '%')},
+        },
+    }
+
+    def __init__(self, param_types):
+        self.param_types = param_types  # {función: [tipos]} para convertir argumentos
+        self._temps = 0
+
+    def build_function(self, func):
+        name, return_type, params_list, block_node = _signature(func)
+        function = IRFunction(name, [Var(_variable(p)) for p in params_list], return_type)
+        self.function = function
+        self._return_type = return_type
+        self._temps = 0
+        self.current = self._new_block()
+        for i, param in enumerate(function.params):
+            self._emit('param', param, [Const(i)])
+        self._lower_statements(block_node[1])
+        self._terminate(Instr('return', args=[Const(DEFAULT_VALUES.get(return_type))]))
+        _remove_unreachable(function)
+        return function
+
+    # --- Construcción ---
+
+    def _new_block(self):
+        block = BasicBlock(len(self.function.blocks))
+        self.function.blocks.append(block)
+        return block
+
+    def _temp(self):
+        self._temps += 1
+        return Var(f"%{self._temps}")
+
+    def _emit(self, op, dest=None, args=(), callee=None):
+        self.current.instrs.append(Instr(op, dest, args, callee=callee))
+        return dest
+
+    def _terminate(self, terminator, next_block=None):
+        """Cierra el bloque actual y sigue en `next_block` (o en uno nuevo, inalcanzable)"""
+        block = self.current
+        block.terminator = terminator
+        for target in terminator.targets:
+            block.succs.append(target)
+            target.preds.append(block)
+        self.current = next_block if next_block is not None else self._new_block()
+
+    def _jump(self, target, next_block=None):
+        self._terminate(Instr('jump', targets=[target]), next_block)
+
+    def _branch(self, condition, true, false, next_block):
+        self._terminate(Instr('branch', args=[condition], targets=[true, false]), next_block)
+
+    # --- Instrucciones ---
+
+    def _lower_statements(self, statements):
+        for stmt in statements:
+            self.handler_for('statement', stmt)(self, stmt)
+
+    def _lower_declaration(self, decl):
+        _, var_type, _, init = decl
+        value = Const(DEFAULT_VALUES[var_type]) if init is None else self._converted(init, var_type)
+        self._emit('copy', Var(_variable(decl)), [value])
+
+    def _lower_assignment(self, assign):
+        self._emit('copy', Var(_variable(assign)), [self._converted(assign[2], assign.ty)])
+
+    def _lower_if(self, if_stmt):
+        _, condition, then_block, else_block = if_stmt
+        test = self._expression(condition)
+        then_entry, join = self._new_block(), self._new_block()
+        else_entry = join if else_block is None else self._new_block()
+        self._branch(test, then_entry, else_entry, then_entry)
+        self._lower_statements(then_block[1])
+        if else_block is None:
+            self._jump(join, join)
+            return
+        self._jump(join, else_entry)
+        self._lower_statements(else_block[1])
+        self._jump(join, join)
+
+    def _lower_loop(self, condition, body_statements, update=None):
+        header, body, exit_ = self._new_block(), self._new_block(), self._new_block()
+        self._jump(header, header)
+        self._branch(self._expression(condition), body, exit_, body)
+        self._lower_statements(body_statements)
+        if update is not None:
+            self._lower_assignment(update)
+        self._jump(header, exit_)
+
+    def _lower_while(self, while_stmt):
+        _, condition, body = while_stmt
+        self._lower_loop(condition, body[1])
+
+    def _lower_for(self, for_stmt):
+        # for (init; cond; update) body  ->  init; while (cond) { body; update }
+        _, init, condition, update, body = for_stmt
+        self._lower_assignment(init)
+        self._lower_loop(condition, body[1], update)
+
+    def _lower_return(self, return_stmt):
+        if return_stmt[1] is None:
+            value = Const(None)
+        else:
+            value = self._converted(return_stmt[1], self._return_type)
+        self._terminate(Instr('return', args=[value]))
+
+    def _lower_print(self, print_stmt):
+        self._emit('print', args=[self._expression(print_stmt[1])])
+
+    def _lower_call_statement(self, call):
+        self._lower_call(call, dest=None)
+
+    # --- Expresiones ---
+
+    def _expression(self, expr):
+        return self.handler_for('expression', expr)(self, expr)
+
+    def _converted(self, expr, target_type):
+        value = self._expression(expr)
+        convert = conversion(target_type, expr.ty)
+        if convert is None:
+            return value
+        if isinstance(value, Const):
+            return Const(convert(value.value))
+        return self._emit(CONVERSION_OPS[convert], self._temp(), [value])
+
+    def _lower_constant(self, expr):
+        return Const(expr[1])
+
+    def _lower_id(self, expr):
+        return Var(_variable(expr))
+
+    def _lower_call(self, call, dest=True):
+        args = [self._converted(arg, param_type)
+                for arg, param_type in zip(call[2], self.param_types[call[1]])]
+        return self._emit('call', self._temp() if dest else None, args, callee=call[1])
+
+    def _lower_logical(self, expr):
+        # a && b: t = a; if t { t = b }.  a || b: t = a; if !t { t = b }
+        op, left, right = expr
+        result = self._temp()
+        self._emit('copy', result, [self._expression(left)])
+        rhs, join = self._new_block(), self._new_block()
+        if op == 'and':
+            self._branch(result, rhs, join, rhs)
+        else:
+            self._branch(result, join, rhs, rhs)
+        self._emit('copy', Var(result.name), [self._expression(right)])
+        self._jump(join, join)
+        return Var(result.name)
+
+    def _lower_binary(self, expr):
+        op, left, right = expr
+        if op in ('/', '%') and left.ty == 'int' and right.ty == 'int':
+            op = 'i' + op
+        left_value = self._expression(left)
+        right_value = self._expression(right)
+        return self._emit(op, self._temp(), [left_value, right_value])
+
+
+def _remove_unreachable(function):
+    """Quita los bloques sin camino desde la entrada y deja el resto en orden
+    posorden inverso (el del listado y el que esperan los análisis de SSA)"""
+    order, visited = [], {function.entry.index}
+    stack = [(function.entry, iter(reversed(function.entry.succs)))]
+    while stack:
+        block, succs = stack[-1]
+        for succ in succs:
+            if succ.index not in visited:
+                visited.add(succ.index)
+                stack.append((succ, iter(reversed(succ.succs))))
+                break
+        else:
+            order.append(block)
+            stack.pop()
+    order.reverse()
+    for block in order:
+        block.preds = [pred for pred in block.preds if pred.index in visited]
+    for i, block in enumerate(order):
+        block.index = i
+    function.blocks = order
+
+
+def build_ir(ast, frame_sizes=None, ssa=True, timings=None):
+    """IRModule de un AST verificado y resuelto; en forma SSA salvo ssa=False"""
+    from SSA import to_ssa  # SSA importa este módulo
+    timings = {} if timings is None else timings
+    param_types = {}
+    for func in ast[1]:
+        name, _, params_list, _ = _signature(func)
+        param_types[name] = [param[1] for param in params_list]
+    functions = []
+    builder = CFGBuilder(param_types)
+    for func in ast[1]:
+        with Timer(timings, 'grafo'):
+            functions.append(builder.build_function(func))
+    if ssa:
+        for function in functions:
+            to_ssa(function, timings)
+    return IRModule(functions, timings)
@@ -0,0 +1,464 @@
+from ASTNodes import BINARY_KINDS, node_at, node_position
+from CodeMotion import Temporaries, expression_key
+from DeadCode import terminates
+from Optimizer import is_constant, constant_node
+from Runtime import DEFAULT_VALUES, conversion
+
+# Integración de funciones y eliminación de llamadas finales recursivas.
+#
+# Corre primero entre las optimizaciones (antes de Optimizer, que pliega lo que
+# queda constante después de integrar). Las funciones son las que registró el
+# análisis en SymbolTable.functions: cada llamada lleva en `sym` la misma
+# entrada que su definición.
+#
+# Llamadas finales: en una función que se llama a sí misma, cada
+# `return f(args)` en posición final (la última instrucción del cuerpo, o la de
+# una rama de un if en posición final) se convierte en asignar los argumentos a
+# los parámetros y volver al principio de un while. Antes se normaliza
+# `if (c) { ...return } resto` a `if (c) { ...return } else { resto }` para que
+# el if quede en posición final. Con retorno int, `return e + f(args)` y
+# `return e * f(args)` (e sin efectos) también se convierten, con un acumulador:
+# cada otro `return v` pasa a `return acc + v` (o acc * v). Así el factorial
+# recursivo queda como un bucle y no depende del límite de recursión.
+#
+# Integración: una función no recursiva con cuerpo de a lo sumo INLINE_BUDGET
+# nodos se copia en el lugar de la llamada, con sus variables renombradas a
+# temporales nuevos. Si el cuerpo es un solo `return e`, la llamada se
+# reemplaza por e con los argumentos sustituidos (cuando los argumentos no
+# tienen efectos); si no, el cuerpo se copia antes de la instrucción que hace la
+# llamada (cuando la llamada es lo único con efectos de esa instrucción y el
+# cuerpo tiene un solo return, al final). Las funciones se procesan de las
+# llamadas hacia las que llaman, así lo integrado ya viene integrado.
+
+INLINE_BUDGET = 24
+ACCUMULATOR_IDENTITIES = {'+': 0, '*': 1}
+
+
+def _count_nodes(node):
+    if isinstance(node, list):
+        return sum(_count_nodes(item) for item in node)
+    if hasattr(node, 'fields'):
+        return 1 + sum(_count_nodes(child) for child in node.children())
+    return 0
+
+
+def _calls_in(node, found):
+    """Nodos call dentro de `node`, en orden de evaluación"""
+    if isinstance(node, list):
+        for item in node:
+            _calls_in(item, found)
+    elif hasattr(node, 'fields'):
+        for child in node.children():
+            _calls_in(child, found)
+        if node[0] == 'call':
+            found.append(node)
+    return found
+
+
+def _returns(statements, found):
+    """Instrucciones return de una lista (y de sus bloques anidados)"""
+    for stmt in statements:
+        if stmt[0] == 'return':
+            found.append(stmt)
+        for block_node in _blocks(stmt):
+            _returns(block_node[1], found)
+    return found
+
+
+def _blocks(stmt):
+    if stmt[0] == 'if':
+        return [stmt.then_block] + ([stmt.else_block] if stmt.else_block is not None else [])
+    if stmt[0] in ('while', 'for'):
+        return [stmt.body]
+    return []
+
+
+def _may_fail(node):
+    """Verdadero si hay una división cuyo divisor puede ser 0 fuera de las llamadas"""
+    if not hasattr(node, 'fields') or node[0] == 'call':
+        return False
+    if node[0] in ('/', '%') and not (is_constant(node.right) and node.right[1] != 0):
+        return True
+    return any(_may_fail(child) for child in node.children() if hasattr(child, 'fields'))
+
+
+def _in_short_circuit(expr, target, guarded=False):
+    """Verdadero si `target` está en el operando derecho de un && o || de `expr`"""
+    if expr is target:
+        return guarded
+    if expr.kind in BINARY_KINDS:
+        inner = guarded or expr[0] in ('and', 'or')
+        return _in_short_circuit(expr.left, target, guarded) or \
+            _in_short_circuit(expr.right, target, inner)
+    if expr[0] == 'call':
+        return any(_in_short_circuit(arg, target, guarded) for arg in expr.args)
+    return False
+
+
+def _binary(op, left, right, ty, like):
+    node = node_at(node_position(like), op, left, right)
+    node.ty = ty
+    return node
+
+
+class Inliner:
+    """Reescribe el AST en su lugar; cuenta las llamadas integradas y eliminadas"""
+    def __init__(self, budget=INLINE_BUDGET):
+        self.budget = budget
+        self.inlined = 0     # Llamadas reemplazadas por el cuerpo de la función
+        self.tail_calls = 0  # Llamadas finales convertidas en vueltas de un bucle
+        self.inlined_functions = set()  # Nombres de las funciones copiadas
+        self._temporaries = None
+        self._functions = {}
+
+    def optimize_program(self, ast):
+        self._temporaries = Temporaries(ast)
+        self._functions = {func.name: func for func in ast[1] if func[0] == 'function'}
+        for func in self._functions.values():
+            self._eliminate_tail_calls(func)
+        recursive = self._recursive_functions()
+        for func in self._bottom_up(ast):
+            self._inline_block(func[4] if func[0] == 'function' else func[2], recursive)
+        return ast
+
+    # --- Grafo de llamadas ---
+
+    def _callees(self, func):
+        return {call.name for call in _calls_in(func.children(), []) if call.name in self._functions}
+
+    def _recursive_functions(self):
+        """Funciones que pueden volver a llamarse a sí mismas (directa o indirectamente)"""
+        callees = {name: self._callees(func) for name, func in self._functions.items()}
+        recursive = set()
+        for name in callees:
+            seen, pending = set(), list(callees[name])
+            while pending:
+                callee = pending.pop()
+                if callee == name:
+                    recursive.add(name)
+                    break
+                if callee not in seen:
+                    seen.add(callee)
+                    pending.extend(callees.get(callee, ()))
+        return recursive
+
+    def _bottom_up(self, ast):
+        """Funciones en posorden del grafo de llamadas: las llamadas antes que quien llama"""
+        order, visited = [], set()
+
+        def visit(func):
+            key = func.name if func[0] == 'function' else None
+            if key in visited:
+                return
+            visited.add(key)
+            for callee in sorted(self._callees(func)):
+                visit(self._functions[callee])
+            order.append(func)
+
+        for func in ast[1]:
+            visit(func)
+        return order
+
+    # --- Llamadas finales ---
+
+    def _eliminate_tail_calls(self, func):
+        statements = func.block.statements
+        if not any(func.name in (call.name for call in _calls_in(stmt, []))
+                   for stmt in _returns(statements, [])):
+            return
+        _normalize(statements)
+        sites = []
+        _tail_positions(statements, sites)
+        sites = [(owner, index, self._tail_call(func, owner[index])) for owner, index in sites]
+        sites = [site for site in sites if site[2] is not None]
+        if not sites:
+            return
+
+        # El acumulador usa el operador más frecuente; las demás llamadas se quedan
+        ops = [op for _, _, (op, _) in sites if op is not None]
+        op = max(set(ops), key=ops.count) if ops else None
+        if op is not None and not (func.return_type == 'int' and all(
+                stmt.value is not None and stmt.value.ty == 'int'
+                for stmt in _returns(statements, []))):
+            op = None
+        sites = [site for site in sites if site[2][0] in (None, op)]
+        if not sites:
+            return
+
+        temporaries = self._temporaries
+        flag = temporaries.declare('bool', constant_node(True, func), func)
+        accumulator = None
+        if op is not None:
+            accumulator = temporaries.declare('int', constant_node(ACCUMULATOR_IDENTITIES[op], func), func)
+
+        # Se reemplaza de atrás hacia adelante para no mover los índices pendientes
+        for owner, index, (_, term) in reversed(sites):
+            call = owner[index].value if term is None else \
+                (owner[index].value.right if owner[index].value.right[0] == 'call'
+                 else owner[index].value.left)
+            replacement = []
+            if term is not None:
+                replacement.append(self._assign(accumulator, _binary(
+                    op, temporaries.use(accumulator, term), term, 'int', term)))
+            replacement.extend(self._rebind_params(func, call))
+            replacement.append(self._assign(flag, constant_node(True, call)))
+            owner[index:index + 1] = replacement
+            self.tail_calls += 1
+
+        if accumulator is not None:
+            for stmt in _returns(statements, []):
+                stmt.value = _binary(op, temporaries.use(accumulator, stmt), stmt.value, 'int', stmt)
+
+        loop_body = node_at(node_position(func.block), 'block',
+                            [self._assign(flag, constant_node(False, func))] + statements)
+        loop = node_at(node_position(func.block), 'while', temporaries.use(flag, func), loop_body)
+        new_statements = ([accumulator] if accumulator is not None else []) + [flag, loop]
+        if accumulator is not None:
+            # Si el cuerpo termina sin return, la función devuelve acc op valor por defecto
+            new_statements.append(node_at(node_position(func.block), 'return', _binary(
+                op, temporaries.use(accumulator, func),
+                constant_node(DEFAULT_VALUES['int'], func), 'int', func)))
+        func.block.statements = new_statements
+
+    def _tail_call(self, func, stmt):
+        """(operador, término) si `stmt` es return f(args) [op término]; si no, None"""
+        if stmt[0] != 'return' or stmt.value is None:
+            return None
+        value = stmt.value
+        if self._is_self_call(func, value):
+            return (None, None)
+        if value.kind in BINARY_KINDS and value[0] in ACCUMULATOR_IDENTITIES and value.ty == 'int':
+            for call, term in ((value.right, value.left), (value.left, value.right)):
+                if self._is_self_call(func, call) and term.ty == 'int' and \
+                        expression_key(term) is not None:
+                    return (value[0], term)
+        return None
+
+    @staticmethod
+    def _is_self_call(func, expr):
+        return expr[0] == 'call' and expr.sym is func.sym
+
+    def _rebind_params(self, func, call):
+        """Asignaciones de los argumentos a los parámetros (evaluados todos antes)"""
+        changing = [(param, arg) for param, arg in zip(func.params, call.args)
+                    if not (arg[0] == 'id' and arg.sym is param.sym)]
+        if len(changing) <= 1:
+            return [self._assign(param, arg) for param, arg in changing]
+        temporaries = [self._temporaries.declare(param[1], arg, arg) for param, arg in changing]
+        return temporaries + [self._assign(param, self._temporaries.use(temp, temp))
+                              for (param, _), temp in zip(changing, temporaries)]
+
+    @staticmethod
+    def _assign(target, value):
+        """target = value, para un parámetro o una declaración"""
+        assign = node_at(node_position(value), 'assignment', target[2], value)
+        assign.sym = target.sym
+        assign.ty = target.ty if target.ty is not None else target[1]
+        return assign
+
+    # --- Integración ---
+
+    def _inlinable(self, call, recursive):
+        func = self._functions.get(call.name)
+        if func is None or call.name in recursive or call.sym is not func.sym:
+            return None
+        if _count_nodes(func.block) > self.budget:
+            return None
+        return func
+
+    def _inline_block(self, block_node, recursive):
+        statements = []
+        for stmt in block_node[1]:
+            _replace_expressions(stmt, lambda expr: self._inline_expression(expr, recursive))
+            statements.extend(self._inline_statement(stmt, recursive))
+            for nested in _blocks(stmt):
+                self._inline_block(nested, recursive)
+        block_node.statements = statements
+
+    def _inline_expression(self, call, recursive):
+        """La expresión que reemplaza a la llamada, o None si no se integra"""
+        if call[0] != 'call':
+            return None
+        func = self._inlinable(call, recursive)
+        if func is None or len(func.block.statements) != 1 or func.block.statements[0][0] != 'return':
+            return None
+        body = func.block.statements[0].value
+        if body is None or conversion(func.return_type, body.ty) is not None:
+            return None
+        substitutions = {}
+        for param, arg in zip(func.params, call.args):
+            if conversion(param[1], arg.ty) is not None or expression_key(arg) is None:
+                return None
+            uses = sum(1 for node in _ids(body) if node.sym is param.sym)
+            if uses > 1 and arg[0] != 'id' and not is_constant(arg):
+                return None
+            substitutions[id(param.sym)] = arg
+        self.inlined += 1
+        self.inlined_functions.add(func.name)
+        return _Copier(self._temporaries, {}, substitutions).copy(body)
+
+    def _inline_statement(self, stmt, recursive):
+        """Instrucciones que reemplazan a `stmt` (la misma, si no se integra nada)"""
+        if stmt[0] not in ('declaration', 'assignment', 'print', 'return', 'call', 'if'):
+            return [stmt]
+        expressions = [stmt] if stmt[0] == 'call' else _own_expressions(stmt)
+        calls = _calls_in(expressions, [])
+        if len(calls) != 1:
+            return [stmt]
+        call = calls[0]
+        func = self._inlinable(call, recursive)
+        if func is None or any(_in_short_circuit(expr, call) for expr in expressions):
+            return [stmt]
+        if any(_may_fail(expr) for expr in expressions):
+            return [stmt]
+        body = func.block.statements
+        returns = _returns(body, [])
+        if returns and (len(returns) > 1 or body[-1] is not returns[0]):
+            return [stmt]
+        if stmt is not call and not (returns and returns[0].value is not None):
+            return [stmt]  # Sin return al final el valor es el por defecto: se deja la llamada
+
+        copier = _Copier(self._temporaries, {}, {})
+        replacement = []
+        for param, arg in zip(func.params, call.args):
+            temp = self._temporaries.declare(param[1], arg, arg)
+            copier.renames[id(param.sym)] = temp
+            replacement.append(temp)
+        statements = body[:-1] if returns else body
+        replacement.extend(copier.copy(inner) for inner in statements)
+        result = None
+        if returns and returns[0].value is not None:
+            result = self._temporaries.declare(func.return_type, copier.copy(returns[0].value), call)
+            replacement.append(result)
+        self.inlined += 1
+        self.inlined_functions.add(func.name)
+        if stmt is call:
+            return replacement
+        value = self._temporaries.use(result, call) if result is not None else None
+        _replace_expressions(stmt, lambda expr: value if expr is call else None)
+        return replacement + [stmt]
+
+
+def _ids(node):
+    if hasattr(node, 'fields'):
+        if node[0] == 'id':
+            yield node
+        for child in node.children():
+            if isinstance(child, list):
+                for item in child:
+                    yield from _ids(item)
+            else:
+                yield from _ids(child)
+
+
+def _own_expressions(stmt):
+    kind = stmt[0]
+    if kind == 'declaration':
+        return [stmt.init] if stmt.init is not None else []
+    if kind == 'assignment':
+        return [stmt.value]
+    if kind in ('print', 'return'):
+        return [stmt.value] if stmt.value is not None else []
+    if kind == 'if':
+        return [stmt.condition]
+    return []
+
+
+def _replace(expr, replace):
+    """Reescribe `expr` de abajo arriba: replace(nodo) devuelve el sustituto o None"""
+    if expr.kind in BINARY_KINDS:
+        expr.left = _replace(expr.left, replace)
+        expr.right = _replace(expr.right, replace)
+    elif expr[0] == 'call':
+        expr.args = [_replace(arg, replace) for arg in expr.args]
+    new = replace(expr)
+    return expr if new is None else new
+
+
+def _replace_expressions(stmt, replace):
+    """Aplica _replace a las expresiones propias de la instrucción"""
+    kind = stmt[0]
+    if kind == 'declaration':
+        if stmt.init is not None:
+            stmt.init = _replace(stmt.init, replace)
+    elif kind == 'assignment':
+        stmt.value = _replace(stmt.value, replace)
+    elif kind in ('print', 'return'):
+        if stmt.value is not None:
+            stmt.value = _replace(stmt.value, replace)
+    elif kind == 'call':
+        stmt.args = [_replace(arg, replace) for arg in stmt.args]
+    elif kind in ('if', 'while'):
+        stmt.condition = _replace(stmt.condition, replace)
+    elif kind == 'for':
+        stmt.init.value = _replace(stmt.init.value, replace)
+        stmt.condition = _replace(stmt.condition, replace)
+        stmt.update.value = _replace(stmt.update.value, replace)
+
+
+def _normalize(statements):
+    """if (c) { ...return } resto  ->  if (c) { ...return } else { resto }, en posición final"""
+    for i, stmt in enumerate(statements):
+        if stmt[0] == 'if' and stmt.else_block is None and i + 1 < len(statements) and \
+                any(terminates(inner) for inner in stmt.then_block[1]):
+            stmt.else_block = node_at(node_position(statements[i + 1]), 'block', statements[i + 1:])
+            del statements[i + 1:]
+            break
+    if statements and statements[-1][0] == 'if':
+        last = statements[-1]
+        _normalize(last.then_block.statements)
+        if last.else_block is not None:
+            _normalize(last.else_block.statements)
+
+
+def _tail_positions(statements, found):
+    """(lista, índice) de las instrucciones en posición final"""
+    if not statements:
+        return found
+    last = statements[-1]
+    if last[0] == 'if':
+        _tail_positions(last.then_block.statements, found)
+        if last.else_block is not None:
+            _tail_positions(last.else_block.statements, found)
+    else:
+        found.append((statements, len(statements) - 1))
+    return found
+
+
+class _Copier:
+    """Copia instrucciones y expresiones de una función con sus variables renombradas"""
+    def __init__(self, temporaries, renames, substitutions):
+        self.temporaries = temporaries
+        self.renames = renames              # id(símbolo) -> declaración del temporal
+        self.substitutions = substitutions  # id(símbolo) -> expresión del argumento
+
+    def copy(self, node):
+        if isinstance(node, list):
+            return [self.copy(item) for item in node]
+        if not hasattr(node, 'fields'):
+            return node
+        tag = node[0]
+        if tag == 'declaration':
+            decl = self.temporaries.declare(node[1], None, node)
+            self.renames[id(node.sym)] = decl
+            decl.init = self.copy(node.init)
+            return decl
+        if tag == 'id' and id(node.sym) in self.substitutions:
+            return self.copy_plain(self.substitutions[id(node.sym)])
+        if tag in ('id', 'assignment') and id(node.sym) in self.renames:
+            target = self.renames[id(node.sym)]
+            fields = [target[2]] + [self.copy(child) for child in node.children()[1:]]
+            new = node_at(node_position(node), tag, *fields)
+            new.sym, new.ty = target.sym, node.ty
+            return new
+        new = node_at(node_position(node), tag, *[self.copy(child) for child in node.children()])
+        new.sym, new.ty = node.sym, node.ty
+        return new
+
+    def copy_plain(self, node):
+        """Copia de un argumento (ya pertenece a quien llama: no se renombra)"""
+        return _Copier(self.temporaries, {}, {}).copy(node)
+
+
+def inline_program(ast):
+    return Inliner().optimize_program(ast)
@@ -0,0 +1,274 @@
+import operator
+import sys
+
+from ASTNodes import KIND
+from Runtime import (EvolaRuntimeError, DEFAULT_VALUES, int_div, int_mod,
+                     format_value, conversion, recursion_limit)
+from Visitor import Visitor
+
+# Operadores que se evalúan directamente con una función de Python
+OPERATOR_FUNCTIONS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv,
+    '%': operator.mod,
+    '==': operator.eq, '!=': operator.ne, '<': operator.lt, '>': operator.gt,
+    '<=': operator.le, '>=': operator.ge,
+}
+# Con dos operandos int, / y % siguen la semántica de C
+INT_OPERATOR_FUNCTIONS = dict(OPERATOR_FUNCTIONS, **{'/': int_div, '%': int_mod})
+
+_CONSTANT_KINDS = frozenset((KIND['number'], KIND['string'], KIND['bool']))
+
+# Cada llamada de Evola usa varias llamadas de Python (una por nivel de clausura)
+RECURSION_LIMIT = 10000
+
+
+class _Function:
+    """Función compilada: su cuerpo se llena después, para permitir recursión"""
+    __slots__ = ('name', 'frame_size', 'param_types', 'default', 'body')
+
+    def __init__(self, name, frame_size, param_types, default):
+        self.name = name
+        self.frame_size = frame_size
+        self.param_types = param_types
+        self.default = default  # Valor si el cuerpo termina sin return
+        self.body = None
+
+
+class Interpreter(Visitor):
+    """Intérprete de árbol por compilación a clausuras.
+
+    Cada nodo del AST se traduce una sola vez a una función de Python que recibe
+    la activación (una lista indexada por las ranuras de Resolver). Al ejecutar
+    no se vuelve a despachar por tipo de nodo ni a buscar variables por nombre:
+    los tipos inferidos por SemanticAnalyzer deciden de antemano qué operación y
+    qué conversión int/float aplicar.
+
+    Las instrucciones devuelven None para seguir, o True después de un return; el
+    valor devuelto se guarda en la última ranura de la activación.
+    """
+    DISPATCH = {
+        'statement': {
+            'declaration': '_compile_declaration',
+            'assignment': '_compile_assignment',
+            'if': '_compile_if',
+            'while': '_compile_while',
+            'for': '_compile_for',
+            'return': '_compile_return',
+            'print': '_compile_print',
+            'call': '_compile_call_statement',
+        },
+        'expression': {
+            'number': '_compile_constant',
+            'string': '_compile_constant',
+            'bool': '_compile_constant',
+            'id': '_compile_id',
+            'call': '_compile_call',
+            'and': '_compile_and',
+            'or': '_compile_or',
+            **{op: '_compile_binary' for op in OPERATOR_FUNCTIONS},
+        },
+    }
+
+    def __init__(self, ast, frame_sizes, out=None):
+        """`ast` y `frame_sizes` son los de un CompilationResult sin errores"""
+        self.out = out if out is not None else sys.stdout
+        self.functions = {}
+        for func in ast[1]:
+            if func[0] == 'function':
+                _, return_type, name, params_list, _ = func
+            else:
+                params_list, return_type, name = func[1], 'void', 'main'
+            param_types = [param[1] for param in params_list]
+            self.functions[name] = _Function(name, frame_sizes[name], param_types,
+                                             DEFAULT_VALUES.get(return_type))
+        for func in ast[1]:
+            if func[0] == 'function':
+                _, return_type, name, _, block_node = func
+            else:
+                return_type, name, block_node = 'void', 'main', func[2]
+            self._return_type = return_type
+            self._return_slot = self.functions[name].frame_size
+            self.functions[name].body = self._compile_block(block_node)
+
+    # --- Ejecución ---
+
+    def run(self, name='main', args=()):
+        """Ejecuta una función (main por defecto) y devuelve su valor"""
+        try:
+            with recursion_limit(RECURSION_LIMIT):
+                return self.call(self.functions[name], list(args))
+        except ZeroDivisionError:
+            raise EvolaRuntimeError("División por cero") from None
+        except RecursionError:
+            raise EvolaRuntimeError("Recursión demasiado profunda") from None
+
+    def call(self, function, args):
+        frame = [None] * (function.frame_size + 1)
+        frame[:len(args)] = args
+        if function.body(frame):
+            return frame[-1]
+        return function.default
+
+    # --- Compilación de instrucciones ---
+
+    def _compile_block(self, block_node):
+        statements = [self._compile_statement(stmt) for stmt in block_node[1]]
+        if len(statements) == 1:
+            return statements[0]
+
+        def block(frame):
+            for statement in statements:
+                if statement(frame):
+                    return True
+        return block
+
+    def _compile_statement(self, stmt):
+        return self.handler_for('statement', stmt)(self, stmt)
+
+    def _compile_declaration(self, decl):
+        _, var_type, _, init = decl
+        slot = decl.addr[1]
+        if init is None:
+            default = DEFAULT_VALUES[var_type]
+
+            def declare(frame):
+                frame[slot] = default
+            return declare
+        value = self._compile_converted(init, var_type)
+
+        def declare(frame):
+            frame[slot] = value(frame)
+        return declare
+
+    def _compile_assignment(self, assign):
+        slot = assign.addr[1]
+        value = self._compile_converted(assign[2], assign.ty)
+
+        def assign_(frame):
+            frame[slot] = value(frame)
+        return assign_
+
+    def _compile_if(self, if_stmt):
+        _, condition, then_block, else_block = if_stmt
+        test = self._compile_expression(condition)
+        then_ = self._compile_block(then_block)
+        if else_block is None:
+            def if_(frame):
+                if test(frame):
+                    return then_(frame)
+            return if_
+        else_ = self._compile_block(else_block)
+
+        def if_else(frame):
+            if test(frame):
+                return then_(frame)
+            return else_(frame)
+        return if_else
+
+    def _compile_while(self, while_stmt):
+        _, condition, body_node = while_stmt
+        test = self._compile_expression(condition)
+        body = self._compile_block(body_node)
+
+        def while_(frame):
+            while test(frame):
+                if body(frame):
+                    return True
+        return while_
+
+    def _compile_for(self, for_stmt):
+        _, init_node, condition, update_node, body_node = for_stmt
+        init = self._compile_assignment(init_node)
+        test = self._compile_expression(condition)
+        update = self._compile_assignment(update_node)
+        body = self._compile_block(body_node)
+
+        def for_(frame):
+            init(frame)
+            while test(frame):
+                if body(frame):
+                    return True
+                update(frame)
+        return for_
+
+    def _compile_return(self, return_stmt):
+        slot = self._return_slot
+        if return_stmt[1] is None:
+            def return_(frame):
+                frame[slot] = None
+                return True
+            return return_
+        value = self._compile_converted(return_stmt[1], self._return_type)
+
+        def return_value(frame):
+            frame[slot] = value(frame)
+            return True
+        return return_value
+
+    def _compile_print(self, print_stmt):
+        value = self._compile_expression(print_stmt[1])
+        write = self.out.write
+        if print_stmt[1].ty == 'string':
+            def print_(frame):
+                write(value(frame) + "\n")
+        else:
+            def print_(frame):
+                write(format_value(value(frame)) + "\n")
+        return print_
+
+    def _compile_call_statement(self, call):
+        value = self._compile_call(call)
+
+        def call_(frame):
+            value(frame)
+        return call_
+
+    # --- Compilación de expresiones ---
+
+    def _compile_expression(self, expr):
+        return self.handler_for('expression', expr)(self, expr)
+
+    def _compile_converted(self, expr, target_type):
+        """Expresión cuyo valor se convierte al tipo de la variable que lo recibe"""
+        value = self._compile_expression(expr)
+        convert = conversion(target_type, expr.ty)
+        if convert is None:
+            return value
+        return lambda frame: convert(value(frame))
+
+    def _compile_constant(self, expr):
+        constant = expr[1]
+        return lambda frame: constant
+
+    def _compile_id(self, expr):
+        slot = expr.addr[1]
+        return lambda frame: frame[slot]
+
+    def _compile_call(self, call):
+        function = self.functions[call[1]]
+        args = [self._compile_converted(arg, param_type)
+                for arg, param_type in zip(call[2], function.param_types)]
+        invoke = self.call
+        return lambda frame: invoke(function, [arg(frame) for arg in args])
+
+    def _compile_and(self, expr):
+        left = self._compile_expression(expr[1])
+        right = self._compile_expression(expr[2])
+        return lambda frame: left(frame) and right(frame)
+
+    def _compile_or(self, expr):
+        left = self._compile_expression(expr[1])
+        right = self._compile_expression(expr[2])
+        return lambda frame: left(frame) or right(frame)
+
+    def _compile_binary(self, expr):
+        op, left_node, right_node = expr
+        both_int = left_node.ty == 'int' and right_node.ty == 'int'
+        function = (INT_OPERATOR_FUNCTIONS if both_int else OPERATOR_FUNCTIONS)[op]
+        left = self._compile_expression(left_node)
+        # Caso frecuente: operando derecho constante (i < 10, n - 1)
+        if right_node.kind in _CONSTANT_KINDS:
+            constant = right_node[1]
+            return lambda frame: function(left(frame), constant)
+        right = self._compile_expression(right_node)
+        return lambda frame: function(left(frame), right(frame))
@@ -0,0 +1,157 @@
+import sys
+from Lexer import tokens, lexer
+from TableCache import build_parser
+from ASTNodes import node_at
+
+# Gramática LALR alternativa con recursión por la izquierda.
+#
+# Las listas (funciones, parámetros, instrucciones, argumentos) se acumulan con
+# append sobre la misma lista en lugar de `[p[1]] + p[2]`, y las cadenas de
+# operadores se reducen de forma iterativa, así que la pila LALR no crece con la
+# longitud del bloque. El AST resultante es idéntico al de Parser.py: las cadenas
+# de operadores se pliegan por la derecha igual que E_rest/T_rest/F_rest.
+
+# Las reglas que no son recursivas se comparten con Parser.py
+from Parser import (
+    precedence,
+    p_programa, p_funcion_or_main, p_regular_function, p_main_function_def,
+    p_parametro, p_bloque, p_instruccion, p_declaracion, p_inicializacion,
+    p_asignacion, p_If, p_Else, p_While, p_For, p_Return, p_exp_opt, p_Print,
+    p_tipo, p_exp, p_A, p_llamada_func, p_empty, p_error, _pos,
+)
+
+start = 'programa'
+
+
+def _fold_right(chain):
+    """Convierte [x0, op1, x1, op2, x2] en (op1, x0, (op2, x1, x2)).
+
+    Cada operador se guarda como (operador, posición del token).
+    """
+    node = chain[-1]
+    for i in range(len(chain) - 2, 0, -2):
+        op, pos = chain[i]
+        node = node_at(pos, op, chain[i - 1], node)
+    return node
+
+def _extend_chain(p, op):
+    p[1].append((op, _pos(p, 2)))
+    p[1].append(p[3])
+    p[0] = p[1]
+
+
+def p_funciones(p):
+    '''funciones : funciones funcion_or_main
+                 | funcion_or_main'''
+    if len(p) == 3:
+        p[1].append(p[2])
+        p[0] = p[1]
+    else:
+        p[0] = [p[1]]
+
+def p_parametros(p):
+    '''parametros : lista_parametros
+                  | empty'''
+    p[0] = p[1] if p[1] is not None else []
+
+def p_lista_parametros(p):
+    '''lista_parametros : lista_parametros COMMA parametro
+                        | parametro'''
+    if len(p) == 4:
+        p[1].append(p[3])
+        p[0] = p[1]
+    else:
+        p[0] = [p[1]]
+
+def p_instrucciones(p):
+    '''instrucciones : instrucciones instruccion
+                     | empty'''
+    if len(p) == 3:
+        p[1].append(p[2])
+        p[0] = p[1]
+    else:
+        p[0] = []
+
+def p_E(p):
+    '''E : E_chain'''
+    p[0] = _fold_right(p[1])
+
+def p_E_chain(p):
+    '''E_chain : E_chain OR C
+               | C'''
+    if len(p) == 4:
+        _extend_chain(p, 'or')
+    else:
+        p[0] = [p[1]]
+
+def p_C(p):
+    '''C : C_chain'''
+    p[0] = _fold_right(p[1])
+
+def p_C_chain(p):
+    '''C_chain : C_chain AND R
+               | R'''
+    if len(p) == 4:
+        _extend_chain(p, 'and')
+    else:
+        p[0] = [p[1]]
+
+def p_R(p):
+    '''R : R_chain'''
+    p[0] = _fold_right(p[1])
+
+def p_R_chain(p):
+    '''R_chain : R_chain EQ T
+               | R_chain NE T
+               | R_chain LT T
+               | R_chain GT T
+               | R_chain LE T
+               | R_chain GE T
+               | T'''
+    if len(p) == 4:
+        _extend_chain(p, p[2])
+    else:
+        p[0] = [p[1]]
+
+def p_T(p):
+    '''T : T_chain'''
+    p[0] = _fold_right(p[1])
+
+def p_T_chain(p):
+    '''T_chain : T_chain PLUS F
+               | T_chain MINUS F
+               | F'''
+    if len(p) == 4:
+        _extend_chain(p, p[2])
+    else:
+        p[0] = [p[1]]
+
+def p_F(p):
+    '''F : F_chain'''
+    p[0] = _fold_right(p[1])
+
+def p_F_chain(p):
+    '''F_chain : F_chain TIMES A
+               | F_chain DIVIDE A
+               | F_chain MOD A
+               | A'''
+    if len(p) == 4:
+        _extend_chain(p, p[2])
+    else:
+        p[0] = [p[1]]
+
+def p_lista_args(p):
+    '''lista_args : lista_exp
+                  | empty'''
+    p[0] = p[1] if p[1] is not None else []
+
+def p_lista_exp(p):
+    '''lista_exp : lista_exp COMMA exp
+                 | exp'''
+    if len(p) == 4:
+        p[1].append(p[3])
+        p[0] = p[1]
+    else:
+        p[0] = [p[1]]
+
+parser = build_parser(sys.modules[__name__])
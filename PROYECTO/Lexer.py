@@ -1,4 +1,5 @@
 import ply.lex as lex
+from Diagnostics import DiagnosticCollector
 
 # === Palabras reservadas ===
 reserved = {
@@ -108,17 +109,29 @@ def t_newline(t):
 
 # === Manejo de errores mejorado ===
 def t_error(t):
-    error_msg = f"Error léxico en línea {t.lineno}: Carácter ilegal '{t.value[0]}'"
-    line_start = t.lexer.lexdata.rfind('\n', 0, t.lexer.lexpos) + 1
-    line_end = t.lexer.lexdata.find('\n', t.lexer.lexpos)
-    if line_end < 0:
-        line_end = len(t.lexer.lexdata)
-    error_line = t.lexer.lexdata[line_start:line_end]
-    marker = ' ' * (t.lexpos - line_start) + '^'
-    
-    with open("salida/errores_lexicos.txt", "a", encoding="utf-8") as error_file:
-        error_file.write(f"{error_msg}\n{error_line}\n{marker}\n\n")
-    
+    # El error se guarda en memoria; la línea de contexto sale del índice de líneas
+    t.lexer.diagnostics.report('lexico', f"Carácter ilegal '{t.value[0]}'",
+                               offset=t.lexpos, source=t.lexer.lexdata)
     t.lexer.skip(1)
 
+class GlobalLexer(lex.Lexer):
+    """El lexer global: cada input() empieza con su colector vacío
+
+    Así los parser.parse(..., lexer=lexer) sucesivos no acumulan los errores de
+    las fuentes anteriores. Los clones (uno por CompilerSession) vuelven a ser
+    lexers comunes con el colector de su sesión.
+    """
+    def input(self, s):
+        self.diagnostics.reset(s)
+        super().input(s)
+
+    def clone(self, object=None):
+        c = super().clone(object)
+        c.__class__ = lex.Lexer
+        return c
+
+
 lexer = lex.lex()
+lexer.__class__ = GlobalLexer
+# Colector por defecto del lexer global; cada CompilerSession instala el suyo
+lexer.diagnostics = DiagnosticCollector()
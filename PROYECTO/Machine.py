@@ -0,0 +1,288 @@
+import ast as python_ast
+import sys
+
+from Interpreter import OPERATOR_FUNCTIONS, INT_OPERATOR_FUNCTIONS
+from Runtime import EvolaRuntimeError, format_value
+
+# Máquina de registros simulada: el destino de Codegen.py.
+#
+# Cada llamada tiene su propio banco de `regs` registros (r0, r1, ...), como
+# las ventanas de registros de SPARC, y un marco de `frame` ranuras para los
+# valores derramados. Los registros guardan valores de Evola con su tipo (int,
+# float, bool o string), como las ranuras de la VM.
+#
+# Un programa es texto, una función tras otra:
+#
+#   .func nombre params=N regs=R frame=F
+#   L3:                       etiqueta (destino de saltos dentro de la función)
+#       li    rd, literal     rd = 5, 2.5, "texto", true o false
+#       mov   rd, rs
+#       add   rd, ra, rb      también sub mul div mod idiv imod (idiv e imod: / y %
+#                             enteros de C) y eq ne lt gt le ge; add concatena cadenas
+#       itof  rd, rs          int -> float;  ftoi rd, rs: float -> int
+#       ld    rd, [n]         rd = marco[n]
+#       st    rs, [n]         marco[n] = rs
+#       arg   i, rs           argumento i de la próxima llamada
+#       call  rd, f           llama a f (call f si no se usa el resultado)
+#       param rd, i           rd = argumento i de esta llamada
+#       ret   rs              devuelve rs (ret sin operando: void)
+#       jmp   L
+#       bt    rs, L           salta si rs es verdadero; bf: si es falso
+#       print rs
+#   .end
+#
+# Las líneas que empiezan con ';' son comentarios. Cada instrucción cuesta los
+# ciclos de CYCLES; la máquina cuenta los ciclos, las instrucciones ejecutadas
+# y los accesos al marco (ld y st).
+
+CYCLES = {
+    'li': 1, 'mov': 1, 'add': 1, 'sub': 1,
+    'eq': 1, 'ne': 1, 'lt': 1, 'gt': 1, 'le': 1, 'ge': 1,
+    'mul': 3, 'div': 12, 'mod': 12, 'idiv': 12, 'imod': 12,
+    'itof': 2, 'ftoi': 2,
+    'ld': 3, 'st': 3,
+    'arg': 1, 'param': 1, 'call': 4, 'ret': 4,
+    'jmp': 1, 'bt': 1, 'bf': 1,
+    'print': 10,
+}
+
+OPERATIONS = {
+    'add': OPERATOR_FUNCTIONS['+'], 'sub': OPERATOR_FUNCTIONS['-'],
+    'mul': OPERATOR_FUNCTIONS['*'], 'div': OPERATOR_FUNCTIONS['/'],
+    'mod': OPERATOR_FUNCTIONS['%'],
+    'idiv': INT_OPERATOR_FUNCTIONS['/'], 'imod': INT_OPERATOR_FUNCTIONS['%'],
+    'eq': OPERATOR_FUNCTIONS['=='], 'ne': OPERATOR_FUNCTIONS['!='],
+    'lt': OPERATOR_FUNCTIONS['<'], 'gt': OPERATOR_FUNCTIONS['>'],
+    'le': OPERATOR_FUNCTIONS['<='], 'ge': OPERATOR_FUNCTIONS['>='],
+}
+
+# Las llamadas no usan la pila de Python, así que el límite es sólo de memoria
+MAX_CALL_DEPTH = 100000
+
+
+class AssemblyError(Exception):
+    """Texto de ensamblador mal formado"""
+    def __init__(self, message, line_number):
+        super().__init__(f"{message} (línea {line_number})")
+        self.line_number = line_number
+
+
+class MachineFunction:
+    """Código ensamblado de una función: instrucciones (op, a, b, c, ciclos)"""
+    __slots__ = ('name', 'param_count', 'registers', 'frame_size', 'code')
+
+    def __init__(self, name, param_count, registers, frame_size):
+        self.name = name
+        self.param_count = param_count
+        self.registers = registers
+        self.frame_size = frame_size
+        self.code = []
+
+
+def _register(text, line_number):
+    if not (text.startswith('r') and text[1:].isdigit()):
+        raise AssemblyError(f"Se esperaba un registro: '{text}'", line_number)
+    return int(text[1:])
+
+
+def _slot(text, line_number):
+    if not (text.startswith('[') and text.endswith(']') and text[1:-1].isdigit()):
+        raise AssemblyError(f"Se esperaba una ranura [n]: '{text}'", line_number)
+    return int(text[1:-1])
+
+
+def parse_immediate(text):
+    """Valor de un literal escrito por Codegen.format_immediate"""
+    if text == 'true':
+        return True
+    if text == 'false':
+        return False
+    if text.startswith('"'):
+        return python_ast.literal_eval(text)
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def assemble(text):
+    """{nombre: MachineFunction} a partir del texto del ensamblador"""
+    functions = {}
+    function = None
+    pending = []  # (función, índice de instrucción, etiqueta, número de línea)
+    labels = {}
+    for line_number, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if not line or line.startswith(';'):
+            continue
+        if line.startswith('.func'):
+            parts = line.split()
+            options = dict(part.split('=', 1) for part in parts[2:])
+            function = MachineFunction(parts[1], int(options['params']), int(options['regs']),
+                                       int(options['frame']))
+            functions[function.name] = function
+            labels = {}
+            continue
+        if function is None:
+            raise AssemblyError("Instrucción fuera de una función", line_number)
+        if line == '.end':
+            for owner, index, label, label_line in pending:
+                if label not in labels:
+                    raise AssemblyError(f"Etiqueta desconocida: '{label}'", label_line)
+                op, a, _, c, cycles = owner.code[index]
+                owner.code[index] = (op, a, labels[label], c, cycles)
+            pending = []
+            function = None
+            continue
+        if line.endswith(':'):
+            labels[line[:-1]] = len(function.code)
+            continue
+
+        op, _, rest = line.partition(' ')
+        if op not in CYCLES:
+            raise AssemblyError(f"Instrucción desconocida: '{op}'", line_number)
+        if op == 'li':
+            target, _, literal = rest.partition(',')
+            instr = (op, _register(target.strip(), line_number), parse_immediate(literal.strip()), None)
+        else:
+            operands = [operand.strip() for operand in rest.split(',')] if rest.strip() else []
+            instr = _operands(op, operands, line_number)
+            if op in ('jmp', 'bt', 'bf'):
+                pending.append((function, len(function.code), instr[2], line_number))
+        function.code.append(instr + (CYCLES[op],))
+    if function is not None:
+        raise AssemblyError(f"Falta .end de '{function.name}'", line_number)
+    return functions
+
+
+def _operands(op, operands, line_number):
+    """(op, a, b, c) con registros y ranuras ya convertidos a números"""
+    reg = lambda i: _register(operands[i], line_number)
+    if op in OPERATIONS:
+        return (op, reg(0), reg(1), reg(2))
+    if op in ('mov', 'itof', 'ftoi'):
+        return (op, reg(0), reg(1), None)
+    if op in ('ld', 'st'):
+        return (op, reg(0), _slot(operands[1], line_number), None)
+    if op == 'arg':
+        return (op, int(operands[0]), reg(1), None)
+    if op == 'param':
+        return (op, reg(0), int(operands[1]), None)
+    if op == 'call':
+        if len(operands) == 1:
+            return (op, None, operands[0], None)
+        return (op, reg(0), operands[1], None)
+    if op == 'ret':
+        return (op, reg(0) if operands else None, None, None)
+    if op == 'jmp':
+        return (op, None, operands[0], None)
+    if op in ('bt', 'bf'):
+        return (op, reg(0), operands[1], None)
+    return (op, reg(0), None, None)  # print
+
+
+class Machine:
+    """Simulador de la máquina de registros.
+
+    Como la VM, un solo bucle de despacho con una pila de marcos propia: cada
+    llamada guarda (función, código, pc, registros, marco, argumentos, destino)
+    del llamador. `cycles`, `executed` y `frame_accesses` acumulan lo que cuesta
+    cada ejecución.
+    """
+    def __init__(self, functions, out=None):
+        self.functions = functions
+        self.out = out if out is not None else sys.stdout
+        self.cycles = 0
+        self.executed = 0
+        self.frame_accesses = 0
+
+    @classmethod
+    def from_ast(cls, ast, frame_sizes, out=None, registers=None):
+        """Backend para Runner: genera el ensamblador y lo ensambla"""
+        from Codegen import DEFAULT_REGISTERS, compile_to_assembly
+        assembly = compile_to_assembly(ast, frame_sizes, registers or DEFAULT_REGISTERS)
+        return cls(assemble(assembly.text), out)
+
+    def run(self, name='main', args=()):
+        """Ejecuta una función (main por defecto) y devuelve su valor"""
+        try:
+            return self._execute(self.functions[name], list(args))
+        except ZeroDivisionError:
+            raise EvolaRuntimeError("División por cero") from None
+
+    def report(self):
+        return (f"Ciclos simulados: {self.cycles}  (instrucciones: {self.executed}, "
+                f"accesos al marco: {self.frame_accesses})")
+
+    def _execute(self, function, args):
+        functions = self.functions
+        operations = OPERATIONS
+        write = self.out.write
+        code = function.code
+        regs = [None] * function.registers
+        frame = [None] * function.frame_size
+        outgoing = []
+        pc = 0
+        frames = []
+        cycles = executed = frame_accesses = 0
+        try:
+            while True:
+                op, a, b, c, cost = code[pc]
+                pc += 1
+                cycles += cost
+                executed += 1
+                if op in operations:
+                    regs[a] = operations[op](regs[b], regs[c])
+                elif op == 'li':
+                    regs[a] = b
+                elif op == 'mov':
+                    regs[a] = regs[b]
+                elif op == 'bf':
+                    if not regs[a]:
+                        pc = b
+                elif op == 'bt':
+                    if regs[a]:
+                        pc = b
+                elif op == 'jmp':
+                    pc = b
+                elif op == 'ld':
+                    regs[a] = frame[b]
+                    frame_accesses += 1
+                elif op == 'st':
+                    frame[b] = regs[a]
+                    frame_accesses += 1
+                elif op == 'arg':
+                    if a == 0:
+                        outgoing = []
+                    outgoing.append(regs[b])
+                elif op == 'param':
+                    regs[a] = args[b]
+                elif op == 'call':
+                    if len(frames) >= MAX_CALL_DEPTH:
+                        raise EvolaRuntimeError("Recursión demasiado profunda")
+                    callee = functions[b]
+                    frames.append((function, code, pc, regs, frame, args, a))
+                    args = outgoing[:callee.param_count] if callee.param_count else []
+                    outgoing = []
+                    function, code, pc = callee, callee.code, 0
+                    regs = [None] * callee.registers
+                    frame = [None] * callee.frame_size
+                elif op == 'ret':
+                    value = regs[a] if a is not None else None
+                    if not frames:
+                        return value
+                    function, code, pc, regs, frame, args, dest = frames.pop()
+                    if dest is not None:
+                        regs[dest] = value
+                elif op == 'print':
+                    write(format_value(regs[a]) + "\n")
+                elif op == 'itof':
+                    regs[a] = float(regs[b])
+                elif op == 'ftoi':
+                    regs[a] = int(regs[b])
+                else:
+                    raise EvolaRuntimeError(f"Instrucción desconocida: {op}")
+        finally:
+            self.cycles += cycles
+            self.executed += executed
+            self.frame_accesses += frame_accesses
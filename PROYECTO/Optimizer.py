@@ -0,0 +1,190 @@
+from ASTNodes import BINARY_OPERATORS, KIND, node_at, node_position
+from Interpreter import OPERATOR_FUNCTIONS, INT_OPERATOR_FUNCTIONS
+from Visitor import Visitor
+
+# Plegado de constantes y simplificación algebraica sobre el AST verificado.
+#
+# Corre entre SemanticAnalyzer y Resolver: necesita los tipos (`ty`) de cada
+# expresión y deja que Resolver asigne ranuras sólo a lo que sobrevive. Las
+# expresiones se reescriben de abajo arriba; una reescritura sólo se acepta si
+# el nodo nuevo tiene el mismo tipo que el original, de modo que las
+# conversiones int<->float que decide cada backend con conversion(destino,
+# node.ty) (las de TypeChecker.is_assignable) no cambian. Así `x * 1.0` con x
+# int no se simplifica a x: el resultado es float y print mostraría otra cosa.
+
+_CONSTANT_KINDS = frozenset((KIND['number'], KIND['string'], KIND['bool']))
+_CONSTANT_TAGS = {int: 'number', float: 'number', str: 'string', bool: 'bool'}
+_TYPE_NAMES = {int: 'int', float: 'float', str: 'string', bool: 'bool'}
+
+# Neutros por la derecha y por la izquierda: x op e == x, e op x == x. El 0 de
+# la suma no se aplica a float: -0.0 + 0 es 0.0, no -0.0.
+RIGHT_IDENTITIES = {'+': 0, '-': 0, '*': 1, '/': 1}
+LEFT_IDENTITIES = {'+': 0, '*': 1}
+
+
+def is_constant(node):
+    return node is not None and node.kind in _CONSTANT_KINDS
+
+
+def constant_node(value, like):
+    """Literal con el valor dado, en la posición de `like` y ya tipado"""
+    node = node_at(node_position(like), _CONSTANT_TAGS[type(value)], value)
+    node.ty = _TYPE_NAMES[type(value)]
+    return node
+
+
+def _declares(block_node):
+    return any(stmt[0] == 'declaration' for stmt in block_node[1])
+
+
+class Optimizer(Visitor):
+    """Reescribe el AST en su lugar; cuenta las simplificaciones y anota las ramas quitadas"""
+    DISPATCH = {
+        'statement': {
+            'declaration': '_optimize_declaration',
+            'assignment': '_optimize_assignment',
+            'if': '_optimize_if',
+            'while': '_optimize_while',
+            'for': '_optimize_for',
+            'return': '_optimize_value',
+            'print': '_optimize_value',
+            'call': '_optimize_call',
+        },
+        'expression': dict(
+            {op: '_optimize_binary' for op in BINARY_OPERATORS},
+            call='_optimize_call',
+        ),
+    }
+
+    def __init__(self):
+        self.rewrites = 0
+        self.removed = []  # [(mensaje, nodo)] de las ramas eliminadas
+
+    def optimize_program(self, ast):
+        for func in ast[1]:
+            block_node = func[4] if func[0] == 'function' else func[2]
+            self._optimize_block(block_node)
+        return ast
+
+    # --- Instrucciones ---
+
+    def _optimize_block(self, block_node):
+        statements = []
+        for stmt in block_node[1]:
+            handler = self.handler_for('statement', stmt)
+            result = stmt if handler is None else handler(self, stmt)
+            if isinstance(result, list):
+                statements.extend(result)
+            else:
+                statements.append(result)
+        block_node.statements = statements
+
+    def _optimize_declaration(self, decl):
+        if decl.init is not None:
+            decl.init = self.optimize_expression(decl.init)
+        return decl
+
+    def _optimize_assignment(self, assign):
+        assign.value = self.optimize_expression(assign.value)
+        return assign
+
+    def _optimize_if(self, if_stmt):
+        if_stmt.condition = self.optimize_expression(if_stmt.condition)
+        self._optimize_block(if_stmt.then_block)
+        if if_stmt.else_block is not None:
+            self._optimize_block(if_stmt.else_block)
+        if not is_constant(if_stmt.condition):
+            return if_stmt
+        self.rewrites += 1
+        if if_stmt.condition[1]:
+            if if_stmt.else_block is not None:
+                self.removed.append(("Condición siempre verdadera: se eliminó la rama else", if_stmt))
+            taken, if_stmt.else_block = if_stmt.then_block, None
+        else:
+            self.removed.append(("Condición siempre falsa: se eliminó la rama if", if_stmt))
+            taken = if_stmt.else_block
+            if taken is None:
+                return []
+            if_stmt.then_block.statements = []
+        # Sin declaraciones propias, la rama elegida se integra al bloque que la
+        # contiene; si declara variables se conserva su bloque (y su ámbito)
+        return if_stmt if _declares(taken) else taken.statements
+
+    def _optimize_while(self, while_stmt):
+        while_stmt.condition = self.optimize_expression(while_stmt.condition)
+        if is_constant(while_stmt.condition) and not while_stmt.condition[1]:
+            self.rewrites += 1
+            self.removed.append(("Condición siempre falsa: se eliminó el while", while_stmt))
+            return []
+        self._optimize_block(while_stmt.body)
+        return while_stmt
+
+    def _optimize_for(self, for_stmt):
+        init = self._optimize_assignment(for_stmt.init)
+        for_stmt.condition = self.optimize_expression(for_stmt.condition)
+        if is_constant(for_stmt.condition) and not for_stmt.condition[1]:
+            self.rewrites += 1
+            self.removed.append(("Condición siempre falsa: se eliminó el cuerpo del for", for_stmt))
+            return init
+        self._optimize_assignment(for_stmt.update)
+        self._optimize_block(for_stmt.body)
+        return for_stmt
+
+    def _optimize_value(self, stmt):
+        # return / print
+        if stmt.value is not None:
+            stmt.value = self.optimize_expression(stmt.value)
+        return stmt
+
+    def _optimize_call(self, call):
+        call.args = [self.optimize_expression(arg) for arg in call.args]
+        return call
+
+    # --- Expresiones ---
+
+    def optimize_expression(self, expr):
+        handler = self.handler_for('expression', expr)
+        return expr if handler is None else handler(self, expr)
+
+    def _optimize_binary(self, expr):
+        expr.left = self.optimize_expression(expr.left)
+        expr.right = self.optimize_expression(expr.right)
+        result = self._simplify(expr)
+        if result is expr or result.ty != expr.ty:
+            return expr
+        self.rewrites += 1
+        return result
+
+    def _simplify(self, expr):
+        op, left, right = expr
+        if op == 'and':
+            if is_constant(left):
+                return right if left[1] else left
+            return left if is_constant(right) and right[1] else expr
+        if op == 'or':
+            if is_constant(left):
+                return left if left[1] else right
+            return left if is_constant(right) and not right[1] else expr
+        if is_constant(left) and is_constant(right):
+            return self._fold(expr)
+        if is_constant(right) and right[1] == RIGHT_IDENTITIES.get(op, None) and \
+                (op != '+' or expr.ty == 'int') and right.ty != 'bool':
+            return left
+        if is_constant(left) and left[1] == LEFT_IDENTITIES.get(op, None) and \
+                (op != '+' or expr.ty == 'int') and left.ty != 'bool':
+            return right
+        return expr
+
+    def _fold(self, expr):
+        op, left, right = expr
+        both_int = left.ty == 'int' and right.ty == 'int'
+        function = (INT_OPERATOR_FUNCTIONS if both_int else OPERATOR_FUNCTIONS)[op]
+        try:
+            value = function(left[1], right[1])
+        except ZeroDivisionError:
+            return expr  # El error se reporta al ejecutar, como sin optimizar
+        return constant_node(value, expr)
+
+
+def optimize_program(ast):
+    return Optimizer().optimize_program(ast)
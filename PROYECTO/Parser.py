@@ -1,5 +1,7 @@
-import ply.yacc as yacc
+import sys
 from Lexer import tokens, lexer
+from TableCache import build_parser
+from ASTNodes import node_at
 
 # Precedence rules for operators
 precedence = (
@@ -11,10 +13,15 @@ precedence = (
     ('left', 'TIMES', 'DIVIDE', 'MOD'),
 )
 
+def _pos(p, n):
+    """Posición (línea, columna) del token terminal n de la producción"""
+    tok = p.slice[n]
+    return tok.lineno, getattr(tok, 'col', None)
+
 def p_programa(p):
     '''programa : funciones'''
     # print(f"DEBUG: p_programa entered, p[1] from funciones is {p[1] if len(p) > 1 else 'N/A'}") # Minimized for ScopeChecker test
-    p[0] = ('program', p[1])
+    p[0] = node_at((1, 1), 'program', p[1])
 
 def p_funciones(p):
     '''funciones : funcion_or_main funciones
@@ -36,13 +43,13 @@ def p_funcion_or_main(p):
 def p_regular_function(p):
     '''regular_function : tipo ID LPAREN parametros RPAREN bloque'''
     # print(f"DEBUG: p_regular_function for ID {p[2]} entered. tipo={p[1]}") # Minimized for ScopeChecker test
-    p[0] = ('function', p[1], p[2], p[4], p[6]) # AST: (type, name, params, block)
+    p[0] = node_at(_pos(p, 2), 'function', p[1], p[2], p[4], p[6]) # AST: (type, name, params, block)
     # print(f"DEBUG: p_regular_function assigned p[0]={p[0]}") # Minimized
 
 def p_main_function_def(p):
     '''main_function_def : VOID MAIN LPAREN parametros RPAREN bloque'''
     # print(f"DEBUG: p_main_function_def entered.") # Minimized for ScopeChecker test
-    p[0] = ('main_function', p[4], p[6]) # AST: (params, block) void is implicit
+    p[0] = node_at(_pos(p, 2), 'main_function', p[4], p[6]) # AST: (params, block) void is implicit
     # print(f"DEBUG: p_main_function_def assigned p[0]={p[0]}") # Minimized
 
 # Old p_funcion and p_funcion_rest are effectively removed by not being defined below.
@@ -67,11 +74,11 @@ def p_parametros_rest(p):
 
 def p_parametro(p):
     '''parametro : tipo ID'''
-    p[0] = ('param', p[1], p[2])
+    p[0] = node_at(_pos(p, 2), 'param', p[1], p[2])
 
 def p_bloque(p):
     '''bloque : LBRACE instrucciones RBRACE'''
-    p[0] = ('block', p[2])
+    p[0] = node_at(_pos(p, 1), 'block', p[2])
 
 def p_instrucciones(p):
     '''instrucciones : instruccion instrucciones
@@ -93,7 +100,7 @@ def p_instruccion(p):
 
 def p_declaracion(p):
     '''declaracion : tipo ID inicializacion'''
-    p[0] = ('declaration', p[1], p[2], p[3])
+    p[0] = node_at(_pos(p, 2), 'declaration', p[1], p[2], p[3])
 
 def p_inicializacion(p):
     '''inicializacion : EQUALS exp
@@ -105,11 +112,11 @@ def p_inicializacion(p):
 
 def p_asignacion(p):
     '''asignacion : ID EQUALS exp'''
-    p[0] = ('assignment', p[1], p[3])
+    p[0] = node_at(_pos(p, 1), 'assignment', p[1], p[3])
 
 def p_If(p):
     '''If : IF LPAREN exp RPAREN bloque Else'''
-    p[0] = ('if', p[3], p[5], p[6])
+    p[0] = node_at(_pos(p, 1), 'if', p[3], p[5], p[6])
 
 def p_Else(p):
     '''Else : ELSE bloque
@@ -121,15 +128,15 @@ def p_Else(p):
 
 def p_While(p):
     '''While : WHILE LPAREN exp RPAREN bloque'''
-    p[0] = ('while', p[3], p[5])
+    p[0] = node_at(_pos(p, 1), 'while', p[3], p[5])
 
 def p_For(p):
     '''For : FOR LPAREN asignacion SEMI exp SEMI asignacion RPAREN bloque'''
-    p[0] = ('for', p[3], p[5], p[7], p[9])
+    p[0] = node_at(_pos(p, 1), 'for', p[3], p[5], p[7], p[9])
 
 def p_Return(p):
     '''Return : RETURN exp_opt SEMI'''
-    p[0] = ('return', p[2])
+    p[0] = node_at(_pos(p, 1), 'return', p[2])
 
 def p_exp_opt(p):
     '''exp_opt : exp
@@ -138,7 +145,7 @@ def p_exp_opt(p):
 
 def p_Print(p):
     '''Print : PRINT LPAREN exp RPAREN SEMI'''
-    p[0] = ('print', p[3])
+    p[0] = node_at(_pos(p, 1), 'print', p[3])
 
 def p_tipo(p):
     '''tipo : INT
@@ -152,48 +159,47 @@ def p_exp(p):
     '''exp : E'''
     p[0] = p[1]
 
-def p_E(p):
-    '''E : C E_rest'''
+# Las cadenas de operadores devuelven (operador, operando, posición del operador)
+# hasta que p_E/p_C/p_R/p_T/p_F arman el nodo binario.
+
+def _chain_head(p):
     if p[2] is None:
         p[0] = p[1]
     else:
-        p[0] = ('or', p[1], p[2])
+        op, right, pos = p[2]
+        p[0] = node_at(pos, op, p[1], right)
 
-def p_E_rest(p):
-    '''E_rest : OR C E_rest
-              | empty'''
+def _chain_rest(p, op):
     if len(p) == 4:
         if p[3] is None:
-            p[0] = p[2]
+            p[0] = (op, p[2], _pos(p, 1))
         else:
-            p[0] = ('or', p[2], p[3])
+            next_op, right, next_pos = p[3]
+            p[0] = (op, node_at(next_pos, next_op, p[2], right), _pos(p, 1))
     else:
         p[0] = None
 
+def p_E(p):
+    '''E : C E_rest'''
+    _chain_head(p)
+
+def p_E_rest(p):
+    '''E_rest : OR C E_rest
+              | empty'''
+    _chain_rest(p, 'or')
+
 def p_C(p):
     '''C : R C_rest'''
-    if p[2] is None:
-        p[0] = p[1]
-    else:
-        p[0] = ('and', p[1], p[2])
+    _chain_head(p)
 
 def p_C_rest(p):
     '''C_rest : AND R C_rest
               | empty'''
-    if len(p) == 4:
-        if p[3] is None:
-            p[0] = p[2]
-        else:
-            p[0] = ('and', p[2], p[3])
-    else:
-        p[0] = None
+    _chain_rest(p, 'and')
 
 def p_R(p):
     '''R : T R_rest'''
-    if p[2] is None:
-        p[0] = p[1]
-    else:
-        p[0] = (p[2][0], p[1], p[2][1])
+    _chain_head(p)
 
 def p_R_rest(p):
     '''R_rest : EQ T R_rest
@@ -203,52 +209,28 @@ def p_R_rest(p):
               | LE T R_rest
               | GE T R_rest
               | empty'''
-    if len(p) == 4:
-        if p[3] is None:
-            p[0] = (p[1], p[2])
-        else:
-            p[0] = (p[1], (p[3][0], p[2], p[3][1]))
-    else:
-        p[0] = None
+    _chain_rest(p, p[1])
 
 def p_T(p):
     '''T : F T_rest'''
-    if p[2] is None:
-        p[0] = p[1]
-    else:
-        p[0] = (p[2][0], p[1], p[2][1])
+    _chain_head(p)
 
 def p_T_rest(p):
     '''T_rest : PLUS F T_rest
               | MINUS F T_rest
               | empty'''
-    if len(p) == 4:
-        if p[3] is None:
-            p[0] = (p[1], p[2])
-        else:
-            p[0] = (p[1], (p[3][0], p[2], p[3][1]))
-    else:
-        p[0] = None
+    _chain_rest(p, p[1])
 
 def p_F(p):
     '''F : A F_rest'''
-    if p[2] is None:
-        p[0] = p[1]
-    else:
-        p[0] = (p[2][0], p[1], p[2][1])
+    _chain_head(p)
 
 def p_F_rest(p):
     '''F_rest : TIMES A F_rest
               | DIVIDE A F_rest
               | MOD A F_rest
               | empty'''
-    if len(p) == 4:
-        if p[3] is None:
-            p[0] = (p[1], p[2])
-        else:
-            p[0] = (p[1], (p[3][0], p[2], p[3][1]))
-    else:
-        p[0] = None
+    _chain_rest(p, p[1])
 
 def p_A(p):
     '''A : LPAREN exp RPAREN
@@ -261,14 +243,14 @@ def p_A(p):
     if len(p) == 4:
         p[0] = p[2]
     elif len(p) == 3:
-        p[0] = ('call', p[1], p[2]) if p[2] is not None else ('id', p[1])
+        p[0] = node_at(_pos(p, 1), 'call', p[1], p[2]) if p[2] is not None else node_at(_pos(p, 1), 'id', p[1])
     else:
         if p.slice[1].type == 'STRING_LITERAL':
-            p[0] = ('string', p[1])
+            p[0] = node_at(_pos(p, 1), 'string', p[1])
         elif p.slice[1].type in ['INT_NUM', 'FLOAT_NUM']:
-            p[0] = ('number', p[1])
+            p[0] = node_at(_pos(p, 1), 'number', p[1])
         else:  # TRUE or FALSE
-            p[0] = ('bool', p[1] == 'true')
+            p[0] = node_at(_pos(p, 1), 'bool', p[1] == 'true')
 
 def p_llamada_func(p):
     '''llamada_func : LPAREN lista_args RPAREN
@@ -299,20 +281,21 @@ def p_empty(p):
     p[0] = None # Explicitly set p[0] for empty rules
 
 def p_error(p):
-    if p:
-        error_msg = f"Error sintáctico en línea {p.lineno}: Token inesperado '{p.value}' de tipo '{p.type}'"
-        line_start = lexer.lexdata.rfind('\n', 0, p.lexpos) + 1
-        line_end = lexer.lexdata.find('\n', p.lexpos)
-        if line_end < 0:
-            line_end = len(lexer.lexdata)
-        error_line = lexer.lexdata[line_start:line_end]
-        marker = ' ' * (p.lexpos - line_start) + '^'
-        
-        with open("salida/errores_sintacticos.txt", "a", encoding="utf-8") as error_file:
-            error_file.write(f"{error_msg}\n{error_line}\n{marker}\n\n")
+    # Sólo los tokens de reglas función traen su lexer; si no, se usa el global
+    error_lexer = getattr(p, 'lexer', lexer)
+    report_syntax_error(p, error_lexer.diagnostics, error_lexer.lexdata)
+
+def report_syntax_error(p, diagnostics, lexdata):
+    """Registra el error sintáctico en el colector de diagnósticos"""
+    if not p:
+        diagnostics.report('sintactico', "Fin de archivo inesperado")
+    elif lexdata is None:
+        # Fuente leída por partes (SourceStream): el token ya trae su posición
+        diagnostics.report('sintactico', f"Token inesperado '{p.value}' de tipo '{p.type}'",
+                           position=(p.lineno, p.col))
     else:
-        error_msg = "Error sintáctico: Fin de archivo inesperado"
-        with open("salida/errores_sintacticos.txt", "a", encoding="utf-8") as error_file:
-            error_file.write(f"{error_msg}\n")
+        diagnostics.report('sintactico', f"Token inesperado '{p.value}' de tipo '{p.type}'",
+                           offset=p.lexpos, source=lexdata)
 
-parser = yacc.yacc(debug=True) # Removed errorlog and debuglog for now to ensure tool stability
\ No newline at end of file
+# Las tablas LALR se cargan desde la caché del usuario (ver TableCache.py)
+parser = build_parser(sys.modules[__name__])
\ No newline at end of file
@@ -0,0 +1,147 @@
+from ASTNodes import BINARY_OPERATORS
+from ScopeChecker import ScopeError
+from Visitor import Visitor
+
+
+class Resolver(Visitor):
+    """Asigna a cada variable una dirección (profundidad, ranura).
+
+    La ranura es el índice de la variable en el arreglo de la activación de su
+    función (los parámetros primero, en orden); la profundidad es el nivel de
+    bloque donde se declaró (0 = cuerpo de la función). Las ranuras de un bloque
+    se liberan al cerrarlo y las reutilizan los bloques siguientes, así que
+    frame_sizes[función] es el máximo de variables vivas a la vez.
+
+    Declaraciones, parámetros, asignaciones e identificadores quedan con su
+    `addr`: las fases siguientes acceden a la variable con frame[node.addr[1]] sin
+    volver a buscarla por nombre. Trabaja sobre un AST de nodos (ASTNodes) que ya
+    pasó el análisis semántico.
+    """
+    DISPATCH = {
+        'statement': {
+            'block': '_resolve_block',
+            'declaration': '_resolve_declaration',
+            'assignment': '_resolve_assignment',
+            'if': '_resolve_if',
+            'while': '_resolve_while',
+            'for': '_resolve_for',
+            'return': '_resolve_value',
+            'print': '_resolve_value',
+            'call': '_resolve_call',
+        },
+        'expression': dict(
+            {op: '_resolve_binary' for op in BINARY_OPERATORS},
+            id='_resolve_id',
+            call='_resolve_call',
+        ),
+    }
+
+    def __init__(self):
+        self.frame_sizes = {}  # nombre de función -> tamaño de su activación
+        self._scopes = []      # [{nombre: dirección}], del cuerpo al bloque actual
+        self._next_slot = 0
+        self._frame_size = 0
+
+    def resolve_program(self, ast):
+        for func in ast[1]:
+            if func[0] == 'function':
+                _, _, name, params_list, block_node = func
+            elif func[0] == 'main_function':
+                _, params_list, block_node = func
+                name = 'main'
+            else:
+                continue
+            self.frame_sizes[name] = self.resolve_function(params_list, block_node)
+        return self.frame_sizes
+
+    def resolve_function(self, params_list, block_node):
+        """Resuelve un cuerpo de función y devuelve el tamaño de su activación"""
+        self._scopes = [{}]
+        self._next_slot = self._frame_size = 0
+        for param in params_list:
+            self._declare(param, param[2])
+        self._resolve_statements(block_node[1])
+        return self._frame_size
+
+    def _declare(self, node, name):
+        addr = (len(self._scopes) - 1, self._next_slot)
+        self._scopes[-1][name] = addr
+        self._next_slot += 1
+        if self._next_slot > self._frame_size:
+            self._frame_size = self._next_slot
+        node.addr = addr
+
+    def _lookup(self, node, name):
+        for scope in reversed(self._scopes):
+            addr = scope.get(name)
+            if addr is not None:
+                node.addr = addr
+                return
+        raise ScopeError(f"Error: La variable '{name}' no está declarada en este ámbito", node)
+
+    def _resolve_statements(self, statements):
+        for stmt in statements:
+            handler = self.handler_for('statement', stmt)
+            if handler is not None:
+                handler(self, stmt)
+
+    def _resolve_expression(self, expr):
+        if expr is not None:
+            handler = self.handler_for('expression', expr)
+            if handler is not None:
+                handler(self, expr)
+
+    def _resolve_block(self, block_node):
+        # Las ranuras del bloque quedan libres al salir de él
+        saved_slot = self._next_slot
+        self._scopes.append({})
+        self._resolve_statements(block_node[1])
+        self._scopes.pop()
+        self._next_slot = saved_slot
+
+    def _resolve_declaration(self, decl):
+        _, _, name, init = decl
+        # Como en ScopeChecker, la variable ya es visible en su inicializador
+        # (SemanticAnalyzer rechaza que se lea ahí: la ranura puede traer el
+        # valor de una variable de un bloque hermano)
+        self._declare(decl, name)
+        self._resolve_expression(init)
+
+    def _resolve_assignment(self, assign):
+        _, name, value = assign
+        self._lookup(assign, name)
+        self._resolve_expression(value)
+
+    def _resolve_if(self, if_stmt):
+        _, condition, then_block, else_block = if_stmt
+        self._resolve_expression(condition)
+        self._resolve_block(then_block)
+        if else_block is not None:
+            self._resolve_block(else_block)
+
+    def _resolve_while(self, while_stmt):
+        _, condition, body = while_stmt
+        self._resolve_expression(condition)
+        self._resolve_block(body)
+
+    def _resolve_for(self, for_stmt):
+        _, init, condition, update, body = for_stmt
+        self._resolve_assignment(init)
+        self._resolve_expression(condition)
+        self._resolve_assignment(update)
+        self._resolve_block(body)
+
+    def _resolve_value(self, stmt):
+        # return / print
+        self._resolve_expression(stmt[1])
+
+    def _resolve_call(self, call):
+        for arg in call[2]:
+            self._resolve_expression(arg)
+
+    def _resolve_binary(self, expr):
+        self._resolve_expression(expr[1])
+        self._resolve_expression(expr[2])
+
+    def _resolve_id(self, expr):
+        self._lookup(expr, expr[1])
@@ -0,0 +1,141 @@
+import argparse
+import sys
+
+from CompilerSession import CompilerSession
+from Interpreter import Interpreter
+from Bytecode import Program
+from VM import VM
+from Transpiler import PythonProgram, standalone_source
+from IR import build_ir
+from Codegen import DEFAULT_REGISTERS, compile_to_assembly
+from Machine import Machine, assemble
+from Runtime import EvolaRuntimeError
+
+# Backends de ejecución: nombre -> constructor con (ast, frame_sizes, out)
+BACKENDS = {
+    'tree': Interpreter,
+    'vm': VM.from_ast,
+    'python': PythonProgram.from_ast,
+    'asm': Machine.from_ast,
+}
+
+
+def load_program(source, backend='tree', out=None, session=None):
+    """Compila la fuente y prepara el backend; devuelve (programa, errores)"""
+    result = (session or CompilerSession()).compile(source)
+    if not result.ok:
+        return None, result.errors
+    return BACKENDS[backend](result.ast, result.frame_sizes, out=out), []
+
+
+def _report(errors):
+    for diagnostic in errors:
+        print(diagnostic.format(), file=sys.stderr)
+    return 1
+
+
+# Textos del resumen de optimización: clave de CompilationResult.stats -> (singular, plural)
+STAT_LABELS = {
+    'inlined': ("llamada integrada", "llamadas integradas"),
+    'tail_calls': ("llamada final convertida en bucle", "llamadas finales convertidas en bucle"),
+    'folded': ("expresión plegada", "expresiones plegadas"),
+    'removed': ("eliminación", "eliminaciones"),
+    'hoisted': ("invariante sacado de un bucle", "invariantes sacados de bucles"),
+    'shared': ("subexpresión compartida", "subexpresiones compartidas"),
+}
+
+
+def format_stats(stats):
+    """Resumen de una línea de lo que hizo la optimización"""
+    parts = [f"{stats[key]} {STAT_LABELS[key][stats[key] != 1]}"
+             for key in STAT_LABELS if stats.get(key)]
+    return "Optimización: " + (", ".join(parts) if parts else "sin cambios")
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(prog='main.py run',
+                                         description="Compila y ejecuta un programa")
+    arg_parser.add_argument('path', help="archivo fuente, código de bytes (.evbc) o ensamblador (.evasm)")
+    arg_parser.add_argument('--backend', choices=sorted(BACKENDS), default='tree')
+    arg_parser.add_argument('--emit-bytecode', metavar='ARCHIVO',
+                            help="guarda el código de bytes en ARCHIVO (.evbc)")
+    arg_parser.add_argument('--emit-python', metavar='ARCHIVO',
+                            help="guarda el programa traducido a Python en ARCHIVO (.py)")
+    arg_parser.add_argument('--emit-ir', metavar='ARCHIVO',
+                            help="guarda la representación intermedia (SSA) en ARCHIVO")
+    arg_parser.add_argument('--emit-asm', metavar='ARCHIVO',
+                            help="guarda el ensamblador de la máquina de registros en ARCHIVO (.evasm)")
+    arg_parser.add_argument('--registros', type=int, default=DEFAULT_REGISTERS,
+                            help="registros de la máquina para --emit-asm y --backend asm")
+    arg_parser.add_argument('--ciclos', action='store_true',
+                            help="con la máquina de registros, muestra los ciclos simulados")
+    arg_parser.add_argument('--avisos', action='store_true',
+                            help="muestra el código eliminado y el resumen de la optimización")
+    arg_parser.add_argument('--lexer-rapido', action='store_true',
+                            help="tokeniza con FastLexer en lugar de ply.lex")
+    args = arg_parser.parse_args(argv)
+    session = CompilerSession(fast_lexer=args.lexer_rapido)
+
+    if args.path.endswith('.evbc'):
+        program = VM(Program.load(args.path))
+    elif args.path.endswith('.evasm'):
+        with open(args.path, encoding='utf-8') as f:
+            program = Machine(assemble(f.read()))
+    else:
+        with open(args.path, encoding='utf-8') as f:
+            source = f.read()
+        if args.emit_python or args.emit_ir or args.emit_asm:
+            result = session.compile(source)
+            if not result.ok:
+                return _report(result.errors)
+            if args.avisos:
+                _report(result.warnings)
+                print(format_stats(result.stats), file=sys.stderr)
+            if args.emit_python:
+                with open(args.emit_python, 'w', encoding='utf-8') as f:
+                    f.write(standalone_source(result.ast))
+                print(f"Programa Python guardado en {args.emit_python}")
+            if args.emit_ir:
+                module = build_ir(result.ast, result.frame_sizes)
+                with open(args.emit_ir, 'w', encoding='utf-8') as f:
+                    f.write(module.dump() + "\n")
+                print(f"Representación intermedia guardada en {args.emit_ir}")
+                print(module.timing_report())
+            if args.emit_asm:
+                assembly = compile_to_assembly(result.ast, result.frame_sizes, args.registros)
+                with open(args.emit_asm, 'w', encoding='utf-8') as f:
+                    f.write(assembly.text)
+                print(f"Ensamblador guardado en {args.emit_asm}")
+                print(assembly.spill_report())
+            return 0
+        backend = 'vm' if args.emit_bytecode else args.backend
+        if backend == 'asm':
+            # La cantidad de registros no pasa por load_program
+            result = session.compile(source)
+            if not result.ok:
+                return _report(result.errors)
+            program = Machine.from_ast(result.ast, result.frame_sizes, registers=args.registros)
+        else:
+            program, errors = load_program(source, backend, session=session)
+            if errors:
+                return _report(errors)
+        if args.avisos:
+            _report(session.diagnostics.warnings)
+            print(format_stats(session.stats), file=sys.stderr)
+        if args.emit_bytecode:
+            program.program.save(args.emit_bytecode)
+            print(f"Código de bytes guardado en {args.emit_bytecode}")
+            return 0
+    try:
+        program.run()
+    except EvolaRuntimeError as e:
+        print(f"Error de ejecución: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.ciclos and isinstance(program, Machine):
+            print(program.report(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+# Semántica de ejecución compartida por los backends (intérprete, VM, Python).
+#
+# Evola sigue a C en la aritmética entera: la división trunca hacia cero y el
+# residuo lleva el signo del dividendo. Las variables sin inicializar toman el
+# valor por defecto de su tipo, y al asignar entre int y float el valor se
+# convierte al tipo de la variable (TypeChecker.is_assignable permite ambos).
+
+import sys
+from contextlib import contextmanager
+
+
+class EvolaRuntimeError(Exception):
+    """Error al ejecutar un programa (división por cero, recursión excesiva, ...)"""
+    def __init__(self, message, node=None):
+        self.message = message
+        self.node = node
+        line = getattr(node, 'line', None)
+        if line is not None:
+            message = f"{message} (línea {line})"
+        super().__init__(message)
+
+
+DEFAULT_VALUES = {'int': 0, 'float': 0.0, 'bool': False, 'string': "", 'void': None}
+
+
+def int_div(a, b):
+    """División entera truncando hacia cero, como en C"""
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+
+def int_mod(a, b):
+    """Residuo con el signo del dividendo, como en C"""
+    r = abs(a) % abs(b)
+    return r if a >= 0 else -r
+
+
+def format_value(value):
+    """Texto que imprime print() para un valor"""
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    return str(value)
+
+
+def conversion(target_type, value_type):
+    """Función que convierte un valor de value_type a target_type, o None si no hace falta"""
+    if target_type == 'int' and value_type == 'float':
+        return int
+    if target_type == 'float' and value_type == 'int':
+        return float
+    return None
+
+
+@contextmanager
+def recursion_limit(limit):
+    """Sube el límite de recursión de Python sólo mientras dura el bloque"""
+    previous = sys.getrecursionlimit()
+    if previous < limit:
+        sys.setrecursionlimit(limit)
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(previous)
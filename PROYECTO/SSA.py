@@ -0,0 +1,193 @@
+from IR import Instr, Var, Timer
+
+# Construcción de la forma SSA de un IRFunction (Cytron et al.).
+#
+#   1. Dominadores inmediatos con el algoritmo iterativo de Cooper, Harvey y
+#      Kennedy: los bloques ya están en posorden inverso, así que el índice del
+#      bloque sirve de número de orden y cada vuelta es lineal.
+#   2. Fronteras de dominancia: para cada bloque de unión se sube desde cada
+#      predecesor hasta su dominador inmediato.
+#   3. Funciones phi semipodadas: sólo para los nombres que se leen en algún
+#      bloque antes de asignarse en él (los demás no cruzan bloques), en la
+#      frontera de dominancia iterada de sus asignaciones.
+#   4. Renombrado en preorden del árbol de dominadores, con una pila de
+#      versiones por nombre. El recorrido es iterativo, así que la profundidad
+#      del árbol no está limitada por la pila de Python.
+#
+# La versión 0 es "sin definir": la que llega a una phi desde un camino donde
+# la variable todavía no se asignó (una variable declarada dentro de un bucle
+# vista desde la cabecera, por ejemplo).
+
+
+def compute_dominators(function):
+    """function.idom[i] = índice del dominador inmediato del bloque i (idom[0] = 0)"""
+    blocks = function.blocks
+    idom = [None] * len(blocks)
+    idom[0] = 0
+    changed = True
+    while changed:
+        changed = False
+        for block in blocks[1:]:
+            new_idom = None
+            for pred in block.preds:
+                p = pred.index
+                if idom[p] is None:
+                    continue
+                if new_idom is None:
+                    new_idom = p
+                    continue
+                # intersect: sube por el árbol desde el de mayor número de orden
+                a, b = p, new_idom
+                while a != b:
+                    while a > b:
+                        a = idom[a]
+                    while b > a:
+                        b = idom[b]
+                new_idom = a
+            if idom[block.index] != new_idom:
+                idom[block.index] = new_idom
+                changed = True
+    function.idom = idom
+    return idom
+
+
+def compute_frontiers(function):
+    """function.frontiers[i] = conjunto de índices de la frontera de dominancia de i"""
+    idom = function.idom
+    frontiers = [set() for _ in function.blocks]
+    for block in function.blocks:
+        if len(block.preds) < 2:
+            continue
+        for pred in block.preds:
+            runner = pred.index
+            while runner != idom[block.index]:
+                frontiers[runner].add(block.index)
+                runner = idom[runner]
+    function.frontiers = frontiers
+    return frontiers
+
+
+def dominator_tree(function):
+    """Hijos de cada bloque en el árbol de dominadores"""
+    children = [[] for _ in function.blocks]
+    for index, parent in enumerate(function.idom):
+        if index != 0:
+            children[parent].append(index)
+    return children
+
+
+def dominates(function, a, b):
+    """Verdadero si el bloque de índice `a` domina al de índice `b`"""
+    idom = function.idom
+    while b > a:
+        b = idom[b]
+    return a == b
+
+
+def natural_loops(function):
+    """{índice de cabecera: {índices de los bloques del bucle}} según las aristas
+    de retorno (b -> h con h dominando a b); requiere los dominadores"""
+    loops = {}
+    for block in function.blocks:
+        for succ in block.succs:
+            if not dominates(function, succ.index, block.index):
+                continue
+            body = loops.setdefault(succ.index, {succ.index})
+            pending = [block]
+            while pending:
+                member = pending.pop()
+                if member.index not in body:
+                    body.add(member.index)
+                    pending.extend(member.preds)
+    return loops
+
+
+def place_phis(function):
+    """Inserta phis vacías (args None) para los nombres que cruzan bloques"""
+    crossing = set()
+    definitions = {}  # nombre -> {índices de bloque que lo asignan}
+    for block in function.blocks:
+        assigned = set()
+        for instr in block.instrs + [block.terminator]:
+            for arg in instr.uses():
+                if arg.name not in assigned:
+                    crossing.add(arg.name)
+            if instr.dest is not None:
+                assigned.add(instr.dest.name)
+                definitions.setdefault(instr.dest.name, set()).add(block.index)
+
+    frontiers = function.frontiers
+    blocks = function.blocks
+    for name in crossing:
+        has_phi = set()
+        pending = list(definitions.get(name, ()))
+        defined = set(pending)
+        while pending:
+            for index in frontiers[pending.pop()]:
+                if index in has_phi:
+                    continue
+                block = blocks[index]
+                block.phis.append(Instr('phi', Var(name), [None] * len(block.preds)))
+                has_phi.add(index)
+                if index not in defined:
+                    defined.add(index)
+                    pending.append(index)
+
+
+def rename(function):
+    """Da a cada asignación una versión nueva y llena los argumentos de las phi"""
+    stacks = {}
+    counters = {}
+    children = dominator_tree(function)
+    blocks = function.blocks
+
+    def current(var):
+        stack = stacks.get(var.name)
+        return Var(var.name, stack[-1] if stack else 0)
+
+    def define(var):
+        version = counters.get(var.name, 0) + 1
+        counters[var.name] = version
+        stacks.setdefault(var.name, []).append(version)
+        return Var(var.name, version)
+
+    work = [(0, False)]
+    while work:
+        index, leaving = work.pop()
+        block = blocks[index]
+        if leaving:
+            # Deshace las versiones que introdujo el bloque
+            for instr in block.phis + block.instrs:
+                if instr.dest is not None:
+                    stacks[instr.dest.name].pop()
+            continue
+
+        for phi in block.phis:
+            phi.dest = define(phi.dest)
+        for instr in block.instrs + [block.terminator]:
+            instr.args = [current(arg) if isinstance(arg, Var) else arg for arg in instr.args]
+            if instr.dest is not None:
+                instr.dest = define(instr.dest)
+        for succ in block.succs:
+            for position, pred in enumerate(succ.preds):
+                if pred is block:
+                    for phi in succ.phis:
+                        phi.args[position] = current(phi.dest)
+
+        work.append((index, True))
+        work.extend((child, False) for child in reversed(children[index]))
+
+
+def to_ssa(function, timings=None):
+    """Pone el IRFunction en forma SSA; suma el tiempo de cada fase a `timings`"""
+    timings = {} if timings is None else timings
+    with Timer(timings, 'dominadores'):
+        compute_dominators(function)
+    with Timer(timings, 'fronteras'):
+        compute_frontiers(function)
+    with Timer(timings, 'phi'):
+        place_phis(function)
+    with Timer(timings, 'renombrado'):
+        rename(function)
+    function.ssa = True
+    return function
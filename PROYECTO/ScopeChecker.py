@@ -1,30 +1,73 @@
+from itertools import islice
+
+from ASTNodes import is_node, BINARY_OPERATORS
+from Visitor import Visitor
+
+
+class ScopeError(ValueError):
+    """Error de ámbito con el nodo del AST donde ocurrió"""
+    def __init__(self, message, node=None):
+        self.message = message
+        self.node = node
+        line = getattr(node, 'line', None)
+        if line is not None:
+            message = f"{message} (línea {line}, columna {node.col})"
+        super().__init__(message)
+
+
+class _Frame:
+    """Eslabón de la cadena de ámbitos: el diccionario del ámbito, el eslabón
+    padre y cuántas variables tenía el padre cuando se abrió este ámbito."""
+    __slots__ = ('scope', 'parent', 'parent_size')
+
+    def __init__(self, scope, parent=None, parent_size=0):
+        self.scope = scope
+        self.parent = parent
+        self.parent_size = parent_size
+
+
 class SymbolTable:
-    def __init__(self):
+    def __init__(self, record_history=False):
         self.global_scope = {}
         self.current_scope = self.global_scope
         self.scope_stack = [self.global_scope]
+        self._frame = _Frame(self.global_scope)
         self.functions = {}
+        # El historial de ámbitos es opcional: sólo hace falta para el reporte
+        self.record_history = record_history
         self.scope_history = []
     
     def enter_scope(self):
         new_scope = {}
+        self._frame = _Frame(new_scope, self._frame, len(self.current_scope))
         self.current_scope = new_scope
         self.scope_stack.append(new_scope)
-        self._record_scope_state("Entrar ámbito")
+        if self.record_history:
+            self._record_scope_state("Entrar ámbito")
     
     def exit_scope(self):
         if len(self.scope_stack) > 1:
-            self._record_scope_state("Salir ámbito")
+            if self.record_history:
+                self._record_scope_state("Salir ámbito")
             self.scope_stack.pop()
             self.current_scope = self.scope_stack[-1]
+            self._frame = self._frame.parent
     
     def _record_scope_state(self, action):
-        state = {
-            'action': action,
-            'scopes': [dict(scope) for scope in self.scope_stack],
-            'functions': dict(self.functions)
-        }
-        self.scope_history.append(state)
+        # Instantánea O(1). Un ámbito sólo recibe variables mientras es el actual y
+        # nunca las pierde, y las funciones tampoco se borran: basta con guardar el
+        # eslabón actual y cuántas variables y funciones había (ver _scopes_at).
+        self.scope_history.append((action, self._frame, len(self.current_scope), len(self.functions)))
+    
+    def _scopes_at(self, frame, size):
+        """Reconstruye los ámbitos de una instantánea, del global al más interno"""
+        scopes = []
+        while frame is not None:
+            scopes.append(dict(islice(frame.scope.items(), size)))
+            size = frame.parent_size
+            frame = frame.parent
+        scopes.reverse()
+        return scopes
     
     def add_variable(self, name, var_type=None, value=None):
         if name in self.current_scope:
@@ -34,7 +77,9 @@ class SymbolTable:
             'value': value,
             'scope': 'local' if len(self.scope_stack) > 1 else 'global'
         }
-        self._record_scope_state(f"Declarar variable '{name}'")
+        if self.record_history:
+            self._record_scope_state(f"Declarar variable '{name}'")
+        return self.current_scope[name]
     
     def add_function(self, name, params=None, return_type=None):
         if name in self.functions:
@@ -44,7 +89,9 @@ class SymbolTable:
             'return_type': return_type,
             'scope': 'global'
         }
-        self._record_scope_state(f"Declarar función '{name}'")
+        if self.record_history:
+            self._record_scope_state(f"Declarar función '{name}'")
+        return self.functions[name]
 
         
     def lookup_variable(self, name):
@@ -73,6 +120,7 @@ class SymbolTable:
         
         if len(func_info['params']) != args_count:
             raise ValueError(f"Error: La función '{name}()' espera {len(func_info['params'])} argumentos, pero se proporcionaron {args_count}")
+        return func_info
     
     def get_symbol_table_report(self):
         """Genera un reporte completo de la tabla de símbolos"""
@@ -111,10 +159,10 @@ class SymbolTable:
         """Genera un reporte del historial de cambios en los ámbitos"""
         report = ["=== HISTORIAL DE ÁMBITOS ==="]
         
-        for i, state in enumerate(self.scope_history, 1):
-            report.append(f"\nPaso {i}: {state['action']}")
+        for i, (action, frame, size, function_count) in enumerate(self.scope_history, 1):
+            report.append(f"\nPaso {i}: {action}")
             
-            for j, scope in enumerate(state['scopes']):
+            for j, scope in enumerate(self._scopes_at(frame, size)):
                 scope_name = "Global" if j == 0 else f"Local {j}"
                 vars_in_scope = [f"{name} (tipo: {info['type']})" for name, info in scope.items()]
                 
@@ -123,16 +171,35 @@ class SymbolTable:
                 else:
                     report.append(f"  {scope_name}: (vacío)")
             
-            if state['functions']:
-                report.append("  Funciones: " + ", ".join(state['functions'].keys()))
+            if function_count:
+                report.append("  Funciones: " + ", ".join(islice(self.functions, function_count)))
         
         return "\n".join(report)
 
-class ScopeChecker:
-    def __init__(self, error_file=None):
-        self.symbol_table = SymbolTable()
+class ScopeChecker(Visitor):
+    DISPATCH = {
+        'statement': {
+            'declaration': 'check_declaration',
+            'assignment': 'check_assignment',
+            'if': 'check_if',
+            'while': 'check_while',
+            'for': 'check_for',
+            'return': 'check_return',
+            'print': 'check_print',
+            'call': 'check_function_call',
+        },
+        'expression': dict(
+            {op: 'check_binary' for op in BINARY_OPERATORS},
+            call='check_function_call',
+            id='check_identifier',
+        ),
+    }
+
+    def __init__(self, error_file=None, verbose=True):
+        self.symbol_table = SymbolTable(record_history=verbose)
         self.errors = []
         self.error_file = error_file
+        self.verbose = verbose  # Imprime la tabla de símbolos y el historial al terminar
 
     def check_program(self, ast):
         if ast[0] != 'program':
@@ -144,11 +211,11 @@ class ScopeChecker:
                 _, return_type, name, params_list, _ = func_node # block_node not needed for registration
                 # Transform params_list: [('param', p_type, p_name), ...] to [(p_type, p_name), ...]
                 extracted_params = [(param_node[1], param_node[2]) for param_node in params_list]
-                self.symbol_table.add_function(name, extracted_params, return_type)
+                self._checked(func_node, self.symbol_table.add_function, name, extracted_params, return_type)
             elif func_node[0] == 'main_function': # ('main_function', params_list, block_node)
                 _, params_list, _ = func_node # block_node not needed for registration
                 extracted_params = [(param_node[1], param_node[2]) for param_node in params_list] # Assuming params_list structure is same
-                self.symbol_table.add_function('main', extracted_params, 'void') # Main implicitly void
+                self._checked(func_node, self.symbol_table.add_function, 'main', extracted_params, 'void') # Main implicitly void
 
         # Luego verificar los cuerpos de las funciones
         for func_node in ast[1]: # Iterate again to check bodies in new scopes
@@ -157,8 +224,9 @@ class ScopeChecker:
             elif func_node[0] == 'main_function':
                 self.check_main_function(func_node)
         
-        print("\n" + self.symbol_table.get_symbol_table_report())
-        print("\n" + self.symbol_table.get_scope_history_report())
+        if self.verbose:
+            print("\n" + self.symbol_table.get_symbol_table_report())
+            print("\n" + self.symbol_table.get_scope_history_report())
     
     # check_functions method is removed as its logic is merged into check_program's second loop.
 
@@ -171,7 +239,7 @@ class ScopeChecker:
         # params_list is [('param', p_type, p_name), ...]
         for param_node in params_list:
             # param_node is ('param', p_type, p_name)
-            self.symbol_table.add_variable(param_node[2], param_node[1]) # name, type
+            self._checked(param_node, self.symbol_table.add_variable, param_node[2], param_node[1]) # name, type
 
         # block_node is ('block', [statements])
         self.check_block(block_node[1])
@@ -186,7 +254,7 @@ class ScopeChecker:
         # params_list is [('param', p_type, p_name), ...]
         for param_node in params_list:
              # param_node is ('param', p_type, p_name)
-            self.symbol_table.add_variable(param_node[2], param_node[1]) # name, type
+            self._checked(param_node, self.symbol_table.add_variable, param_node[2], param_node[1]) # name, type
 
         # block_node is ('block', [statements])
         self.check_block(block_node[1])
@@ -199,30 +267,15 @@ class ScopeChecker:
     
     def check_statement(self, stmt):
         """Verifica una instrucción individual"""
-        if isinstance(stmt, tuple):
-            stmt_type = stmt[0]
-            
-            if stmt_type == 'declaration':
-                self.check_declaration(stmt)
-            elif stmt_type == 'assignment':
-                self.check_assignment(stmt)
-            elif stmt_type == 'if':
-                self.check_if(stmt)
-            elif stmt_type == 'while':
-                self.check_while(stmt)
-            elif stmt_type == 'for':
-                self.check_for(stmt)
-            elif stmt_type == 'return':
-                self.check_return(stmt)
-            elif stmt_type == 'print':
-                self.check_print(stmt)
-            elif stmt_type == 'call':
-                self.check_function_call(stmt)
+        if is_node(stmt):
+            handler = self.handler_for('statement', stmt)
+            if handler is not None:
+                handler(self, stmt)
     
     def check_declaration(self, decl):
         """Verifica una declaración de variable"""
         _, var_type, name, init_value = decl
-        self.symbol_table.add_variable(name, var_type)
+        self._checked(decl, self.symbol_table.add_variable, name, var_type)
         
         if init_value is not None:
             self.check_expression(init_value)
@@ -230,7 +283,7 @@ class ScopeChecker:
     def check_assignment(self, assign):
         """Verifica una asignación de variable"""
         _, name, expr = assign
-        self.symbol_table.check_variable_usage(name)
+        self._checked(assign, self.symbol_table.check_variable_usage, name)
         self.check_expression(expr)
     
     def check_if(self, if_stmt):
@@ -281,29 +334,43 @@ class ScopeChecker:
     def check_function_call(self, call):
         """Verifica una llamada a función"""
         _, name, args = call
-        self.symbol_table.check_function_call(name, len(args))
+        self._checked(call, self.symbol_table.check_function_call, name, len(args))
         
         for arg in args:
             self.check_expression(arg)
     
     def check_expression(self, expr):
         """Verifica una expresión"""
-        if isinstance(expr, tuple):
-            if expr[0] in ('or', 'and', '==', '!=', '<', '>', '<=', '>=', '+', '-', '*', '/', '%'):
-                self.check_expression(expr[1])
-                self.check_expression(expr[2])
-            elif expr[0] == 'call':
-                self.check_function_call(expr)
-            elif expr[0] == 'id':
-                self.symbol_table.check_variable_usage(expr[1])
+        if is_node(expr):
+            handler = self.handler_for('expression', expr)
+            if handler is not None:
+                handler(self, expr)
         elif isinstance(expr, list):
             for e in expr:
                 self.check_expression(e)
     
+    def check_binary(self, expr):
+        """Verifica los dos operandos de una operación binaria"""
+        self.check_expression(expr[1])
+        self.check_expression(expr[2])
+    
+    def check_identifier(self, expr):
+        """Verifica que la variable usada esté declarada"""
+        self._checked(expr, self.symbol_table.check_variable_usage, expr[1])
+    
     def get_errors(self):
         """Obtiene los errores encontrados"""
         return self.errors
     
     def log_error(self, message):
         """Registra un error"""
-        self.errors.append(message)
\ No newline at end of file
+        self.errors.append(message)
+
+    def _checked(self, node, action, *args):
+        """Ejecuta una operación de la tabla de símbolos y ubica su error en el nodo"""
+        try:
+            return action(*args)
+        except ScopeError:
+            raise
+        except ValueError as e:
+            raise ScopeError(str(e), node) from None
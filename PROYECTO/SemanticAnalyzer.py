@@ -0,0 +1,140 @@
+from ASTNodes import Node
+from ScopeChecker import ScopeError, SymbolTable
+from TypeChecker import TypeChecker
+
+
+class SemanticAnalyzer(TypeChecker):
+    """Análisis semántico en una sola pasada: ámbitos y tipos a la vez.
+
+    Reemplaza a ScopeChecker + TypeChecker. Cada nombre se resuelve en el momento
+    en que se infiere su tipo, con la pila de ámbitos correcta para ese punto del
+    programa (parámetros, bloques de if/while/for), en lugar de consultar la tabla
+    de símbolos que dejó el recorrido anterior. Los nodos del AST quedan anotados
+    con su símbolo (`sym`) y su tipo (`ty`).
+
+    Los errores de ámbito no detienen el análisis: se acumulan en scope_errors
+    (ScopeError, con el nodo) y los de tipo en errors/located_errors.
+    """
+    def __init__(self, symbol_table=None, verbose=False):
+        super().__init__(symbol_table if symbol_table is not None else SymbolTable(record_history=verbose))
+        self.scope_errors = []
+        self._initializing = None  # Símbolo de la declaración cuyo inicializador se analiza
+        self.verbose = verbose  # Imprime la tabla de símbolos y el historial al terminar
+
+    def _resolved(self, node, action, *args):
+        """Ejecuta una operación de la tabla de símbolos; registra su error de ámbito"""
+        try:
+            return action(*args)
+        except ValueError as e:
+            self.scope_errors.append(ScopeError(str(e), node))
+            return None
+
+    def get_scope_errors(self):
+        return [str(e) for e in self.scope_errors]
+
+    def check_program(self, node):
+        if node[0] != 'program':
+            self.log_error("Invalid AST root, expected 'program'.", node)
+            return
+
+        # Primero se registran todas las funciones, para permitir llamadas hacia adelante
+        for func_or_main in node[1]:
+            if func_or_main[0] == 'function':
+                _, return_type, name, params_list, _ = func_or_main
+            elif func_or_main[0] == 'main_function':
+                _, params_list, _ = func_or_main
+                name, return_type = 'main', 'void'
+            else:
+                continue
+            params = [(param[1], param[2]) for param in params_list]
+            symbol = self._resolved(func_or_main, self.symbol_table.add_function, name, params, return_type)
+            _annotate(func_or_main, symbol, return_type)
+
+        for func_or_main in node[1]:
+            if func_or_main[0] == 'function':
+                _, return_type, _, params_list, block_node = func_or_main
+            elif func_or_main[0] == 'main_function':
+                _, params_list, block_node = func_or_main
+                return_type = 'void'
+            else:
+                continue
+            self._check_function_body(return_type, params_list, block_node)
+
+        if self.verbose:
+            print("\n" + self.symbol_table.get_symbol_table_report())
+            print("\n" + self.symbol_table.get_scope_history_report())
+
+    def _check_function_body(self, return_type, params_list, block_node):
+        # Los parámetros y el cuerpo comparten el ámbito de la función
+        self.current_function_return_type = return_type
+        self.symbol_table.enter_scope()
+        for param in params_list:
+            symbol = self._resolved(param, self.symbol_table.add_variable, param[2], param[1])
+            _annotate(param, symbol, param[1])
+        for stmt in block_node[1]:
+            self.check_node(stmt)
+        self.symbol_table.exit_scope()
+        self.current_function_return_type = None
+
+    def _check_block(self, block_node):
+        # Bloques de if/while/for: cada uno abre su propio ámbito
+        self.symbol_table.enter_scope()
+        for stmt in block_node[1]:
+            self.check_node(stmt)
+        self.symbol_table.exit_scope()
+
+    def _check_declaration(self, decl_node):
+        _, declared_type, var_name, _ = decl_node
+        # Como en ScopeChecker, la variable ya es visible en su propio inicializador,
+        # pero leerla ahí es un error: su ranura todavía no tiene valor (ver _infer_id)
+        symbol = self._resolved(decl_node, self.symbol_table.add_variable, var_name, declared_type)
+        _annotate(decl_node, symbol, declared_type)
+        self._initializing = symbol
+        try:
+            super()._check_declaration(decl_node)
+        finally:
+            self._initializing = None
+
+    def _check_assignment(self, assign_node):
+        _, var_name, value_expr = assign_node
+        symbol = self._resolved(assign_node, self.symbol_table.check_variable_usage, var_name)
+        if symbol is None:
+            self.infer_expression_type(value_expr)  # Resolver también los nombres del valor
+            return
+        _annotate(assign_node, symbol, symbol['type'])
+        super()._check_assignment(assign_node)
+
+    def infer_expression_type(self, expr_node):
+        expr_type = super().infer_expression_type(expr_node)
+        if isinstance(expr_node, Node):
+            expr_node.ty = expr_type
+        return expr_type
+
+    def _infer_id(self, expr_node):
+        symbol = self._resolved(expr_node, self.symbol_table.check_variable_usage, expr_node[1])
+        if symbol is None:
+            return 'error_type'  # Ya se reportó como error de ámbito
+        if symbol is self._initializing:
+            self.scope_errors.append(ScopeError(
+                f"Error: La variable '{expr_node[1]}' se usa en su propio inicializador", expr_node))
+            return 'error_type'
+        if isinstance(expr_node, Node):
+            expr_node.sym = symbol
+        return symbol['type']
+
+    def _infer_call(self, expr_node):
+        _, func_name, arg_exprs = expr_node
+        symbol = self._resolved(expr_node, self.symbol_table.check_function_call, func_name, len(arg_exprs))
+        if symbol is None:
+            for arg_expr in arg_exprs:
+                self.infer_expression_type(arg_expr)
+            return 'error_type'
+        if isinstance(expr_node, Node):
+            expr_node.sym = symbol
+        return super()._infer_call(expr_node)
+
+
+def _annotate(node, symbol, node_type):
+    if isinstance(node, Node):
+        node.sym = symbol
+        node.ty = node_type
@@ -0,0 +1,158 @@
+import codecs
+import mmap
+
+from Diagnostics import Diagnostic
+from FastLexer import FIXED_TEXT, MASTER, TOKEN_TYPES, FastToken, _ACTIONS, _CONVERTERS, \
+    _ERROR, _ID, _RESERVED_IDS, _SKIP, _SYMBOL, _SYMBOL_IDS
+
+# Lectura por partes de fuentes enormes: el archivo se mapea en memoria y se
+# decodifica y tokeniza de a `chunk_size` bytes, con la expresión maestra de
+# FastLexer. El parser pide los tokens de a uno (tokenfunc), así que en memoria
+# sólo queda el pedazo de texto que todavía no se consumió.
+#
+# Un token puede quedar partido entre dos pedazos. Mientras no se llegue al
+# final del archivo, una coincidencia sólo se acepta si termina al menos
+# LOOKAHEAD caracteres antes del final del pedazo: así ningún identificador,
+# número ('12.' + '5') ni operador ('=' + '=') se corta. Los comentarios de
+# bloque y las cadenas pueden ser más largos que eso; si no se cierran dentro
+# del pedazo, la expresión cae en '/' o en el carácter ilegal '"', y en ese caso
+# también se espera al pedazo siguiente.
+#
+# Del texto ya consumido se guarda la línea del último token, para el contexto
+# de los errores, pero nunca más de CONTEXT_LIMIT caracteres: una fuente de una
+# sola línea no se queda entera en memoria.
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+# Caracteres que puede necesitar mirar la expresión después de un token
+LOOKAHEAD = 2
+CONTEXT_LIMIT = 1024
+_DIVIDE_TEXT = FIXED_TEXT[TOKEN_TYPES.index('DIVIDE')]
+
+
+def mapped_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Texto de un archivo UTF-8 en pedazos de `chunk_size` bytes, vía mmap"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with open(path, 'rb') as f:
+        # mmap no acepta archivos vacíos
+        if f.seek(0, 2) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start in range(0, len(data), chunk_size):
+                # Una secuencia UTF-8 partida queda en el decodificador hasta el pedazo siguiente
+                text = decoder.decode(data[start:start + chunk_size])
+                if text:
+                    yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+class ChunkedTokenStream:
+    """Tokens de una fuente que llega en pedazos: stream.token() como lexer.token()
+
+    Hace también de índice de líneas para Diagnostics (line_text), pero sólo
+    de la línea del último token: las anteriores ya se descartaron,
+    así que sus diagnósticos (y los de una línea de más de CONTEXT_LIMIT
+    caracteres) salen sin el texto de contexto, y el de un error léxico llega
+    sólo hasta el final del pedazo leído.
+    """
+    source = None  # No hay texto completo; DiagnosticCollector usa este índice
+
+    def __init__(self, chunks, diagnostics=None):
+        self.diagnostics = diagnostics
+        self.lineno = 1
+        self.lexpos = 0
+        self._line_start = 0  # Desplazamiento donde empieza la línea actual
+        self._base = 0        # Desplazamiento del primer carácter de _buffer
+        self._buffer = ''
+        self._tokens = self._scan(iter(chunks))
+
+    @classmethod
+    def from_file(cls, path, diagnostics=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        return cls(mapped_chunks(path, chunk_size), diagnostics)
+
+    def token(self):
+        return next(self._tokens, None)
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+    def line_text(self, line):
+        if line != self.lineno or self._line_start < self._base:
+            return None
+        start = self._line_start - self._base
+        end = self._buffer.find('\n', start)
+        return self._buffer[start:end if end >= 0 else len(self._buffer)]
+
+    def _count_lines(self, buffer, start, end):
+        newlines = buffer.count('\n', start, end)
+        if newlines:
+            self.lineno += newlines
+            self._line_start = self._base + buffer.rfind('\n', start, end) + 1
+
+    def _scan(self, chunks):
+        actions = _ACTIONS
+        reserved = _RESERVED_IDS.get
+        symbols = _SYMBOL_IDS
+        converters = _CONVERTERS
+        buffer, pos, scanned = '', 0, 0  # scanned: hasta dónde se contaron las líneas
+        count = buffer.count
+        final = False
+        while True:
+            chunk = next(chunks, None)
+            if chunk is None:
+                final = True
+            else:
+                # Se descarta lo consumido, salvo la línea del último token (contexto de errores)
+                keep = max(min(pos, self._line_start - self._base), pos - CONTEXT_LIMIT)
+                if keep > scanned:
+                    self._count_lines(buffer, scanned, keep)
+                    scanned = keep
+                buffer = buffer[keep:] + chunk
+                count = buffer.count
+                pos -= keep
+                scanned -= keep
+                self._base += keep
+                self._buffer = buffer
+            base = self._base
+            limit = len(buffer) if final else len(buffer) - LOOKAHEAD
+            for match in MASTER.finditer(buffer, pos):
+                group = match.lastindex
+                action = actions[group]
+                if not final:
+                    if match.end() > limit:
+                        break
+                    if action == _ERROR and match.group(group) == '"':
+                        break  # Cadena que se cierra en otro pedazo
+                    if action == _SYMBOL and match.group(group) == _DIVIDE_TEXT \
+                            and buffer.startswith('*', match.end()):
+                        break  # Comentario de bloque que se cierra en otro pedazo
+                pos = match.end()
+                start = match.start(group)
+                if count('\n', scanned, start):
+                    self._count_lines(buffer, scanned, start)
+                scanned = start
+                if action == _SKIP or action == _ERROR:
+                    if action == _ERROR and self.diagnostics is not None:
+                        self.diagnostics.add(Diagnostic(
+                            'lexico', f"Carácter ilegal '{match.group(group)}'",
+                            self.lineno, base + start - self._line_start + 1,
+                            self.line_text(self.lineno)))
+                    continue
+                tok = FastToken()
+                if action == _ID:
+                    text = match.group(group)
+                    action = reserved(text, _ID)
+                    tok.value = text if action == _ID else FIXED_TEXT[action]
+                elif action == _SYMBOL:
+                    action = symbols[match.group(group)]
+                    tok.value = FIXED_TEXT[action]
+                else:
+                    tok.value = converters[action](match.group(group))
+                tok.type = TOKEN_TYPES[action]
+                tok.lexpos = self.lexpos = base + start
+                tok.lineno = self.lineno
+                tok.col = base + start - self._line_start + 1
+                yield tok
+            if final:
+                return
@@ -0,0 +1,118 @@
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import ply
+import ply.yacc as yacc
+
+# Subir este número invalida todas las tablas guardadas (cambios en el formato
+# o en la forma de construir el parser que no se reflejan en la gramática).
+TABLE_FORMAT_VERSION = 1
+
+# Estadísticas de la última construcción de tablas (una por módulo de gramática)
+TABLE_STATS = {}
+
+
+def cache_dir():
+    """Directorio de caché del usuario para las tablas LALR"""
+    override = os.environ.get('EVOLA_CACHE_DIR')
+    if override:
+        return override
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'evola')
+
+
+def grammar_hash(module):
+    """Hash de los docstrings de la gramática, la precedencia y los tokens"""
+    h = hashlib.sha256()
+    h.update(f"v{TABLE_FORMAT_VERSION};ply{ply.__version__};".encode('utf-8'))
+    h.update(getattr(module, 'start', '').encode('utf-8'))
+    h.update(repr(getattr(module, 'precedence', ())).encode('utf-8'))
+    h.update(repr(list(getattr(module, 'tokens', []))).encode('utf-8'))
+    for name in sorted(dir(module)):
+        if name.startswith('p_') and name != 'p_error':
+            doc = getattr(module, name).__doc__ or ''
+            h.update(f"{name}:{doc}\n".encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def build_parser(module, debug=True):
+    """Carga las tablas LALR desde la caché o las construye y las guarda.
+
+    Las tablas sólo se regeneran cuando cambia el hash de la gramática.
+    """
+    start = time.perf_counter()
+    signature = grammar_hash(module)
+    directory = cache_dir()
+    table_name = f"{module.__name__.lower()}-{signature}"
+    picklefile = os.path.join(directory, table_name + '.pickle')
+
+    parser = None
+    cache_hit = False
+    if os.path.exists(picklefile):
+        try:
+            parser = yacc.yacc(module=module, picklefile=picklefile, debug=False)
+            cache_hit = True
+        except Exception as e:
+            # Tabla corrupta o a medio escribir por otro proceso: se reconstruye
+            print(f"Aviso: no se pudo leer la tabla {picklefile}: {e}", file=sys.stderr)
+
+    if parser is None:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmpfile = tempfile.mkstemp(prefix=table_name + '.', suffix='.tmp', dir=directory)
+        os.close(fd)
+        os.remove(tmpfile)  # yacc sólo escribe la tabla si el archivo no es legible
+        parser = yacc.yacc(module=module, picklefile=tmpfile, debug=debug,
+                           debugfile=table_name + '.out', outputdir=directory)
+        try:
+            os.replace(tmpfile, picklefile)  # Reemplazo atómico entre procesos
+        except OSError as e:
+            print(f"Aviso: no se pudo guardar la tabla {picklefile}: {e}", file=sys.stderr)
+
+    TABLE_STATS[module.__name__] = {
+        'cache_hit': cache_hit,
+        'seconds': time.perf_counter() - start,
+        'path': picklefile,
+        'grammar_hash': signature,
+    }
+    return parser
+
+
+def _time_import(module_name, env, runs):
+    """Mide cuánto tarda un proceso nuevo en importar el módulo del parser"""
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    code = (f"import time; t = time.perf_counter(); import {module_name}; "
+            f"print(time.perf_counter() - t)")
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', code], cwd=project_dir, env=env,
+                             capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return times
+
+
+def measure_startup(module_name='Parser', runs=5):
+    """Compara el arranque en frío (sin caché) con el arranque en caliente"""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, EVOLA_CACHE_DIR=tmp)
+        cold = []
+        for _ in range(runs):
+            for name in os.listdir(tmp):
+                os.remove(os.path.join(tmp, name))
+            cold.extend(_time_import(module_name, env, 1))
+        warm = _time_import(module_name, env, runs)
+    return {'cold': min(cold), 'warm': min(warm)}
+
+
+if __name__ == '__main__':
+    module_name = sys.argv[1] if len(sys.argv) > 1 else 'Parser'
+    result = measure_startup(module_name)
+    print(f"Arranque en frío ({module_name}):     {result['cold'] * 1000:.1f} ms")
+    print(f"Arranque en caliente ({module_name}): {result['warm'] * 1000:.1f} ms")
+    print(f"Aceleración: {result['cold'] / result['warm']:.1f}x")
@@ -0,0 +1,210 @@
+import argparse
+import struct
+import sys
+
+# Volcado binario de los tokens que leyó el parser, en lugar de las cinco
+# líneas de texto por token de ASTBuilder.save_trace_to_file.
+#
+#   "EVTK" versión
+#   tipos:   n, luego n nombres           (cadena: largo + UTF-8)
+#   valores: n, luego n valores internados (etiqueta + dato)
+#   tokens:  n, luego por token: tipo, valor, Δposición, Δlínea
+#
+# Todos los enteros son varint (LEB128 sin signo, 7 bits por byte): la posición
+# y la línea se guardan como diferencia con el token anterior, así que casi
+# todos los campos ocupan un byte y un token típico ocupa cuatro. Los valores
+# se guardan una sola vez (un 'int' o un ';' se repiten miles de veces); los
+# enteros de Evola van en zigzag y los float en 8 bytes.
+#
+# El volcado se arma en la misma pasada del parser: CompilerSession.parse(...,
+# trace=dump) llama a dump.record(tok) por cada token que lee.
+
+MAGIC = b"EVTK"
+VERSION = 1
+_STRING, _INT, _FLOAT = 0, 1, 2
+_DOUBLE = struct.Struct('<d')
+
+
+class TokenDumpError(Exception):
+    """Datos que no son un volcado de tokens válido"""
+
+
+def _varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _string(out, text):
+    data = text.encode('utf-8')
+    _varint(out, len(data))
+    out += data
+
+
+class TokenDump:
+    """Acumula los tokens de un análisis y los codifica en el formato binario"""
+
+    def __init__(self):
+        self.count = 0
+        self._types = {}   # nombre -> índice
+        self._values = {}  # (clase, valor) -> índice; la clase separa 1 de 1.0
+        self._records = bytearray()
+        self._lexpos = 0
+        self._lineno = 1
+
+    def record(self, tok):
+        """Agrega un token (cualquier objeto con type, value, lexpos y lineno)"""
+        records = self._records
+        kind = self._types.get(tok.type)
+        if kind is None:
+            kind = self._types[tok.type] = len(self._types)
+        key = (tok.value.__class__, tok.value)
+        value = self._values.get(key)
+        if value is None:
+            value = self._values[key] = len(self._values)
+        delta_pos = tok.lexpos - self._lexpos
+        delta_line = tok.lineno - self._lineno
+        if kind < 0x80 and value < 0x80 and 0 <= delta_pos < 0x80 and 0 <= delta_line < 0x80:
+            records += bytes((kind, value, delta_pos, delta_line))
+        else:
+            if delta_pos < 0 or delta_line < 0:
+                raise ValueError("Los tokens deben llegar en orden de posición")
+            _varint(records, kind)
+            _varint(records, value)
+            _varint(records, delta_pos)
+            _varint(records, delta_line)
+        self._lexpos = tok.lexpos
+        self._lineno = tok.lineno
+        self.count += 1
+
+    def to_bytes(self):
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        _varint(out, len(self._types))
+        for name in self._types:
+            _string(out, name)
+        _varint(out, len(self._values))
+        for cls, value in self._values:
+            if cls is str:
+                out.append(_STRING)
+                _string(out, value)
+            elif cls is int:
+                out.append(_INT)
+                _varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+            elif cls is float:
+                out.append(_FLOAT)
+                out += _DOUBLE.pack(value)
+            else:
+                raise TypeError(f"Valor de token no serializable: {value!r}")
+        _varint(out, self.count)
+        out += self._records
+        return bytes(out)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+
+class _Reader:
+    __slots__ = ('data', 'pos')
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def varint(self):
+        data, pos = self.data, self.pos
+        result = shift = 0
+        while True:
+            if pos >= len(data):
+                raise TokenDumpError("Volcado truncado")
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                self.pos = pos
+                return result
+            shift += 7
+
+    def take(self, size):
+        if self.pos + size > len(self.data):
+            raise TokenDumpError("Volcado truncado")
+        chunk = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return chunk
+
+    def string(self):
+        try:
+            return self.take(self.varint()).decode('utf-8')
+        except UnicodeDecodeError as e:
+            raise TokenDumpError(f"Cadena con UTF-8 inválido: {e}") from None
+
+
+def read_dump(data):
+    """Lista de (tipo, valor, línea, posición) de un volcado"""
+    if len(data) <= len(MAGIC) or data[:len(MAGIC)] != MAGIC:
+        raise TokenDumpError("No es un volcado de tokens (falta la firma EVTK)")
+    if data[len(MAGIC)] != VERSION:
+        raise TokenDumpError(f"Versión de volcado no soportada: {data[len(MAGIC)]}")
+    reader = _Reader(data)
+    reader.pos = len(MAGIC) + 1
+    types = [reader.string() for _ in range(reader.varint())]
+    values = []
+    for _ in range(reader.varint()):
+        tag = reader.take(1)[0]
+        if tag == _STRING:
+            values.append(reader.string())
+        elif tag == _INT:
+            zigzag = reader.varint()
+            values.append(zigzag >> 1 if not zigzag & 1 else -((zigzag + 1) >> 1))
+        elif tag == _FLOAT:
+            values.append(_DOUBLE.unpack(reader.take(_DOUBLE.size))[0])
+        else:
+            raise TokenDumpError(f"Etiqueta de valor desconocida: {tag}")
+    tokens = []
+    lexpos, lineno = 0, 1
+    for _ in range(reader.varint()):
+        kind = reader.varint()
+        value = reader.varint()
+        lexpos += reader.varint()
+        lineno += reader.varint()
+        if kind >= len(types) or value >= len(values):
+            raise TokenDumpError(f"Token {len(tokens)} fuera de las tablas (tipo {kind}, valor {value})")
+        tokens.append((types[kind], values[value], lineno, lexpos))
+    return tokens
+
+
+def load_dump(path):
+    with open(path, 'rb') as f:
+        return read_dump(f.read())
+
+
+def format_trace(tokens):
+    """El formato de texto de ASTBuilder.save_trace_to_file"""
+    separator = "-" * 40
+    return "".join(f"Token: {type_}\nValor: {value}\nLínea: {lineno}\nPosición: {lexpos}\n{separator}\n"
+                   for type_, value, lineno, lexpos in tokens)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(prog='main.py tokens',
+                                         description="Muestra un volcado de tokens (.evtk) como texto")
+    arg_parser.add_argument('path', help="volcado binario de tokens")
+    arg_parser.add_argument('-o', '--salida', help="archivo de texto (por defecto, la consola)")
+    args = arg_parser.parse_args(argv)
+    try:
+        text = format_trace(load_dump(args.path))
+    except TokenDumpError as e:
+        print(f"{args.path}: {e}", file=sys.stderr)
+        return 1
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,244 @@
+import hashlib
+import inspect
+import sys
+from collections import OrderedDict
+
+from ASTNodes import BINARY_OPERATORS
+from Runtime import EvolaRuntimeError, DEFAULT_VALUES, int_div, int_mod, conversion, recursion_limit
+from Visitor import Visitor
+
+# Traducción de programas verificados a código Python.
+#
+# El código generado se compila con compile() y se ejecuta con exec(); los
+# objetos de código se guardan por hash del código Python, así que ejecutar de
+# nuevo el mismo programa no vuelve a compilarlo. La caché conserva los
+# CODE_CACHE_SIZE usados más recientemente y desaloja el resto. Cada variable se llama
+# <nombre>_<ranura> (ranura de Resolver), de modo que las variables que se
+# ocultan en bloques anidados no chocan, y cada función fn_<nombre>.
+
+TRANSPILER_VERSION = 1
+
+# Funciones de Runtime que usa el código generado (se copian en los .py independientes)
+HELPERS = {'_int_div': int_div, '_int_mod': int_mod}
+
+PYTHON_OPERATORS = {op: op for op in BINARY_OPERATORS}
+INT_HELPERS = {'/': '_int_div', '%': '_int_mod'}
+
+# Cada llamada de Evola es una llamada de Python
+RECURSION_LIMIT = 10000
+
+CODE_CACHE_SIZE = 64
+CODE_CACHE = OrderedDict()  # sha256 del código Python -> objeto de código, el último usado al final
+CACHE_STATS = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+class PythonTranspiler(Visitor):
+    """Genera el texto Python de un AST verificado y resuelto"""
+    DISPATCH = {
+        'statement': {
+            'declaration': '_emit_declaration',
+            'assignment': '_emit_assignment',
+            'if': '_emit_if',
+            'while': '_emit_while',
+            'for': '_emit_for',
+            'return': '_emit_return',
+            'print': '_emit_print',
+            'call': '_emit_call_statement',
+        },
+        'expression': {
+            'number': '_expr_constant',
+            'string': '_expr_constant',
+            'bool': '_expr_constant',
+            'id': '_expr_id',
+            'call': '_expr_call',
+            **{op: '_expr_binary' for op in BINARY_OPERATORS},
+        },
+    }
+
+    def __init__(self):
+        self.lines = []
+        self._indent = ''
+        self._param_types = {}
+
+    def transpile(self, ast):
+        """Devuelve el código Python del programa (sin el preludio de ayudantes)"""
+        functions = [_signature(func) for func in ast[1]]
+        for name, _, params_list, _ in functions:
+            self._param_types[name] = [param[1] for param in params_list]
+        for name, return_type, params_list, block_node in functions:
+            self._return_type = return_type
+            params = ", ".join(_variable(param) for param in params_list)
+            self._line(f"def fn_{name}({params}):")
+            self._indent = '    '
+            self._emit_block(block_node)
+            self._line(f"return {DEFAULT_VALUES.get(return_type)!r}")
+            self._indent = ''
+            self._line("")
+        return "\n".join(self.lines)
+
+    def _line(self, text):
+        self.lines.append(self._indent + text if text else text)
+
+    # --- Instrucciones ---
+
+    def _emit_block(self, block_node):
+        if not block_node[1]:
+            self._line("pass")
+        for stmt in block_node[1]:
+            self.handler_for('statement', stmt)(self, stmt)
+
+    def _emit_nested(self, block_node):
+        saved = self._indent
+        self._indent += '    '
+        self._emit_block(block_node)
+        self._indent = saved
+
+    def _emit_declaration(self, decl):
+        _, var_type, _, init = decl
+        value = repr(DEFAULT_VALUES[var_type]) if init is None else self._converted(init, var_type)
+        self._line(f"{_variable(decl)} = {value}")
+
+    def _emit_assignment(self, assign):
+        self._line(f"{_variable(assign)} = {self._converted(assign[2], assign.ty)}")
+
+    def _emit_if(self, if_stmt):
+        _, condition, then_block, else_block = if_stmt
+        self._line(f"if {self._expression(condition)}:")
+        self._emit_nested(then_block)
+        if else_block is not None:
+            self._line("else:")
+            self._emit_nested(else_block)
+
+    def _emit_while(self, while_stmt):
+        _, condition, body = while_stmt
+        self._line(f"while {self._expression(condition)}:")
+        self._emit_nested(body)
+
+    def _emit_for(self, for_stmt):
+        # for (init; cond; update) body  ->  init; while cond: body; update
+        _, init, condition, update, body = for_stmt
+        self._emit_assignment(init)
+        self._line(f"while {self._expression(condition)}:")
+        saved = self._indent
+        self._indent += '    '
+        for stmt in body[1]:
+            self.handler_for('statement', stmt)(self, stmt)
+        self._emit_assignment(update)
+        self._indent = saved
+
+    def _emit_return(self, return_stmt):
+        if return_stmt[1] is None:
+            self._line("return None")
+        else:
+            self._line(f"return {self._converted(return_stmt[1], self._return_type)}")
+
+    def _emit_print(self, print_stmt):
+        expr = print_stmt[1]
+        value = self._expression(expr)
+        if expr.ty == 'string':
+            text = value
+        elif expr.ty == 'bool':
+            text = f"('true' if {value} else 'false')"
+        else:
+            text = f"str({value})"
+        self._line(f"_write({text} + '\\n')")
+
+    def _emit_call_statement(self, call):
+        self._line(self._expression(call))
+
+    # --- Expresiones ---
+
+    def _expression(self, expr):
+        return self.handler_for('expression', expr)(self, expr)
+
+    def _converted(self, expr, target_type):
+        text = self._expression(expr)
+        convert = conversion(target_type, expr.ty)
+        return text if convert is None else f"{convert.__name__}({text})"
+
+    def _expr_constant(self, expr):
+        return repr(expr[1])
+
+    def _expr_id(self, expr):
+        return _variable(expr)
+
+    def _expr_call(self, call):
+        args = ", ".join(self._converted(arg, param_type)
+                         for arg, param_type in zip(call[2], self._param_types[call[1]]))
+        return f"fn_{call[1]}({args})"
+
+    def _expr_binary(self, expr):
+        op, left, right = expr
+        left_text, right_text = self._expression(left), self._expression(right)
+        if op in INT_HELPERS and left.ty == 'int' and right.ty == 'int':
+            return f"{INT_HELPERS[op]}({left_text}, {right_text})"
+        return f"({left_text} {PYTHON_OPERATORS[op]} {right_text})"
+
+
+def _variable(node):
+    """Nombre Python de la variable de una declaración, parámetro o uso"""
+    name = node[2] if node[0] in ('declaration', 'param') else node[1]
+    return f"{name}_{node.addr[1]}"
+
+
+def _signature(func):
+    if func[0] == 'function':
+        _, return_type, name, params_list, block_node = func
+        return name, return_type, params_list, block_node
+    return 'main', 'void', func[1], func[2]
+
+
+def transpile(ast):
+    return PythonTranspiler().transpile(ast)
+
+
+def compile_python(python_source):
+    """compile() del código generado, con caché por hash del código"""
+    key = hashlib.sha256(python_source.encode('utf-8')).hexdigest()
+    code = CODE_CACHE.get(key)
+    if code is None:
+        CACHE_STATS['misses'] += 1
+        code = CODE_CACHE[key] = compile(python_source, f"<evola:{key[:12]}>", 'exec')
+        while len(CODE_CACHE) > CODE_CACHE_SIZE:
+            CODE_CACHE.popitem(last=False)
+            CACHE_STATS['evictions'] += 1
+    else:
+        CACHE_STATS['hits'] += 1
+        CODE_CACHE.move_to_end(key)
+    return code
+
+
+def standalone_source(ast):
+    """Módulo .py independiente: ayudantes de Runtime, el programa y la llamada a main"""
+    helpers = "\n\n".join(inspect.getsource(function).replace(f"def {function.__name__}(", f"def {name}(", 1)
+                        for name, function in HELPERS.items())
+    return (f"# Generado por Transpiler.py (versión {TRANSPILER_VERSION})\n"
+            "import sys\n\n"
+            f"sys.setrecursionlimit(max(sys.getrecursionlimit(), {RECURSION_LIMIT}))\n"
+            "_write = sys.stdout.write\n\n\n"
+            f"{helpers}\n\n"
+            f"{transpile(ast)}\n"
+            "if __name__ == '__main__':\n"
+            "    fn_main()\n")
+
+
+class PythonProgram:
+    """Backend que ejecuta el programa traducido a Python"""
+    def __init__(self, code, out=None):
+        self.code = code
+        self.out = out if out is not None else sys.stdout
+
+    @classmethod
+    def from_ast(cls, ast, frame_sizes, out=None):
+        return cls(compile_python(transpile(ast)), out)
+
+    def run(self, name='main', args=()):
+        namespace = dict(HELPERS, _write=self.out.write)
+        exec(self.code, namespace)
+        try:
+            with recursion_limit(RECURSION_LIMIT):
+                return namespace[f"fn_{name}"](*args)
+        except ZeroDivisionError:
+            raise EvolaRuntimeError("División por cero") from None
+        except RecursionError:
+            raise EvolaRuntimeError("Recursión demasiado profunda") from None
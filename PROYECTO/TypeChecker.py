@@ -1,14 +1,55 @@
 # PROYECTO/TypeChecker.py
 
-class TypeChecker:
+from ASTNodes import is_node, BINARY_OPERATORS
+from Visitor import Visitor
+
+# Named operator tags (older AST format) -> operator symbol used by the parser
+OP_SYMBOLS = {
+    'plus': '+', 'minus': '-', 'times': '*', 'divide': '/', 'mod': '%',
+    'or': 'or', 'and': 'and',
+    'eq': '==', 'ne': '!=', 'lt': '<', 'gt': '>', 'le': '<=', 'ge': '>='
+}
+for _op in BINARY_OPERATORS:
+    OP_SYMBOLS.setdefault(_op, _op)
+
+ARITHMETIC_OPS = frozenset(('+', '-', '*', '/', '%'))
+COMPARISON_OPS = frozenset(('==', '!=', '<', '>', '<=', '>='))
+LOGICAL_OPS = frozenset(('and', 'or'))
+
+class TypeChecker(Visitor):
+    DISPATCH = {
+        'statement': {
+            'block': '_check_block',
+            'declaration': '_check_declaration',
+            'assignment': '_check_assignment',
+            'if': '_check_if',
+            'while': '_check_while',
+            'for': '_check_for',
+            'return': '_check_return',
+            'print': '_check_print',
+            'call': '_check_call_statement',
+        },
+        # Both the symbolic tags produced by the parser ('+') and the named ones ('plus')
+        'expression': dict(
+            {op: '_infer_binary' for op in OP_SYMBOLS},
+            number='_infer_number',
+            string='_infer_string',
+            bool='_infer_bool',
+            id='_infer_id',
+            call='_infer_call',
+        ),
+    }
+
     def __init__(self, symbol_table):
         self.symbol_table = symbol_table
         self.errors = []
+        self.located_errors = [] # (message, node) pairs; node carries (line, col) when parsed
         self.current_function_return_type = None
 
     def log_error(self, message, node=None):
         # print(f"Node: {node}") # For debugging
         self.errors.append(message)
+        self.located_errors.append((message, node))
 
     def check_program(self, node):
         if node[0] != 'program':
@@ -35,38 +76,10 @@ class TypeChecker:
         if node is None:
             return
 
-        if isinstance(node, tuple):
-            node_type = node[0]
-
-            if node_type == 'block':
-                # ('block', [statements])
-                # SymbolTable manages actual scope entry/exit. TypeChecker just processes statements.
-                for stmt in node[1]:
-                    self.check_node(stmt)
-            elif node_type == 'declaration':
-                # ('declaration', type_str, name_str, init_expr_node_or_None)
-                self._check_declaration(node)
-            elif node_type == 'assignment':
-                # ('assignment', name_str, expr_node)
-                self._check_assignment(node)
-            elif node_type == 'if':
-                # ('if', condition_expr_node, then_block_node, else_block_node_or_None)
-                self._check_if(node)
-            elif node_type == 'while':
-                # ('while', condition_expr_node, block_node)
-                self._check_while(node)
-            elif node_type == 'for':
-                # ('for', init_assign_node, condition_expr_node, update_assign_node, block_node)
-                self._check_for(node)
-            elif node_type == 'return':
-                # ('return', expr_node_or_None)
-                self._check_return(node)
-            elif node_type == 'print':
-                # ('print', expr_node)
-                self._check_print(node)
-            elif node_type == 'call':
-                # Function call used as a statement
-                self.infer_expression_type(node) # Infer to check args, return type not used here
+        if is_node(node):
+            handler = self.handler_for('statement', node)
+            if handler is not None:
+                handler(self, node)
             # Other expression nodes are handled by infer_expression_type when they are part of statements.
 
         elif isinstance(node, list): # Should not happen if blocks are handled correctly
@@ -74,6 +87,16 @@ class TypeChecker:
                 self.check_node(item)
         # Else: Literals or other simple nodes not requiring direct check_node actions.
 
+    def _check_block(self, block_node):
+        # ('block', [statements])
+        # SymbolTable manages actual scope entry/exit. TypeChecker just processes statements.
+        for stmt in block_node[1]:
+            self.check_node(stmt)
+
+    def _check_call_statement(self, call_node):
+        # Function call used as a statement
+        self.infer_expression_type(call_node) # Infer to check args, return type not used here
+
     def _check_declaration(self, decl_node):
         # ('declaration', declared_type_str, var_name_str, init_expr_node_or_None)
         _, declared_type, var_name, init_expr = decl_node
@@ -180,14 +203,9 @@ class TypeChecker:
 
 
     def _infer_binary_op_type(self, op, left_type, right_type, node):
-        op_map = {
-            'plus': '+', 'minus': '-', 'times': '*', 'divide': '/', 'mod': '%',
-            'or': 'or', 'and': 'and',
-            'eq': '==', 'ne': '!=', 'lt': '<', 'gt': '>', 'le': '<=', 'ge': '>='
-        }
-        symbol_op = op_map.get(op, op)
-
-        if symbol_op in ('+', '-', '*', '/', '%'):
+        symbol_op = OP_SYMBOLS.get(op, op)
+
+        if symbol_op in ARITHMETIC_OPS:
             if symbol_op == '+' and left_type == 'string' and right_type == 'string':
                 return 'string'
             if left_type == 'int' and right_type == 'int':
@@ -199,7 +217,7 @@ class TypeChecker:
             else:
                 self.log_error(f"Type mismatch: Cannot apply operator '{symbol_op}' to '{left_type}' and '{right_type}'.", node)
                 return 'error_type'
-        elif symbol_op in ('==', '!=', '<', '>', '<=', '>='):
+        elif symbol_op in COMPARISON_OPS:
             if (left_type in ('int', 'float') and right_type in ('int', 'float')) or \
                (left_type == 'string' and right_type == 'string') or \
                (left_type == 'bool' and right_type == 'bool'):
@@ -207,7 +225,7 @@ class TypeChecker:
             else:
                 self.log_error(f"Type mismatch: Cannot compare '{left_type}' and '{right_type}' with '{symbol_op}'.", node)
                 return 'error_type'
-        elif symbol_op in ('and', 'or'):
+        elif symbol_op in LOGICAL_OPS:
             if left_type == 'bool' and right_type == 'bool':
                 return 'bool'
             else:
@@ -221,72 +239,74 @@ class TypeChecker:
         if expr_node is None: # E.g. empty return statement
             return 'void'
 
-        node_type = expr_node[0]
+        handler = self.handler_for('expression', expr_node)
+        if handler is None:
+            self.log_error(f"Cannot infer type for unhandled expression node type: '{expr_node[0]}'.", expr_node)
+            return 'error_type'
+        return handler(self, expr_node)
 
-        if node_type == 'number':
-            if isinstance(expr_node[1], int):
-                return 'int'
-            elif isinstance(expr_node[1], float):
-                return 'float'
-            else:
-                self.log_error(f"Unknown number literal type: {expr_node[1]}", expr_node)
-                return 'error_type'
-        elif node_type == 'string':
-            return 'string'
-        elif node_type == 'bool':
-            return 'bool'
-        elif node_type == 'id':
-            var_name = expr_node[1]
-            var_info = self.symbol_table.lookup_variable(var_name)
-            if var_info:
-                return var_info['type']
-            else:
-                self.log_error(f"Undeclared variable '{var_name}'.", expr_node)
-                return 'error_type'
-        elif node_type in ('plus', 'minus', 'times', 'divide', 'mod', 'or', 'and', 'eq', 'ne', 'lt', 'gt', 'le', 'ge'):
-            op = node_type
-            left_expr = expr_node[1]
-            right_expr = expr_node[2]
+    def _infer_number(self, expr_node):
+        if isinstance(expr_node[1], int):
+            return 'int'
+        elif isinstance(expr_node[1], float):
+            return 'float'
+        else:
+            self.log_error(f"Unknown number literal type: {expr_node[1]}", expr_node)
+            return 'error_type'
 
-            left_type = self.infer_expression_type(left_expr)
-            if left_type == 'error_type': return 'error_type'
+    def _infer_string(self, expr_node):
+        return 'string'
 
-            right_type = self.infer_expression_type(right_expr)
-            if right_type == 'error_type': return 'error_type'
+    def _infer_bool(self, expr_node):
+        return 'bool'
 
-            return self._infer_binary_op_type(op, left_type, right_type, expr_node)
+    def _infer_id(self, expr_node):
+        var_name = expr_node[1]
+        var_info = self.symbol_table.lookup_variable(var_name)
+        if var_info:
+            return var_info['type']
+        else:
+            self.log_error(f"Undeclared variable '{var_name}'.", expr_node)
+            return 'error_type'
 
-        elif node_type == 'call':
-            func_name = expr_node[1]
-            arg_exprs = expr_node[2]
+    def _infer_binary(self, expr_node):
+        op, left_expr, right_expr = expr_node
 
-            func_info = self.symbol_table.lookup_function(func_name)
-            if not func_info:
-                self.log_error(f"Call to undefined function '{func_name}'.", expr_node)
-                return 'error_type'
+        left_type = self.infer_expression_type(left_expr)
+        if left_type == 'error_type': return 'error_type'
 
-            expected_param_count = len(func_info['params'])
-            actual_arg_count = len(arg_exprs)
-            if expected_param_count != actual_arg_count:
-                self.log_error(f"Function '{func_name}' expects {expected_param_count} arguments, but got {actual_arg_count}.", expr_node)
-                return 'error_type'
+        right_type = self.infer_expression_type(right_expr)
+        if right_type == 'error_type': return 'error_type'
 
-            param_types = [p[0] for p in func_info['params']]
-            for i, arg_expr in enumerate(arg_exprs):
-                arg_type = self.infer_expression_type(arg_expr)
-                if arg_type == 'error_type': return 'error_type'
+        return self._infer_binary_op_type(op, left_type, right_type, expr_node)
 
-                if i < len(param_types):
-                    expected_param_type = param_types[i]
-                    if not self.is_assignable(expected_param_type, arg_type):
-                        self.log_error(f"Type mismatch in argument {i+1} of function '{func_name}': Expected '{expected_param_type}', got '{arg_type}'.", arg_expr)
-                        return 'error_type'
-            return func_info['return_type']
+    def _infer_call(self, expr_node):
+        func_name = expr_node[1]
+        arg_exprs = expr_node[2]
 
-        else:
-            self.log_error(f"Cannot infer type for unhandled expression node type: '{node_type}'.", expr_node)
+        func_info = self.symbol_table.lookup_function(func_name)
+        if not func_info:
+            self.log_error(f"Call to undefined function '{func_name}'.", expr_node)
             return 'error_type'
 
+        expected_param_count = len(func_info['params'])
+        actual_arg_count = len(arg_exprs)
+        if expected_param_count != actual_arg_count:
+            self.log_error(f"Function '{func_name}' expects {expected_param_count} arguments, but got {actual_arg_count}.", expr_node)
+            return 'error_type'
+
+        param_types = [p[0] for p in func_info['params']]
+        for i, arg_expr in enumerate(arg_exprs):
+            arg_type = self.infer_expression_type(arg_expr)
+            if arg_type == 'error_type': return 'error_type'
+
+            if i < len(param_types):
+                expected_param_type = param_types[i]
+                if not self.is_assignable(expected_param_type, arg_type):
+                    self.log_error(f"Type mismatch in argument {i+1} of function '{func_name}': Expected '{expected_param_type}', got '{arg_type}'.", arg_expr)
+                    return 'error_type'
+        return func_info['return_type']
+
     def is_assignable(self, var_type, value_type):
         if var_type == value_type:
             return True
@@ -0,0 +1,205 @@
+import sys
+
+from Bytecode import (
+    LOAD, STORE, CONST, STORE_CONST, BINARY, BINARY_CONST, BINARY_LOAD, LOAD_BINARY_CONST,
+    LOAD_BINARY_LOAD, UPDATE, UPDATE_CONST, UPDATE_LOAD, ADD, ADD_CONST, APPEND, APPEND_CONST,
+    JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE, JUMP_IF_CONST, JUMP_UNLESS_CONST, JUMP_IF_LOAD, JUMP_UNLESS_LOAD,
+    JUMP_IF_SLOT, JUMP_UNLESS_SLOT, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP, CALL, RETURN, RETURN_LOAD, RETURN_DEFAULT, PRINT, POP, TO_INT, TO_FLOAT,
+    OPERANDS, OPERATORS, WIDTH, compile_program,
+)
+from Runtime import EvolaRuntimeError, format_value
+
+# Las llamadas no usan la pila de Python, así que el límite es sólo de memoria
+MAX_CALL_DEPTH = 100000
+
+
+def decode(program):
+    """Instrucciones listas para el bucle de despacho: una tupla (op, a, b, c, d)
+    por instrucción, con los operadores y las constantes ya resueltos a sus
+    valores. CALL lleva el código de la función llamada, su cantidad de
+    parámetros, las ranuras vacías que completan el marco y su valor por defecto.
+    """
+    codes = [[] for _ in program.functions]
+    for function, decoded in zip(program.functions, codes):
+        code = function.code
+        for at in range(0, len(code), WIDTH):
+            op = code[at]
+            operands = list(code[at + 1:at + WIDTH])
+            for i, kind in enumerate(OPERANDS.get(op, '')):
+                if kind == 'o':
+                    operands[i] = OPERATORS[operands[i]][1]
+                elif kind == 'k':
+                    operands[i] = program.constants[operands[i]]
+            if op == CALL:
+                callee = program.functions[operands[0]]
+                operands = [codes[operands[0]], callee.param_count,
+                            [None] * (callee.frame_size - callee.param_count), callee.default]
+            decoded.append((op, *operands))
+    return codes
+
+
+class VM:
+    """Máquina de pila que ejecuta un Program de Bytecode.
+
+    Un solo bucle de despacho: las llamadas guardan (código, pc, ranuras) del
+    llamador en una pila de marcos propia y continúan en el mismo bucle, en lugar
+    de recursar en Python. Los operandos viven en una sola pila de valores
+    compartida por todos los marcos. El código se decodifica una vez (ver
+    decode) y los códigos de operación se copian a variables locales, así cada
+    vuelta del bucle hace sólo una indexación y comparaciones entre locales.
+    """
+    def __init__(self, program, out=None):
+        self.program = program
+        self.out = out if out is not None else sys.stdout
+        self.codes = decode(program)
+
+    @classmethod
+    def from_ast(cls, ast, frame_sizes, out=None):
+        """Backend para Runner: compila el AST verificado y prepara la VM"""
+        return cls(compile_program(ast, frame_sizes), out)
+
+    def run(self, name='main', args=()):
+        """Ejecuta una función (main por defecto) y devuelve su valor"""
+        try:
+            return self._execute(self.program.index[name], args)
+        except ZeroDivisionError:
+            raise EvolaRuntimeError("División por cero") from None
+
+    def _execute(self, function_index, args):
+        (load, store, const, store_const, binary, binary_const, binary_load, load_binary_const, load_binary_load,
+         update, update_const, update_load, add, add_const, append, append_const,
+         jump, jump_if_false, jump_if_true, jump_if_const, jump_unless_const, jump_if_load,
+         jump_unless_load, jump_if_slot, jump_unless_slot, jump_if_false_or_pop, jump_if_true_or_pop,
+         call, return_, return_load, return_default) = (
+            LOAD, STORE, CONST, STORE_CONST, BINARY, BINARY_CONST, BINARY_LOAD, LOAD_BINARY_CONST, LOAD_BINARY_LOAD,
+            UPDATE, UPDATE_CONST, UPDATE_LOAD, ADD, ADD_CONST, APPEND, APPEND_CONST,
+            JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE, JUMP_IF_CONST, JUMP_UNLESS_CONST, JUMP_IF_LOAD,
+            JUMP_UNLESS_LOAD, JUMP_IF_SLOT, JUMP_UNLESS_SLOT, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP,
+            CALL, RETURN, RETURN_LOAD, RETURN_DEFAULT)
+        write = self.out.write
+
+        function = self.program.functions[function_index]
+        code = self.codes[function_index]
+        default = function.default
+        slots = list(args) + [None] * (function.frame_size - len(args))
+        pc = 0
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        frames = []
+        save = frames.append
+        restore = frames.pop
+        while True:
+            op, a, b, c, d = code[pc]
+            pc += 1
+            # Primero el grupo (ver Bytecode.OPCODES); dentro de cada grupo, las
+            # instrucciones más frecuentes van primero
+            if op < update:
+                if op == load_binary_const:
+                    push(b(slots[a], c))
+                elif op == load:
+                    push(slots[a])
+                elif op == store:
+                    slots[a] = pop()
+                elif op == store_const:
+                    slots[a] = b
+                elif op == binary_const:
+                    stack[-1] = a(stack[-1], b)
+                elif op == load_binary_load:
+                    push(b(slots[a], slots[c]))
+                elif op == binary:
+                    right = pop()
+                    stack[-1] = a(stack[-1], right)
+                elif op == const:
+                    push(a)
+                else:  # binary_load
+                    stack[-1] = a(stack[-1], slots[b])
+            elif op < jump:
+                if op == add_const:
+                    slots[a] += b
+                elif op == add:
+                    slots[a] += pop()
+                elif op == update_const:
+                    slots[a] = b(slots[a], c)
+                elif op == update_load:
+                    slots[a] = b(slots[a], slots[c])
+                elif op == update:
+                    slots[a] = b(slots[a], pop())
+                else:
+                    # La ranura se vacía antes de sumar: con una sola referencia,
+                    # Python agrega al final de la cadena en lugar de copiarla
+                    value = slots[a]
+                    slots[a] = None
+                    if op == append_const:
+                        value += b
+                    else:
+                        value += pop()
+                    slots[a] = value
+            elif op < call:
+                if op == jump_if_const:
+                    if b(slots[a], c):
+                        pc = d
+                elif op == jump_unless_const:
+                    if not b(slots[a], c):
+                        pc = d
+                elif op == jump_if_load:
+                    if b(slots[a], slots[c]):
+                        pc = d
+                elif op == jump_unless_load:
+                    if not b(slots[a], slots[c]):
+                        pc = d
+                elif op == jump_if_slot:
+                    if slots[a]:
+                        pc = d
+                elif op == jump_unless_slot:
+                    if not slots[a]:
+                        pc = d
+                elif op == jump:
+                    pc = d
+                elif op == jump_if_false:
+                    if not pop():
+                        pc = d
+                elif op == jump_if_true:
+                    if pop():
+                        pc = d
+                elif op == jump_if_false_or_pop:
+                    if stack[-1]:
+                        pop()
+                    else:
+                        pc = d
+                elif stack[-1]:  # jump_if_true_or_pop
+                    pc = d
+                else:
+                    pop()
+            elif op == call:
+                if len(frames) >= MAX_CALL_DEPTH:
+                    raise EvolaRuntimeError("Recursión demasiado profunda")
+                save((code, pc, slots, default))
+                code, default, pc = a, d, 0
+                if b:
+                    slots = stack[-b:]
+                    del stack[-b:]
+                    slots += c
+                else:
+                    slots = c[:]
+            elif op <= return_default:
+                if op == return_load:
+                    value = slots[a]
+                elif op == return_:
+                    value = pop()
+                else:
+                    value = default
+                if not frames:
+                    return value
+                code, pc, slots, default = restore()
+                push(value)
+            elif op == PRINT:
+                write(format_value(pop()) + "\n")
+            elif op == POP:
+                pop()
+            elif op == TO_INT:
+                stack[-1] = int(stack[-1])
+            elif op == TO_FLOAT:
+                stack[-1] = float(stack[-1])
+            else:
+                raise EvolaRuntimeError(f"Código de operación desconocido: {op}")
@@ -0,0 +1,28 @@
+from ASTNodes import KIND_NAMES
+
+
+class Visitor:
+    """Base de los recorridos del AST con despacho por tabla.
+
+    Cada subclase declara en DISPATCH sus tablas como
+    {nombre_de_tabla: {etiqueta_de_nodo: nombre_de_método}}. Al crear la clase se
+    resuelven una sola vez a funciones, indexadas por `kind` (para los nodos de
+    ASTNodes) y por etiqueta (para las tuplas del formato anterior).
+    """
+    DISPATCH = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        tables = {}
+        for table_name, mapping in cls.DISPATCH.items():
+            by_tag = {tag: getattr(cls, method_name) for tag, method_name in mapping.items()}
+            by_kind = tuple(by_tag.get(tag) for tag in KIND_NAMES)
+            tables[table_name] = (by_kind, by_tag)
+        cls._dispatch_tables = tables
+
+    def handler_for(self, table_name, node):
+        """Función que atiende a `node` en la tabla dada, o None"""
+        by_kind, by_tag = self._dispatch_tables[table_name]
+        if type(node) is tuple:
+            return by_tag.get(node[0])
+        return by_kind[node.kind]
@@ -0,0 +1,69 @@
+# PROYECTO/benchmarks/bench_ast_cache.py
+#
+# Compilar un corpus sin caché, con la caché vacía (guarda cada AST) y con la
+# caché llena (ningún archivo pasa por el lexer, el parser ni SemanticAnalyzer).
+# Las sesiones no optimizan, como las de BatchCompiler; la última línea muestra
+# cuánto agregaría el optimizador a la caché llena. También compara, para una
+# fuente grande, el parse contra load_ast.
+#
+#   python benchmarks/bench_ast_cache.py [--archivos 200] [--kilobytes 20]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_lexer import generate_source
+from ASTCache import ASTCache, dump_ast, load_ast
+from CompilerSession import CompilerSession
+
+
+def compile_all(sources, session):
+    start = time.perf_counter()
+    for source in sources:
+        assert session.compile(source).ok
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--archivos', type=int, default=200)
+    arg_parser.add_argument('--kilobytes', type=float, default=20)
+    args = arg_parser.parse_args()
+
+    # Fuentes distintas: cada una con su propio número en un comentario
+    base = generate_source(args.kilobytes / 1000)
+    sources = [f"// archivo {i}\n" + base for i in range(args.archivos)]
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ASTCache(directory)
+        plain = compile_all(sources, CompilerSession(optimize=False))
+        cold = compile_all(sources, CompilerSession(optimize=False, cache=cache))
+        warm = compile_all(sources, CompilerSession(optimize=False, cache=cache))
+        size = sum(entry.stat().st_size for entry in os.scandir(directory))
+        stats = cache.format_stats()
+        optimized = compile_all(sources, CompilerSession(cache=cache))
+        print(f"{args.archivos} archivos de {len(base) / 1000:.0f} KB")
+        print(f"sin caché     {plain:7.2f}s")
+        print(f"caché vacía   {cold:7.2f}s")
+        print(f"caché llena   {warm:7.2f}s  ({plain / warm:.1f}x)")
+        print(f"  optimizando {optimized:7.2f}s")
+        print(f"{stats}; {size / 1_000_000:.1f} MB en disco")
+
+    source = generate_source(1)
+    session = CompilerSession()
+    start = time.perf_counter()
+    ast = session.parse(source)
+    parse_seconds = time.perf_counter() - start
+    data = dump_ast(ast)
+    start = time.perf_counter()
+    load_ast(data)
+    load_seconds = time.perf_counter() - start
+    print(f"1 MB: parse {parse_seconds:.2f}s, load_ast {load_seconds:.2f}s "
+          f"({len(data) / 1_000_000:.1f} MB serializado)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# PROYECTO/benchmarks/bench_ast_memory.py
+#
+# Memoria de un programa de ~1M de nodos con tres representaciones del AST:
+# tuplas simples, tuplas con posición (la representación anterior, con __dict__)
+# y los nodos con __slots__ de ASTNodes.py.
+#
+#   python benchmarks/bench_ast_memory.py [--nodes 1000000]
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ASTNodes import node_at
+
+
+class LocatedTuple(tuple):
+    """Representación anterior: tupla con line/col en su __dict__"""
+
+
+def plain(pos, *fields):
+    return fields
+
+
+def located(pos, *fields):
+    node = LocatedTuple(fields)
+    node.line, node.col = pos
+    return node
+
+
+def build_program(make, statements):
+    """`x = x + i * 2;` repetido: 5 nodos por instrucción, como los arma el parser"""
+    body = []
+    for i in range(statements):
+        pos = (i + 3, 5)
+        product = make(pos, '*', make(pos, 'number', i), make(pos, 'number', 2))
+        body.append(make(pos, 'assignment', 'x', make(pos, '+', make(pos, 'id', 'x'), product)))
+    main = make((2, 6), 'main_function', [], make((2, 13), 'block', body))
+    return make((1, 1), 'program', [main])
+
+
+def measure(make, statements):
+    tracemalloc.start()
+    start = time.perf_counter()
+    ast = build_program(make, statements)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del ast
+    return size, elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--nodes', type=int, default=1000000)
+    args = arg_parser.parse_args()
+    statements = args.nodes // 5
+
+    print(f"{'representación':<22} {'MB':>9} {'bytes/nodo':>11} {'construcción (s)':>17}")
+    for name, make in (("tuplas simples", plain), ("tuplas con posición", located),
+                       ("nodos con __slots__", node_at)):
+        size, elapsed = measure(make, statements)
+        print(f"{name:<22} {size / 2**20:9.1f} {size / (statements * 5):11.1f} {elapsed:17.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# PROYECTO/benchmarks/bench_backends.py
+#
+# Ejecuta la misma batería de programas con cada backend de Runner.BACKENDS y
+# reporta operaciones por segundo. Una "operación" es la unidad de trabajo de
+# cada programa: una llamada en fib, una iteración del bucle interno en los
+# bucles anidados, una concatenación en la de cadenas.
+#
+# La referencia es 'tree', el intérprete de Runner.BACKENDS.
+#
+#   python benchmarks/bench_backends.py [--backends tree,vm] [--repeat 3] [--scale 1.0]
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Runner import BACKENDS, load_program
+
+
+def fib_program(n):
+    source = f"""
+    int fib(int n) {{
+        if (n < 2) {{ return n; }}
+        return fib(n - 1) + fib(n - 2);
+    }}
+    void main() {{ print(fib({n})); }}
+    """
+    calls = [1, 1]
+    for _ in range(2, n + 1):
+        calls.append(calls[-1] + calls[-2] + 1)
+    return source, calls[n]
+
+
+def loops_program(n):
+    source = f"""
+    void main() {{
+        int total = 0;
+        int i;
+        int j;
+        for (i = 0; i < {n}; i = i + 1) {{
+            for (j = 0; j < {n}; j = j + 1) {{
+                total = total + (i * j) % 7;
+            }}
+        }}
+        print(total);
+    }}
+    """
+    return source, n * n
+
+
+def concat_program(n):
+    source = f"""
+    void main() {{
+        string s = "";
+        int i = 0;
+        while (i < {n}) {{
+            s = s + "ab";
+            i = i + 1;
+        }}
+        print(s == "");
+    }}
+    """
+    return source, n
+
+
+def programs(scale):
+    return [
+        ("fib", *fib_program(int(20 + 4 * (scale - 1)))),
+        ("bucles anidados", *loops_program(int(300 * scale))),
+        ("concatenación", *concat_program(int(100000 * scale))),
+    ]
+
+
+def best_time(action, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--backends', default=','.join(BACKENDS))
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--scale', type=float, default=1.0)
+    args = arg_parser.parse_args()
+
+    print(f"{'programa':<17} {'backend':<8} {'tiempo':>9} {'ops/s':>14}  salida")
+    for name, source, ops in programs(args.scale):
+        outputs = {}
+        for backend in args.backends.split(','):
+            out = io.StringIO()
+            program, errors = load_program(source, backend, out=out)
+            assert not errors, [d.format() for d in errors]
+            seconds = best_time(program.run, args.repeat)
+            outputs[backend] = out.getvalue().split("\n")[0]
+            print(f"{name:<17} {backend:<8} {seconds:8.3f}s {ops / seconds:14,.0f}  {outputs[backend]}")
+        assert len(set(outputs.values())) == 1, f"Los backends difieren en {name}: {outputs}"
+
+
+if __name__ == '__main__':
+    main()
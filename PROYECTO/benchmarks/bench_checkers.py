@@ -0,0 +1,106 @@
+# PROYECTO/benchmarks/bench_checkers.py
+#
+# Nodos por segundo de ScopeChecker, TypeChecker y del análisis fusionado
+# (SemanticAnalyzer) sobre un programa generado.
+#
+#   python benchmarks/bench_checkers.py [--functions 200] [--statements 50] [--repeat 5]
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CompilerSession import CompilerSession
+from ScopeChecker import ScopeChecker, SymbolTable
+from TypeChecker import TypeChecker
+from SemanticAnalyzer import SemanticAnalyzer
+
+# Nombres de operadores que TypeChecker reconoce también en tuplas simples
+NAMED_OPERATORS = {'+': 'plus', '-': 'minus', '*': 'times', '/': 'divide', '%': 'mod',
+                   '==': 'eq', '!=': 'ne', '<': 'lt', '>': 'gt', '<=': 'le', '>=': 'ge'}
+
+
+def generate_source(functions, statements):
+    lines = []
+    for f in range(functions):
+        lines.append(f"int f{f}(int a, int b) {{")
+        lines.append("    int x = a;")
+        lines.append("    int y = b * 2;")
+        for i in range(statements):
+            lines.append(f"    x = x + {i} * y - (a % 3) / 2;")
+            lines.append(f"    if (x > {i} && y < x || a == b) {{ print(x + y); }}")
+        lines.append("    return x;")
+        lines.append("}")
+    lines.append("void main() { int r = f0(1, 2); print(r); }")
+    return "\n".join(lines)
+
+
+def count_nodes(node):
+    if isinstance(node, list):
+        return sum(count_nodes(child) for child in node)
+    if isinstance(node, tuple) or hasattr(node, 'as_tuple'):
+        return 1 + sum(count_nodes(child) for child in list(node)[1:])
+    return 0
+
+
+def with_named_operators(node):
+    """Tupla simple con operadores por nombre ('plus', ...), válida antes y después"""
+    if isinstance(node, list):
+        return [with_named_operators(child) for child in node]
+    if isinstance(node, tuple) or hasattr(node, 'as_tuple'):
+        items = list(node)
+        return (NAMED_OPERATORS.get(items[0], items[0]),) + tuple(with_named_operators(c) for c in items[1:])
+    return node
+
+
+def best_time(action, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--functions', type=int, default=200)
+    arg_parser.add_argument('--statements', type=int, default=50)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    ast = CompilerSession().parse(generate_source(args.functions, args.statements))
+    nodes = count_nodes(ast)
+
+    def run_scope():
+        ScopeChecker(verbose=False).check_program(ast)
+
+    tuple_ast = with_named_operators(ast)
+    symbols = SymbolTable()
+    for name in ('x', 'y', 'a', 'b', 'r'):
+        symbols.add_variable(name, 'int')
+    for f in range(args.functions):
+        symbols.add_function(f"f{f}", [('int', 'a'), ('int', 'b')], 'int')
+    symbols.add_function('main', [], 'void')
+
+    def run_types():
+        checker = TypeChecker(symbols)
+        checker.check_program(tuple_ast)
+        assert not checker.get_errors(), checker.get_errors()[:3]
+
+    def run_fused():
+        analyzer = SemanticAnalyzer()
+        analyzer.check_program(ast)
+        assert not analyzer.scope_errors and not analyzer.get_errors()
+
+    print(f"Nodos en el AST: {nodes}")
+    for name, action in (("ScopeChecker", run_scope), ("TypeChecker", run_types),
+                         ("Fusionado", run_fused)):
+        seconds = best_time(action, args.repeat)
+        print(f"{name:<13} {seconds:8.3f} s  {nodes / seconds:12,.0f} nodos/s")
+
+
+if __name__ == '__main__':
+    main()
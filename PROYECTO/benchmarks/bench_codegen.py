@@ -0,0 +1,51 @@
+# PROYECTO/benchmarks/bench_codegen.py
+#
+# Asignación de registros por barrido lineal sobre los programas de
+# bench_backends y bench_loops, con bancos de registros de distintos tamaños:
+# registros virtuales derramados y ld/st emitidos (estático), y ciclos e
+# instrucciones simuladas y accesos al marco de Machine (dinámico).
+#
+#   python benchmarks/bench_codegen.py [--registers 3,4,6,8,16] [--scale 0.3]
+
+import argparse
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_backends import programs as backend_programs
+from bench_loops import programs as loop_programs
+from Codegen import compile_to_assembly
+from CompilerSession import CompilerSession
+from Machine import Machine, assemble
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--registers', default='3,4,6,8,16')
+    arg_parser.add_argument('--scale', type=float, default=0.3)
+    args = arg_parser.parse_args()
+
+    print(f"{'programa':<17} {'regs':>4} {'derram.':>7} {'ld+st':>6} {'ciclos':>12} "
+          f"{'instr.':>12} {'marco':>10}  salida")
+    for name, source, _ in backend_programs(args.scale) + loop_programs(args.scale):
+        result = CompilerSession().compile(source)
+        assert result.ok, [d.format() for d in result.errors]
+        outputs = set()
+        for registers in map(int, args.registers.split(',')):
+            assembly = compile_to_assembly(result.ast, result.frame_sizes, registers)
+            out = io.StringIO()
+            machine = Machine(assemble(assembly.text), out)
+            machine.run()
+            outputs.add(out.getvalue())
+            spill_code = sum(r.loads + r.stores for r in assembly.reports)
+            print(f"{name:<17} {registers:>4} {assembly.spills:>7} {spill_code:>6} "
+                  f"{machine.cycles:>12,} {machine.executed:>12,} {machine.frame_accesses:>10,}  "
+                  f"{out.getvalue().split(chr(10))[0]}")
+        assert len(outputs) == 1, f"La salida cambia con los registros en {name}"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# PROYECTO/benchmarks/bench_grammar.py
+#
+# Compara la gramática recursiva por la derecha (Parser.py) con la recursiva por
+# la izquierda (LeftParser.py) sobre funciones con muchas instrucciones.
+#
+#   python benchmarks/bench_grammar.py [--sizes 10000,20000,...] [--right-max N]
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Lexer import lexer
+import Parser
+import LeftParser
+
+
+def generate_source(statements):
+    """Genera un main con `statements` asignaciones y una llamada con muchos argumentos"""
+    lines = ["int suma(int a, int b) { return a + b; }", "void main() {", "    int x = 0;"]
+    for i in range(statements):
+        lines.append(f"    x = x + {i} * 2 - suma(x, {i});")
+    lines.append("    print(x);")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def time_parse(parser, source):
+    lexer.input(source)
+    lexer.lineno = 1
+    start = time.perf_counter()
+    ast = parser.parse(lexer=lexer)
+    return time.perf_counter() - start, ast
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--sizes', default='10000,20000,50000,100000')
+    arg_parser.add_argument('--right-max', type=int, default=50000,
+                            help="tamaño máximo para la gramática recursiva por la derecha")
+    args = arg_parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(',')]
+
+    print(f"{'instrucciones':>14} {'derecha (s)':>12} {'izquierda (s)':>14} {'izq. us/instr':>14}")
+    for n in sizes:
+        source = generate_source(n)
+        left_time, left_ast = time_parse(LeftParser.parser, source)
+        if n <= args.right_max:
+            right_time, right_ast = time_parse(Parser.parser, source)
+            assert right_ast == left_ast, "Los AST de ambas gramáticas difieren"
+            right_col = f"{right_time:12.3f}"
+        else:
+            right_col = f"{'-':>12}"
+        print(f"{n:>14} {right_col} {left_time:14.3f} {left_time / n * 1e6:14.2f}")
+
+
+if __name__ == '__main__':
+    main()
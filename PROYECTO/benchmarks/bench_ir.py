@@ -0,0 +1,59 @@
+# PROYECTO/benchmarks/bench_ir.py
+#
+# Tiempo de construcción del grafo de flujo y de la forma SSA por fase sobre
+# programas generados de tamaño creciente, para comprobar que cada fase crece
+# de forma lineal con el número de instrucciones.
+#
+#   python benchmarks/bench_ir.py [--sizes 25,50,100,200] [--repeat 3]
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CompilerSession import CompilerSession
+from IR import build_ir
+
+
+def generate_source(statements):
+    """Una función con `statements` grupos de if/else y bucles anidados"""
+    lines = ["int f(int a, int b) {", "    int x = a;", "    int y = b;", "    int i;"]
+    for k in range(statements):
+        lines.append(f"    if (x > {k} && y < x) {{ x = x + y; }} else {{ int t = y; y = t * 2; }}")
+        lines.append(f"    for (i = 0; i < {k % 5 + 1}; i = i + 1) {{")
+        lines.append(f"        while (y > x) {{ y = y - {k + 1}; }}")
+        lines.append("    }")
+    lines.append("    return x + y;")
+    lines.append("}")
+    lines.append("void main() { print(f(1, 2)); }")
+    return "\n".join(lines)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--sizes', default='25,50,100,200')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    phases = ['grafo', 'dominadores', 'fronteras', 'phi', 'renombrado']
+    print(f"{'grupos':>7} {'instr.':>8} " + " ".join(f"{phase:>12}" for phase in phases) +
+          f" {'instr./s':>12}")
+    for size in map(int, args.sizes.split(',')):
+        # Sin optimizar, para medir el programa completo
+        result = CompilerSession(optimize=False).compile(generate_source(size))
+        assert result.ok, [d.format() for d in result.errors]
+        best = None
+        for _ in range(args.repeat):
+            module = build_ir(result.ast, result.frame_sizes)
+            if best is None or sum(module.timings.values()) < sum(best.timings.values()):
+                best = module
+        instructions = sum(f.instruction_count() for f in best.functions)
+        total = sum(best.timings.values())
+        print(f"{size:>7} {instructions:>8} " +
+              " ".join(f"{best.timings[phase] * 1000:10.2f}ms" for phase in phases) +
+              f" {instructions / total:12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
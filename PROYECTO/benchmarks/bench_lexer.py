@@ -0,0 +1,107 @@
+# PROYECTO/benchmarks/bench_lexer.py
+#
+# Velocidad del análisis léxico en MB/s sobre fuentes de varios megabytes:
+# ply.lex (el lexer de Lexer.py, un LexToken por token) contra FastLexer
+# (expresión maestra y arreglos paralelos), y el parser completo con cada uno.
+#
+#   python benchmarks/bench_lexer.py [--megabytes 1,4] [--repeat 3] [--no-parse]
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CompilerSession import CompilerSession
+from Diagnostics import DiagnosticCollector
+from FastLexer import TokenStream, tokenize
+from Lexer import lexer
+
+
+def generate_source(megabytes):
+    """Funciones con comentarios, cadenas, números y operadores hasta el tamaño pedido"""
+    function = """
+/* Función {k}: suma ponderada
+   con un comentario de bloque de varias líneas */
+int calcula_{k}(int a, float peso) {{
+    int total = 0; // acumulador
+    int i;
+    for (i = 0; i < a; i = i + 1) {{
+        if (i % 3 == 0 && total <= 1000 || i != {k}) {{ total = total + i * 2; }}
+        else {{ total = total - 1; }}
+    }}
+    float escala = peso * 2.5 + {k}.75;
+    print("resultado de calcula_{k}: \\"ok\\"");
+    return total;
+}}
+"""
+    parts, size, k = [], 0, 0
+    while size < megabytes * 1_000_000:
+        text = function.format(k=k)
+        parts.append(text)
+        size += len(text)
+        k += 1
+    parts.append("void main() { print(calcula_0(10, 1.5)); }\n")
+    return "".join(parts)
+
+
+def ply_tokens(source):
+    lx = lexer.clone()
+    lx.diagnostics = DiagnosticCollector()
+    lx.input(source)
+    count = 0
+    for _ in iter(lx.token, None):
+        count += 1
+    return count
+
+
+def fast_tokens(source):
+    return len(tokenize(source))
+
+
+def fast_stream(source):
+    count = 0
+    for _ in TokenStream(tokenize(source)):
+        count += 1
+    return count
+
+
+def best_time(action, source, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = action(source)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--megabytes', default='1,4')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--no-parse', action='store_true')
+    args = arg_parser.parse_args()
+
+    variants = [
+        ("ply.lex", ply_tokens),
+        ("FastLexer (arreglos)", fast_tokens),
+        ("FastLexer + TokenStream", fast_stream),
+    ]
+    if not args.no_parse:
+        variants += [
+            ("parser con ply.lex", lambda source: CompilerSession().parse(source) is not None),
+            ("parser con FastLexer",
+             lambda source: CompilerSession(fast_lexer=True).parse(source) is not None),
+        ]
+    print(f"{'MB':>5} {'variante':<26} {'tiempo':>9} {'MB/s':>8}  resultado")
+    for megabytes in map(float, args.megabytes.split(',')):
+        source = generate_source(megabytes)
+        size = len(source.encode('utf-8')) / 1_000_000
+        for name, action in variants:
+            seconds, result = best_time(action, source, args.repeat)
+            print(f"{size:5.1f} {name:<26} {seconds:8.3f}s {size / seconds:8.2f}  {result}")
+
+
+if __name__ == '__main__':
+    main()
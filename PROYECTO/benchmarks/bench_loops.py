@@ -0,0 +1,128 @@
+# PROYECTO/benchmarks/bench_loops.py
+#
+# Efecto de CodeMotion (invariantes de bucle y subexpresiones comunes) sobre
+# programas con muchos bucles: instrucciones de la representación intermedia,
+# en total y dentro de bucles, y tiempo de ejecución con cada backend, antes y
+# después de la pasada. Las dos versiones se compilan sin las demás
+# optimizaciones, para medir sólo esta.
+#
+#   python benchmarks/bench_loops.py [--backends tree,vm,python] [--repeat 3] [--scale 1.0]
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CodeMotion import CodeMotion
+from CompilerSession import CompilerSession
+from IR import build_ir
+from Resolver import Resolver
+from Runner import BACKENDS
+from SSA import natural_loops
+
+
+def matrix_program(n):
+    # Como los for anidados de Ejemplos.txt, con operandos que no cambian dentro
+    source = f"""
+    void main() {{
+        int n = {n};
+        int escala = 3;
+        int total = 0;
+        int i;
+        int j;
+        for (i = 0; i < n; i = i + 1) {{
+            for (j = 0; j < n * 2 - n; j = j + 1) {{
+                total = total + (i * n + j) % 7 + escala * n - (escala + n) * 2;
+                total = total - (escala * n - (escala + n) * 2);
+            }}
+        }}
+        print(total);
+    }}
+    """
+    return source, n * n
+
+
+def polynomial_program(n):
+    source = f"""
+    float evaluar(float x, int veces) {{
+        float suma = 0.0;
+        float a = 1.5;
+        float b = 2.5;
+        int k = 0;
+        while (k < veces) {{
+            suma = suma + (a * x * x + b * x + a * b) * (a * x * x + b * x + a * b) / (a + b);
+            k = k + 1;
+        }}
+        return suma;
+    }}
+    void main() {{ print(evaluar(0.5, {n})); }}
+    """
+    return source, n
+
+
+def programs(scale):
+    return [
+        ("for anidados", *matrix_program(int(200 * scale))),
+        ("polinomio", *polynomial_program(int(50000 * scale))),
+    ]
+
+
+def compile_variant(source, motion):
+    result = CompilerSession(optimize=False).compile(source)
+    assert result.ok, [d.format() for d in result.errors]
+    if motion:
+        CodeMotion().optimize_program(result.ast)
+        result.frame_sizes = Resolver().resolve_program(result.ast)
+    return result
+
+
+def instruction_counts(result):
+    total = in_loops = 0
+    for function in build_ir(result.ast, result.frame_sizes).functions:
+        total += function.instruction_count()
+        members = set().union(*natural_loops(function).values()) if function.blocks else set()
+        for index in members:
+            block = function.blocks[index]
+            in_loops += len(block.phis) + len(block.instrs) + 1
+    return total, in_loops
+
+
+def best_time(action, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--backends', default=','.join(BACKENDS))
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--scale', type=float, default=1.0)
+    args = arg_parser.parse_args()
+
+    for name, source, ops in programs(args.scale):
+        before, after = compile_variant(source, False), compile_variant(source, True)
+        (total_before, loops_before), (total_after, loops_after) = \
+            instruction_counts(before), instruction_counts(after)
+        print(f"{name}: instrucciones IR {total_before} -> {total_after}, "
+              f"dentro de bucles {loops_before} -> {loops_after}")
+        for backend in args.backends.split(','):
+            times, outputs = [], []
+            for result in (before, after):
+                out = io.StringIO()
+                program = BACKENDS[backend](result.ast, result.frame_sizes, out=out)
+                times.append(best_time(program.run, args.repeat))
+                outputs.append(out.getvalue().split("\n")[0])
+            assert outputs[0] == outputs[1], f"{name}/{backend}: {outputs}"
+            print(f"  {backend:<8} {times[0]:8.3f}s -> {times[1]:8.3f}s  "
+                  f"(x{times[0] / times[1]:.2f}, {ops / times[1]:,.0f} iteraciones/s)  {outputs[1]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# PROYECTO/benchmarks/bench_stream.py
+#
+# Memoria máxima (tracemalloc) y tiempo al tokenizar y al analizar una fuente
+# generada de varios megabytes: leyéndola entera en un str contra leerla por
+# partes desde un archivo mapeado en memoria (SourceStream.py). En el análisis
+# completo la mayor parte de la memoria es el AST, que se construye igual.
+#
+#   python benchmarks/bench_stream.py [--megabytes 8] [--chunk-kb 1024] [--no-parse]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_lexer import generate_source
+from CompilerSession import CompilerSession
+from FastLexer import tokenize
+from SourceStream import ChunkedTokenStream
+
+
+def read_and_tokenize(path, chunk_size):
+    with open(path, encoding='utf-8') as f:
+        return len(tokenize(f.read()))
+
+
+def stream_tokens(path, chunk_size):
+    count = 0
+    for _ in ChunkedTokenStream.from_file(path, chunk_size=chunk_size):
+        count += 1
+    return count
+
+
+def read_and_parse(path, chunk_size):
+    with open(path, encoding='utf-8') as f:
+        return CompilerSession().parse(f.read()) is not None
+
+
+def parse_file(path, chunk_size):
+    return CompilerSession().parse_file(path, chunk_size) is not None
+
+
+def measure(action, path, chunk_size):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = action(path, chunk_size)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--megabytes', type=float, default=8)
+    arg_parser.add_argument('--chunk-kb', type=int, default=1024)
+    arg_parser.add_argument('--no-parse', action='store_true')
+    args = arg_parser.parse_args()
+
+    variants = [("str + tokenize", read_and_tokenize), ("por partes (tokens)", stream_tokens)]
+    if not args.no_parse:
+        variants += [("str + parse", read_and_parse), ("parse_file", parse_file)]
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', encoding='utf-8', delete=False) as f:
+        f.write(generate_source(args.megabytes))
+        path = f.name
+    try:
+        size = os.path.getsize(path) / 1_000_000
+        print(f"Fuente de {size:.1f} MB, pedazos de {args.chunk_kb} KB")
+        print(f"{'variante':<22} {'tiempo':>9} {'pico MB':>9}  resultado")
+        for name, action in variants:
+            seconds, peak, result = measure(action, path, args.chunk_kb * 1024)
+            print(f"{name:<22} {seconds:8.2f}s {peak / 1_000_000:9.1f}  {result}")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# PROYECTO/benchmarks/bench_token_dump.py
+#
+# Tamaño y costo del registro de tokens: la traza de texto de siempre
+# (trace_parse tokeniza otra vez con un lexer clonado y save_trace_to_file
+# escribe cinco líneas por token) contra el volcado binario de TokenDump,
+# armado en la misma pasada del parser. Los tiempos no incluyen el parse.
+# Las líneas de la traza de texto se desvían después de cada comentario de
+# bloque (t_COMMENT no cuenta sus saltos de línea); las del volcado salen del
+# índice de líneas, como las de los diagnósticos.
+#
+#   python benchmarks/bench_token_dump.py [--megabytes 1] [--repeat 3]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_lexer import generate_source
+from ASTBuilder import ASTBuilder
+from CompilerSession import CompilerSession
+from Diagnostics import DiagnosticCollector
+from Lexer import lexer
+from TokenDump import TokenDump, format_trace, read_dump
+
+
+def text_trace(source, path):
+    builder = ASTBuilder()
+    trace_lexer = lexer.clone()
+    trace_lexer.diagnostics = DiagnosticCollector()
+    trace_lexer.input(source)
+    builder.parse_trace = [{'type': tok.type, 'value': tok.value, 'lineno': tok.lineno,
+                            'lexpos': tok.lexpos} for tok in iter(trace_lexer.token, None)]
+    builder.save_trace_to_file(path)
+
+
+class TokenList(list):
+    record = list.append
+
+
+def best_time(action, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--megabytes', type=float, default=1)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    source = generate_source(args.megabytes)
+    session = CompilerSession()
+    directory = tempfile.mkdtemp()
+    text_path = os.path.join(directory, 'parse_trace.txt')
+    dump_path = os.path.join(directory, 'parse_trace.evtk')
+
+    text_seconds = best_time(lambda: text_trace(source, text_path), args.repeat)
+    # Los tokens tal como los lee el parser, para medir sólo lo que cuesta registrarlos
+    tokens = TokenList()
+    session.parse(source, trace=tokens)
+    dumps = []
+
+    def dump_tokens():
+        dump = TokenDump()
+        for tok in tokens:
+            dump.record(tok)
+        dump.save(dump_path)
+        dumps.append(dump)
+    dump_seconds = best_time(dump_tokens, args.repeat)
+
+    text_size = os.path.getsize(text_path)
+    dump_size = os.path.getsize(dump_path)
+    with open(dump_path, 'rb') as f:
+        start = time.perf_counter()
+        text = format_trace(read_dump(f.read()))
+        read_seconds = time.perf_counter() - start
+    print(f"Fuente de {len(source) / 1_000_000:.1f} MB, {dumps[-1].count} tokens")
+    print(f"traza de texto   {text_size / 1_000_000:8.2f} MB  {text_seconds:7.3f}s")
+    print(f"volcado binario  {dump_size / 1_000_000:8.2f} MB  {dump_seconds:7.3f}s")
+    print(f"{text_size / dump_size:.0f} veces más chico; pasarlo a texto toma {read_seconds:.3f}s "
+          f"({len(text.encode('utf-8')) / 1_000_000:.2f} MB)")
+    for path in (text_path, dump_path):
+        os.unlink(path)
+    os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,8 +3,7 @@ import os
 from Lexer import lexer
 from Parser import parser
 from ASTBuilder import ASTBuilder
-from ScopeChecker import ScopeChecker
-from TypeChecker import TypeChecker # Import the new TypeChecker
+from SemanticAnalyzer import SemanticAnalyzer # Scope and type checking in one traversal
 
 # Global constants for file paths
 ARCHIVO_ENTRADA = "codigo.txt"
@@ -12,9 +11,9 @@ ARCHIVO_TOKENS = "salida/tokens.txt"
 ARCHIVO_ERRORES_LEXICOS = "salida/errores_lexicos.txt"
 ARCHIVO_ERRORES_SINTACTICOS = "salida/errores_sintacticos.txt"
 AST_OUTPUT_FILE = "salida/ast.txt"
-PARSE_TRACE_OUTPUT_FILE = "salida/parse_trace.txt"
+PARSE_TRACE_OUTPUT_FILE = "salida/parse_trace.evtk" # Binary token dump; read it with `main.py tokens`
 SCOPE_ERRORS_FILE = "salida/errores_ambito.txt"
-TYPE_ERRORS_FILE = "salida/errores_tipo.txt" # For TypeChecker errors
+TYPE_ERRORS_FILE = "salida/errores_tipo.txt" # For type errors (SemanticAnalyzer)
 
 # Setup: Create 'salida' directory if it doesn't exist
 # This is better done once at the start of main or test_compiler_stages
@@ -163,7 +162,7 @@ def test_compiler_stages():
         builder = ASTBuilder(
             lexer_error_file=g_err_lex_file,
             parser_error_file=g_err_sin_file,
-            parser_trace_file=os.path.join(salida_dir, f"parse_trace_{name.replace(' ', '_')}.txt")
+            parser_trace_file=os.path.join(salida_dir, f"parse_trace_{name.replace(' ', '_')}.evtk")
         )
         ast = builder.build_ast(code)
         # builder.ast_to_file(os.path.join(salida_dir, f"ast_{name.replace(' ', '_')}.txt"))
@@ -176,24 +175,26 @@ def test_compiler_stages():
             continue
         print("✅ AST construido exitosamente.")
 
-        # 2. Scope Checking
-        scope_checker = ScopeChecker(error_file=g_scope_err_file)
+        # 2. Scope Checking (the same traversal also infers types, reported in step 3)
+        analyzer = SemanticAnalyzer(verbose=True)
         actual_scope_error_occurred = False
-        scope_error_messages = [] # ScopeChecker might log multiple errors
+        scope_error_messages = [] # The analyzer keeps going after a scope error
+        analysis_exception_message = ""
 
         try:
-            scope_checker.check_program(ast)
-            scope_error_messages = scope_checker.get_errors() # Assuming ScopeChecker has get_errors()
+            analyzer.check_program(ast)
+            scope_error_messages = analyzer.get_scope_errors()
             if not scope_error_messages:
                 print("✅ Verificación de ámbito completada sin errores reportados por el checker.")
             else:
                 actual_scope_error_occurred = True
-                print(f"⚠️ Errores de ámbito detectados por ScopeChecker:")
+                print(f"⚠️ Errores de ámbito detectados por SemanticAnalyzer:")
                 for err_msg in scope_error_messages: print(f"   - {err_msg}")
 
         except Exception as e_scope:
             actual_scope_error_occurred = True
-            scope_error_messages.append(f"Excepción inesperada en ScopeChecker: {type(e_scope).__name__}: {str(e_scope)}")
+            analysis_exception_message = f"Excepción inesperada en SemanticAnalyzer: {type(e_scope).__name__}: {str(e_scope)}"
+            scope_error_messages.append(analysis_exception_message)
             print(f"❌ {scope_error_messages[-1]}")
             overall_success = False
 
@@ -212,26 +213,20 @@ def test_compiler_stages():
                 print(f"✅ Prueba de ámbito pasada: No se esperaban errores de ámbito y ninguno ocurrió.")
 
         # 3. Type Checking
-        type_checker = TypeChecker(scope_checker.symbol_table)
+        # Types were inferred in the same traversal as scopes, with the right scope
+        # active at every use; here we only report them.
+        # The `expect_type_error` flag will determine if these are "good" errors.
         actual_type_errors_reported = []
         type_check_exception_message = ""
 
-        # Only run type checker if no scope errors were expected OR if they were expected but didn't prevent symbol table use
-        # This logic can be refined: if critical scope errors occurred, type checking might be meaningless.
-        # For now, run if scope check passed OR if scope errors were expected (implying AST might still be checkable)
-        # A more robust check: if actual_scope_error_occurred AND not expect_scope_error, then maybe skip.
-
-        # Let's always run TypeChecker if AST is available and ScopeChecker ran,
-        # as TypeChecker might find errors due to incomplete symbol table from scope errors.
-        # The `expect_type_error` flag will determine if these are "good" errors.
-
         try:
-            type_checker.check_program(ast)
-            actual_type_errors_reported = type_checker.get_errors()
+            if analysis_exception_message:
+                raise RuntimeError(analysis_exception_message)
+            actual_type_errors_reported = analyzer.get_errors()
             if not actual_type_errors_reported:
                 print("✅ Verificación de tipo completada sin errores reportados por el checker.")
             else:
-                print(f"⚠️ Errores de tipo detectados por TypeChecker:")
+                print(f"⚠️ Errores de tipo detectados por SemanticAnalyzer:")
                 with open(g_type_err_file, "a") as f: # Append to global type error log
                     f.write(f"--- Test Case: {name} ---\n")
                     for error_msg in actual_type_errors_reported:
@@ -240,7 +235,7 @@ def test_compiler_stages():
                     f.write("\n")
 
         except Exception as e_type_check:
-            type_check_exception_message = f"Excepción inesperada en TypeChecker: {type(e_type_check).__name__}: {str(e_type_check)}"
+            type_check_exception_message = f"Excepción inesperada en el análisis de tipos: {type(e_type_check).__name__}: {str(e_type_check)}"
             print(f"❌ {type_check_exception_message}")
             actual_type_errors_reported.append(type_check_exception_message) # Add exception to errors
             overall_success = False
@@ -273,15 +268,33 @@ def test_compiler_stages():
 if __name__ == "__main__":
     project_root = os.path.dirname(__file__) # PROYECTO
 
-    parsetab_file = os.path.join(project_root, "parsetab.py")
-    parser_out_file = os.path.join(project_root, "parser.out")
-
-    if os.path.exists(parsetab_file):
-        try: os.remove(parsetab_file)
-        except OSError as e: print(f"Could not remove {parsetab_file}: {e}")
-    if os.path.exists(parser_out_file):
-        try: os.remove(parser_out_file)
-        except OSError as e: print(f"Could not remove {parser_out_file}: {e}")
+    # Las tablas LALR ya no se borran en cada ejecución: TableCache las guarda en la
+    # caché del usuario y sólo las regenera cuando cambia la gramática.
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        # python main.py batch <archivos|directorios|globs> [-j N] [--reporte archivo]
+        #     [--cache [directorio]]
+        from BatchCompiler import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+
+    if len(sys.argv) > 1 and sys.argv[1] == "run":
+        # python main.py run <archivo|archivo.evbc|archivo.evasm> [--backend tree|vm|python|asm]
+        #     [--emit-bytecode salida.evbc] [--emit-python salida.py]
+        #     [--emit-ir salida.ir] [--emit-asm salida.evasm] [--registros N]
+        #     [--ciclos] [--avisos] [--lexer-rapido]
+        from Runner import main as run_main
+        sys.exit(run_main(sys.argv[2:]))
+
+    if len(sys.argv) > 1 and sys.argv[1] == "tokens":
+        # python main.py tokens <volcado.evtk> [-o salida.txt]
+        from TokenDump import main as tokens_main
+        sys.exit(tokens_main(sys.argv[2:]))
+
+    if "--startup" in sys.argv:
+        from TableCache import measure_startup
+        tiempos = measure_startup()
+        print(f"Arranque en frío: {tiempos['cold'] * 1000:.1f} ms")
+        print(f"Arranque en caliente: {tiempos['warm'] * 1000:.1f} ms")
+        sys.exit(0)
 
     # Clear global log files at the start of the entire test suite run
     # These files will now accumulate errors from all test cases in this run.
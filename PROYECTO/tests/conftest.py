@@ -0,0 +1,10 @@
+# PROYECTO/tests/conftest.py
+
+# Los módulos del compilador se importan entre sí sin prefijo de paquete
+# (p. ej. `from Lexer import lexer`), así que PROYECTO debe estar en sys.path.
+import os
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
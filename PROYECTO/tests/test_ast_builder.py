@@ -0,0 +1,39 @@
+# PROYECTO/tests/test_ast_builder.py
+
+from ASTBuilder import ASTBuilder
+from CompilerSession import CompilerSession
+from FastLexer import tokenize
+from TokenDump import load_dump
+from tests.test_interpreter import PROGRAM
+
+COMMENTED = "/* dos\n líneas */\nvoid main() {\n  print(1);\n}\n"
+
+
+def test_trace_and_ast_come_from_a_single_parse(monkeypatch):
+    builder = ASTBuilder()
+    calls = []
+    parse = builder.session.parser.parse
+    monkeypatch.setattr(builder.session.parser, 'parse',
+                        lambda *args, **kwargs: calls.append(1) or parse(*args, **kwargs))
+    trace = builder.trace_parse(PROGRAM)
+    assert len(calls) == 1
+    assert builder.ast == CompilerSession().parse(PROGRAM)
+
+    tokens = tokenize(PROGRAM)
+    assert [tok['type'] for tok in trace] == [tokens.type_name(i) for i in range(len(tokens))]
+    assert [tok['lexpos'] for tok in trace] == list(tokens.offsets)
+
+
+def test_trace_lines_count_block_comments():
+    trace = ASTBuilder().trace_parse(COMMENTED)
+    assert [(tok['value'], tok['lineno']) for tok in trace[:2]] == [('void', 3), ('main', 3)]
+    assert trace[-1]['lineno'] == 5
+
+
+def test_build_ast_saves_a_token_dump(tmp_path):
+    path = tmp_path / "parse_trace.evtk"
+    builder = ASTBuilder(parser_trace_file=str(path))
+    assert builder.build_ast(PROGRAM) == CompilerSession().parse(PROGRAM)
+    trace = ASTBuilder().trace_parse(PROGRAM)
+    assert load_dump(str(path)) == [(tok['type'], tok['value'], tok['lineno'], tok['lexpos']) for tok in trace]
+    assert builder.token_dump.count == len(trace)
@@ -0,0 +1,137 @@
+# PROYECTO/tests/test_ast_cache.py
+
+import io
+import os
+
+import pytest
+
+import ASTCache as ast_cache_module
+from ASTCache import ASTCache, dump_ast, load_ast
+from ASTNodes import Node, node_position
+from BatchCompiler import compile_batch
+from CompilerSession import CompilerSession
+from Runner import BACKENDS
+from tests.test_inliner import OUTPUT, SOURCE
+
+
+def walk(value):
+    if isinstance(value, list):
+        for item in value:
+            yield from walk(item)
+    elif isinstance(value, Node):
+        yield value
+        for child in value.children():
+            yield from walk(child)
+
+
+def test_checked_ast_round_trips_with_shared_symbols():
+    session = CompilerSession(optimize=False)
+    result = session.compile(SOURCE)
+    copy = load_ast(dump_ast(result.ast, checked=True))
+    assert copy == result.ast
+    originals, copies = list(walk(result.ast)), list(walk(copy))
+    assert [(node_position(n), n.ty) for n in copies] == [(node_position(n), n.ty) for n in originals]
+    # Una función y sus llamadas siguen compartiendo el mismo símbolo
+    factorial = copy.functions[0]
+    calls = [n for n in walk(factorial) if n.tag == 'call' and n.name == 'factorial']
+    assert calls and all(call.sym is factorial.sym for call in calls)
+    # Sin checked sólo viajan la forma y las posiciones
+    plain = load_ast(dump_ast(result.ast))
+    assert plain == result.ast and all(n.sym is None and n.ty is None for n in walk(plain))
+
+
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+def test_second_compile_skips_the_front_end(tmp_path, monkeypatch, backend):
+    cache = ASTCache(str(tmp_path))
+    first = CompilerSession(cache=cache).compile(SOURCE)
+    assert cache.stats() == {'hits': 0, 'misses': 1, 'stores': 1, 'evictions': 0}
+
+    session = CompilerSession(cache=cache)
+    monkeypatch.setattr(session.parser, 'parse', None)  # Un acierto no debe llegar al parser
+    second = session.compile(SOURCE)
+    assert cache.hits == 1
+    assert second.ast == first.ast and second.stats == first.stats
+    assert [w.format() for w in second.warnings] == [w.format() for w in first.warnings]
+
+    out = io.StringIO()
+    BACKENDS[backend](second.ast, second.frame_sizes, out).run()
+    assert out.getvalue() == OUTPUT
+
+
+def test_key_depends_on_source_grammar_and_front_end(tmp_path, monkeypatch):
+    cache = ASTCache(str(tmp_path))
+    session = CompilerSession(cache=cache)
+    ast = session.parse(SOURCE)
+    assert session.parse(SOURCE) == ast and cache.hits == 1
+    assert session.parse(SOURCE + "\n") == ast and cache.hits == 1
+    assert CompilerSession('left', cache=cache).parse(SOURCE) is not None and cache.hits == 1
+    monkeypatch.setattr(ast_cache_module, '_front_end_version', 'otra')
+    session.parse(SOURCE)
+    assert cache.hits == 1 and cache.misses == 4
+    # Las fuentes con errores no se guardan
+    assert session.parse("void main() { int x = ; }") is None
+    assert session.parse("void main() { int x = ; }") is None and cache.hits == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ASTCache(str(tmp_path))
+    sources = [f"void main() {{ print({i}); }}" for i in range(4)]
+    for source in sources[:3]:
+        CompilerSession(cache=cache).parse(source)
+    paths = [os.path.join(str(tmp_path), cache.key(source) + '.evast') for source in sources]
+    for second, path in enumerate(paths[:3], 1):
+        os.utime(path, (second, second))
+    cache.max_bytes = sum(os.path.getsize(path) for path in paths[:3])
+
+    assert CompilerSession(cache=cache).parse(sources[0]) is not None  # Renueva la primera
+    CompilerSession(cache=cache).parse(sources[3])
+    # Se baja hasta EVICT_TO de max_bytes: caen las dos más viejas, no sólo una
+    assert [os.path.exists(path) for path in paths] == [True, False, False, True]
+    assert cache.evictions == 2
+    assert cache.format_stats() == \
+        "Caché de AST: 1 aciertos, 4 fallos (20% de aciertos), 4 guardados, 2 desalojados"
+
+
+def test_directory_is_scanned_only_to_evict(tmp_path, monkeypatch):
+    scans = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(ast_cache_module.os, 'scandir', lambda path: scans.append(path) or real_scandir(path))
+    cache = ASTCache(str(tmp_path))
+    session = CompilerSession(cache=cache)
+    sources = [f"void main() {{ print({i}); }}" for i in range(15)]
+    for source in sources[:10]:
+        session.parse(source)
+    assert len(scans) == 1  # Sólo el recorrido inicial
+    size = os.path.getsize(os.path.join(str(tmp_path), cache.key(sources[0]) + '.evast'))
+
+    cache.max_bytes = size * 12
+    for source in sources[10:]:
+        session.parse(source)
+    # La entrada 13 pasa el límite: se desaloja hasta 9, y las dos siguientes entran sin recorrer
+    assert len(scans) == 2 and cache.evictions == 4
+    assert len(os.listdir(str(tmp_path))) == 11
+
+
+def test_corrupt_entries_are_discarded(tmp_path, capsys):
+    cache = ASTCache(str(tmp_path))
+    session = CompilerSession(cache=cache)
+    ast = session.parse(SOURCE)
+    path = os.path.join(str(tmp_path), cache.key(SOURCE) + '.evast')
+    with open(path, 'wb') as f:
+        f.write(b"EVAS\x01\x00basura")
+    assert session.parse(SOURCE) == ast
+    assert cache.misses == 2 and "se descarta" in capsys.readouterr().err
+
+
+def test_batch_reuses_the_cache_across_runs(tmp_path):
+    (tmp_path / 'src').mkdir()
+    paths = []
+    for i in range(4):
+        path = tmp_path / 'src' / f'p{i}.evl'
+        path.write_text(f"void main() {{ print({i}); }}\n", encoding='utf-8')
+        paths.append(str(path))
+    directory = str(tmp_path / 'cache')
+    first = list(compile_batch(paths, jobs=2, cache_directory=directory))
+    second = list(compile_batch(paths, jobs=2, cache_directory=directory))
+    assert not any(r['cached'] for r in first)
+    assert all(r['cached'] and not r['errors'] for r in second)
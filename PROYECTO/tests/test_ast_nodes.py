@@ -0,0 +1,43 @@
+# PROYECTO/tests/test_ast_nodes.py
+
+import pickle
+
+import pytest
+
+from ASTNodes import KIND, Node, node_at
+
+
+def test_nodes_behave_like_the_old_tuples():
+    expr = node_at((1, 9), '+', node_at((1, 7), 'id', 'x'), node_at((1, 11), 'number', 2))
+    stmt = node_at((1, 3), 'assignment', 'x', expr)
+
+    assert stmt == ('assignment', 'x', ('+', ('id', 'x'), ('number', 2)))
+    assert stmt[0] == 'assignment' and stmt[2][0] == '+'
+    _, name, value = stmt
+    assert (name, value) == ('x', expr)
+    assert stmt[1:] == ('x', expr)
+    assert len(expr) == 3
+    assert stmt.as_tuple() == ('assignment', 'x', ('+', ('id', 'x'), ('number', 2)))
+    assert type(stmt.as_tuple()[2]) is tuple
+
+
+def test_nodes_are_slotted_and_tagged():
+    node = node_at((4, 2), 'while', node_at(None, 'bool', True), node_at(None, 'block', []))
+    assert isinstance(node, Node)
+    assert not hasattr(node, '__dict__')
+    assert node.kind == KIND['while']
+    assert (node.line, node.col) == (4, 2)
+    assert node.condition.value is True
+
+
+def test_nodes_pickle_round_trip():
+    node = node_at((2, 5), 'print', node_at((2, 11), 'string', "hola"))
+    copy = pickle.loads(pickle.dumps(node))
+    assert copy == node and (copy.line, copy.col) == (2, 5)
+
+
+def test_equal_nodes_are_not_hashable():
+    first = node_at((1, 1), 'id', 'x')
+    assert first == node_at((3, 7), 'id', 'x') == ('id', 'x')
+    with pytest.raises(TypeError):
+        hash(first)
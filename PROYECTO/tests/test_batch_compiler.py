@@ -0,0 +1,29 @@
+# PROYECTO/tests/test_batch_compiler.py
+
+from BatchCompiler import BatchReport, collect_sources, compile_batch
+
+
+def test_batch_compiles_directory_and_merges_report(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    for i in range(10):
+        (tmp_path / f'ok{i}.evl').write_text(f"void main() {{ print({i}); }}\n", encoding='utf-8')
+    (tmp_path / 'sub' / 'bad.evl').write_text("void main() { int x = ; }\n", encoding='utf-8')
+    (tmp_path / 'notas.md').write_text("no es código", encoding='utf-8')
+
+    paths = collect_sources([str(tmp_path)])
+    assert len(paths) == 11
+
+    report = BatchReport()
+    for result in compile_batch(paths, jobs=2, chunk_size=3):
+        report.add(result)
+    report.finish()
+
+    assert sorted(r['path'] for r in report.results) == sorted(paths)
+    assert [r['path'] for r in report.failed] == [str(tmp_path / 'sub' / 'bad.evl')]
+    assert "(sintactico)" in report.to_text()
+
+
+def test_collect_sources_accepts_globs(tmp_path):
+    (tmp_path / 'a.evl').write_text("", encoding='utf-8')
+    (tmp_path / 'b.txt').write_text("", encoding='utf-8')
+    assert collect_sources([str(tmp_path / '*.evl')]) == [str(tmp_path / 'a.evl')]
@@ -0,0 +1,79 @@
+# PROYECTO/tests/test_bytecode.py
+
+import io
+
+from Bytecode import Program
+from CompilerSession import CompilerSession
+from Interpreter import Interpreter
+from VM import VM
+
+SOURCE = """
+int fib(int n) {
+    if (n < 2) { return n; }
+    return fib(n - 1) + fib(n - 2);
+}
+void main() {
+    int i;
+    for (i = 0; i < 10; i = i + 1) { print(fib(i)); }
+    print("fin" + "!");
+}
+"""
+
+
+def run(program):
+    out = io.StringIO()
+    VM(program, out).run()
+    return out.getvalue()
+
+
+def test_bytecode_round_trips_through_disk(tmp_path):
+    result = CompilerSession().compile(SOURCE)
+    program = VM.from_ast(result.ast, result.frame_sizes).program
+    path = tmp_path / "fib.evbc"
+    program.save(path)
+    loaded = Program.load(path)
+
+    expected = "0\n1\n1\n2\n3\n5\n8\n13\n21\n34\nfin!\n"
+    assert run(program) == run(loaded) == expected
+    assert [f.code for f in loaded.functions] == [f.code for f in program.functions]
+    assert loaded.constants == program.constants
+
+
+def test_constants_are_pooled():
+    # Sin optimizar, para que "fin" + "!" no se pliegue en una sola constante
+    result = CompilerSession(optimize=False).compile(SOURCE)
+    program = VM.from_ast(result.ast, result.frame_sizes).program
+    # 2, 1, 0, 10, "fin", "!": cada literal una sola vez
+    assert sorted(map(repr, program.constants)) == sorted(map(repr, [2, 1, 0, 10, "fin", "!"]))
+    listing = program.disassemble()
+    assert "CALL                  fib" in listing and "JUMP_UNLESS_CONST     [0] < 2" in listing
+
+
+def test_superinstructions_match_the_tree_interpreter():
+    source = """
+    void main() {
+        string s = "";
+        int i = 0;
+        float f = 1;
+        bool seguir = true;
+        while (seguir) {
+            s = s + "ab";
+            s = s + s;
+            i = i + 1;
+            f = f * 2;
+            if (i == 3 || s == "") { seguir = false; }
+        }
+        int j = i;
+        j = j - i;
+        print(s); print(i); print(f); print(j);
+    }
+    """
+    result = CompilerSession(optimize=False).compile(source)
+    program = VM.from_ast(result.ast, result.frame_sizes).program
+    listing = program.disassemble()
+    for op in ('APPEND_CONST', 'APPEND ', 'ADD_CONST', 'UPDATE_CONST', 'UPDATE_LOAD',
+               'STORE_CONST', 'JUMP_IF_SLOT'):
+        assert op in listing
+    out = io.StringIO()
+    Interpreter(result.ast, result.frame_sizes, out).run()
+    assert run(program) == out.getvalue() == "ab" * 14 + "\n3\n8.0\n0\n"
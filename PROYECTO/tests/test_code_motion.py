@@ -0,0 +1,81 @@
+# PROYECTO/tests/test_code_motion.py
+
+import io
+
+import pytest
+
+from CompilerSession import CompilerSession
+from Runner import load_program
+
+SOURCE = """
+int uno() { print("llamada"); return 1; }
+void main() {
+    int n = 4;
+    int m = 3;
+    int d = 2;
+    int _t1 = 5;
+    int total = 0;
+    int i;
+    int j;
+    for (i = 0; i < n * m; i = i + 1) {
+        for (j = 0; j < n; j = j + 1) {
+            total = total + i * m + (n + m) * _t1 + n / d + uno();
+        }
+        int n = i;
+        total = total + n * m;
+    }
+    int a = n * m + 1;
+    int b = n * m + 2;
+    n = 7;
+    int c = n * m;
+    print(total); print(a); print(b); print(c);
+}
+"""
+
+
+def compile_main(source):
+    result = CompilerSession().compile(source)
+    assert result.ok, [d.format() for d in result.errors]
+    return result.ast.functions[-1].block.statements
+
+
+def test_invariants_leave_their_loops():
+    statements = compile_main(SOURCE)
+    outer = next(i for i, stmt in enumerate(statements) if stmt[0] == 'for')
+    hoisted = [stmt for stmt in statements[:outer] if stmt[0] == 'declaration' and
+               stmt.name.startswith('_t') and stmt.name != '_t1']
+    # n * m de la condición y (n + m) * _t1 salen de los dos bucles; n / d no
+    # (d podría ser 0) y nada que contenga la llamada a uno()
+    assert [stmt.init for stmt in hoisted] == [
+        ('*', ('id', 'n'), ('id', 'm')),
+        ('*', ('+', ('id', 'n'), ('id', 'm')), ('id', '_t1')),
+    ]
+    assert statements[outer].condition == ('<', ('id', 'i'), ('id', hoisted[0].name))
+    # El n declarado en el cuerpo es otra variable: n * m no se saca ni se comparte
+    inner_tail = statements[outer].body.statements[-1]
+    assert inner_tail.value == ('+', ('id', 'total'), ('*', ('id', 'n'), ('id', 'm')))
+
+
+def test_repeated_expressions_in_a_block_are_shared():
+    statements = compile_main(SOURCE)
+    decl_a = next(stmt for stmt in statements if stmt[0] == 'declaration' and stmt.name == 'a')
+    decl_c = next(stmt for stmt in statements if stmt[0] == 'declaration' and stmt.name == 'c')
+    temporary = decl_a.init.left
+    assert temporary[0] == 'id' and temporary.name.startswith('_t')
+    assert next(stmt for stmt in statements if stmt[0] == 'declaration' and
+                stmt.name == 'b').init.left == temporary
+    # Después de n = 7 la expresión vale otra cosa
+    assert decl_c.init == ('*', ('id', 'n'), ('id', 'm'))
+
+
+@pytest.mark.parametrize('backend', ['tree', 'vm', 'python', 'asm'])
+def test_moved_code_gives_the_same_output(backend):
+    outputs = []
+    for optimize in (False, True):
+        out = io.StringIO()
+        program, errors = load_program(SOURCE, backend, out, CompilerSession(optimize=optimize))
+        assert not errors
+        program.run()
+        outputs.append(out.getvalue())
+    assert outputs[0] == outputs[1]
+    assert outputs[1].count("llamada") == 48
@@ -0,0 +1,85 @@
+# PROYECTO/tests/test_codegen.py
+
+import io
+
+import pytest
+
+from Codegen import compile_to_assembly, live_intervals, linear_scan, lower_to_tac
+from CompilerSession import CompilerSession
+from IR import build_ir
+from Machine import AssemblyError, Machine, assemble
+from tests.test_interpreter import PROGRAM, EXPECTED
+
+LOOPS = """
+int suma(int n) {
+    int total = 0;
+    int a = n * 2; int b = n * 3; int c = n * 5; int d = n * 7;
+    int i;
+    for (i = 0; i < n; i = i + 1) { total = total + a + b * i - c + d % (i + 1); }
+    return total;
+}
+void main() { print(suma(20)); }
+"""
+
+
+def compile_ok(source):
+    result = CompilerSession().compile(source)
+    assert result.ok, [d.format() for d in result.errors]
+    return result
+
+
+def run_assembly(text):
+    out = io.StringIO()
+    machine = Machine(assemble(text), out)
+    machine.run()
+    return out.getvalue(), machine
+
+
+@pytest.mark.parametrize('registers', [3, 4, 8, 16])
+def test_output_does_not_depend_on_the_register_count(registers):
+    for source, expected in ((PROGRAM, EXPECTED), (LOOPS, "10119\n")):
+        result = compile_ok(source)
+        assembly = compile_to_assembly(result.ast, result.frame_sizes, registers)
+        output, machine = run_assembly(assembly.text)
+        assert output == expected
+        # Sólo se accede al marco si hubo derrames
+        assert (machine.frame_accesses > 0) == (assembly.spills > 0)
+
+
+def test_fewer_registers_spill_more_and_cost_more_cycles():
+    result = compile_ok(LOOPS)
+    spills, cycles = [], []
+    for registers in (3, 5, 16):
+        assembly = compile_to_assembly(result.ast, result.frame_sizes, registers)
+        spills.append(assembly.spills)
+        cycles.append(run_assembly(assembly.text)[1].cycles)
+    assert spills[0] > spills[1] > spills[2] == 0
+    assert cycles[0] > cycles[1] > cycles[2]
+
+
+def test_intervals_sharing_a_register_do_not_overlap():
+    result = compile_ok(LOOPS)
+    for tac in lower_to_tac(build_ir(result.ast, result.frame_sizes, ssa=False)):
+        intervals = live_intervals(tac)
+        slots = linear_scan(intervals, 3)
+        assert slots == sum(1 for interval in intervals if interval.register is None)
+        by_register = {}
+        for interval in intervals:
+            if interval.register is not None:
+                by_register.setdefault(interval.register, []).append(interval)
+        for group in by_register.values():
+            group.sort(key=lambda interval: interval.start)
+            for before, after in zip(group, group[1:]):
+                assert before.end < after.start, (before, after)
+
+
+def test_assembler_reports_malformed_programs():
+    with pytest.raises(AssemblyError, match="Instrucción desconocida: 'push' \\(línea 3\\)"):
+        assemble(".func main params=0 regs=4 frame=0\n    li r0, 1\n    push r0\n.end\n")
+    with pytest.raises(AssemblyError, match="Etiqueta desconocida: 'L9'"):
+        assemble(".func main params=0 regs=4 frame=0\n    jmp L9\n.end\n")
+    program = ('.func main params=0 regs=4 frame=1\n'
+               '    li r0, "a, b; \\"c\\"\\n"\n    st r0, [0]\n    ld r1, [0]\n    print r1\n    ret\n.end\n')
+    output, machine = run_assembly(program)
+    assert output == 'a, b; "c"\n\n'
+    assert (machine.executed, machine.cycles, machine.frame_accesses) == (5, 1 + 3 + 3 + 10 + 4, 2)
@@ -0,0 +1,53 @@
+# PROYECTO/tests/test_compiler_session.py
+
+from CompilerSession import CompilerSession, compile_concurrently
+
+VALID = """
+int suma(int a, int b) { return a + b; }
+void main() { int x = suma(1, 2); print(x); }
+"""
+
+SYNTAX_ERROR = """
+void main() { int x = ; }
+"""
+
+LEXICAL_ERROR = """
+void main() { int x = 1 $ 2; }
+"""
+
+TYPE_ERROR = """
+void main() { int x = "texto"; }
+"""
+
+
+def front_end_errors(result):
+    return result.errors_for('lexico') + result.errors_for('sintactico')
+
+
+def summarize(result):
+    return result.ast, [(d.phase, d.format()) for d in result.errors]
+
+
+def test_session_reports_errors_per_phase():
+    session = CompilerSession()
+    assert session.parse(VALID) is not None and not session.errors
+    assert session.compile(SYNTAX_ERROR).errors_for('sintactico')
+    assert session.compile(LEXICAL_ERROR).errors_for('lexico')
+    assert session.compile(TYPE_ERROR).errors_for('tipo')
+    # Los errores de una compilación no se arrastran a la siguiente
+    assert not front_end_errors(session.compile(VALID))
+
+
+def test_sessions_do_not_share_lexer_state():
+    first, second = CompilerSession(), CompilerSession()
+    first.lexer.input(VALID)
+    assert second.parse(SYNTAX_ERROR) is None
+    assert first.lexer.lexdata == VALID
+
+
+def test_concurrent_compilation_matches_sequential():
+    sources = [VALID, SYNTAX_ERROR, LEXICAL_ERROR, TYPE_ERROR] * 25
+    session = CompilerSession()
+    expected = [summarize(session.compile(source)) for source in sources]
+    results = compile_concurrently(sources, max_workers=8)
+    assert [summarize(r) for r in results] == expected
@@ -0,0 +1,69 @@
+# PROYECTO/tests/test_dead_code.py
+
+import io
+
+from CompilerSession import CompilerSession
+from Runner import load_program
+
+SOURCE = """
+int nunca_llamada(int n) { return n; }
+int ayuda(int n) { return n + 1; }
+int signo(int n) {
+    if (n < 0) { return 0 - 1; } else { return 1; }
+    print("inalcanzable");
+    return 0;
+}
+void main() {
+    int sin_uso = 2 * 3;
+    int cadena = 1;
+    int usa_cadena = cadena + 1;
+    int con_efecto = ayuda(1);
+    int divide = 1;
+    int puede_fallar = 10 / divide;
+    int x = 5;
+    while (true) {
+        print(signo(x));
+        return;
+    }
+    print("inalcanzable");
+}
+"""
+
+
+def test_dead_code_is_removed_and_reported():
+    # Sin integrar ayuda y signo: la llamada es la que mantiene viva a con_efecto
+    result = CompilerSession(inline=False).compile(SOURCE)
+    assert result.ok
+    assert [func[0] == 'function' and func.name for func in result.ast.functions] == \
+        ['ayuda', 'signo', False]
+    signo = result.ast.functions[1]
+    assert len(signo.block.statements) == 1
+
+    main = result.ast.functions[-1]
+    declared = [stmt.name for stmt in main.block.statements if stmt[0] == 'declaration']
+    # Se conservan los inicializadores con llamadas o divisiones que pueden fallar
+    assert declared == ['con_efecto', 'divide', 'puede_fallar', 'x']
+    assert main.block.statements[-1][0] == 'while'
+
+    messages = [(d.line, d.message) for d in result.warnings]
+    assert messages == [
+        (6, "Código inalcanzable: se eliminaron 2 instrucciones"),
+        (21, "Código inalcanzable: se eliminó 1 instrucción"),
+        (2, "La función 'nunca_llamada' no se usa desde main; se eliminó"),
+        (10, "La variable 'sin_uso' no se lee; se eliminó"),
+        (12, "La variable 'usa_cadena' no se lee; se eliminó"),
+        # Sólo se lee desde usa_cadena: cae en la segunda vuelta
+        (11, "La variable 'cadena' no se lee; se eliminó"),
+    ]
+    assert all(d.format().startswith("Aviso de optimización") for d in result.warnings)
+
+
+def test_pruned_program_runs_the_same():
+    outputs = []
+    for optimize in (False, True):
+        out = io.StringIO()
+        program, errors = load_program(SOURCE, 'vm', out, CompilerSession(optimize=optimize))
+        assert not errors
+        program.run()
+        outputs.append(out.getvalue())
+    assert outputs == ["1\n", "1\n"]
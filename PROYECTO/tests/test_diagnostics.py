@@ -0,0 +1,50 @@
+# PROYECTO/tests/test_diagnostics.py
+
+from Diagnostics import DiagnosticCollector, LineIndex
+from CompilerSession import CompilerSession
+from Lexer import lexer
+from Parser import parser
+
+
+def test_line_index_positions():
+    index = LineIndex("ab\ncd\n\nxyz")
+    assert index.position(0) == (1, 1)
+    assert index.position(4) == (2, 2)
+    assert index.position(6) == (3, 1)
+    assert index.position(9) == (4, 3)
+    assert index.line_text(2) == "cd"
+    assert index.line_text(4) == "xyz"
+
+
+def test_lexical_error_keeps_previous_text_format():
+    session = CompilerSession()
+    session.parse("void main() {\n    int x = 1 $ 2;\n}")
+    [diagnostic] = session.diagnostics.for_phase('lexico')
+    assert (diagnostic.line, diagnostic.column) == (2, 15)
+    assert diagnostic.format() == ("Error léxico en línea 2: Carácter ilegal '$'\n"
+                                   "    int x = 1 $ 2;\n"
+                                   "              ^")
+
+
+def test_flush_writes_each_phase_once(tmp_path):
+    collector = DiagnosticCollector("a\nb")
+    collector.report('sintactico', "Token inesperado 'b' de tipo 'ID'", offset=2)
+    collector.report('sintactico', "Fin de archivo inesperado")
+    target = tmp_path / 'errores_sintacticos.txt'
+    collector.flush({'sintactico': str(target), 'lexico': str(tmp_path / 'lex.txt')})
+    assert target.read_text(encoding='utf-8') == (
+        "Error sintáctico en línea 2: Token inesperado 'b' de tipo 'ID'\nb\n^\n\n"
+        "Error sintáctico: Fin de archivo inesperado\n\n")
+    assert not (tmp_path / 'lex.txt').exists()
+
+
+def test_global_lexer_starts_each_input_with_an_empty_collector():
+    source = "void main() {\n    int x = 1 $ 2;\n    int = 3;\n}"
+    for _ in range(3):
+        parser.parse(source, lexer=lexer)
+        assert [d.phase for d in lexer.diagnostics] == ['lexico', 'sintactico']
+    # Los clones de las sesiones no vacían el colector global ni comparten el suyo
+    session = CompilerSession()
+    session.parse("void main() { print(1); }")
+    assert len(lexer.diagnostics) == 2 and not session.diagnostics.errors
+    lexer.input("")
@@ -0,0 +1,70 @@
+# PROYECTO/tests/test_fast_lexer.py
+
+from ASTNodes import Node, node_position
+from CompilerSession import CompilerSession
+from Diagnostics import DiagnosticCollector, LineIndex
+from FastLexer import TokenStream, tokenize
+from Lexer import lexer
+from tests.test_interpreter import PROGRAM
+
+TRICKY = ('int a = 1; $ "x\\"y\\n" /* bloque\n de dos líneas */ // fin\n'
+          '\tx==y!=z<=1.5 && b || c>=d % 2 # \n\n  ')
+
+
+def ply_tokens(source):
+    lx = lexer.clone()
+    lx.diagnostics = DiagnosticCollector()
+    lx.diagnostics.reset(source)
+    lx.input(source)
+    index = LineIndex(source)
+    tokens = [(tok.type, tok.value, tok.lexpos) + index.position(tok.lexpos)
+              for tok in iter(lx.token, None)]
+    return tokens, [d.format() for d in lx.diagnostics.errors]
+
+
+def fast_tokens(source):
+    diagnostics = DiagnosticCollector()
+    diagnostics.reset(source)
+    tokens = [(tok.type, tok.value, tok.lexpos, tok.lineno, tok.col)
+              for tok in TokenStream(tokenize(source, diagnostics))]
+    return tokens, [d.format() for d in diagnostics.errors]
+
+
+def test_same_tokens_and_errors_as_ply():
+    for source in (PROGRAM, TRICKY, "", "   \n\t", '"sin cerrar', "x // al final"):
+        assert fast_tokens(source) == ply_tokens(source)
+    _, errors = fast_tokens(TRICKY)
+    assert len(errors) == 2 and "Carácter ilegal '$'" in errors[0]
+
+
+def test_arrays_keep_values_only_where_needed():
+    tokens = tokenize('int x = 42; print("hola");')
+    assert [tokens.type_name(i) for i in range(len(tokens))] == \
+        ['INT', 'ID', 'EQUALS', 'INT_NUM', 'SEMI', 'PRINT', 'LPAREN', 'STRING_LITERAL', 'RPAREN', 'SEMI']
+    assert list(tokens.offsets[:4]) == [0, 4, 6, 8]
+    assert tokens.values[:4] == [None, 'x', None, 42]
+    assert tokens.value(0) == 'int' and tokens.value(2) == '=' and tokens.value(7) == 'hola'
+
+
+def test_parser_builds_the_same_ast():
+    plain = CompilerSession().parse(PROGRAM)
+    fast = CompilerSession(fast_lexer=True).parse(PROGRAM)
+    assert fast == plain
+
+    def positions(value):
+        if isinstance(value, list):
+            for item in value:
+                yield from positions(item)
+        elif isinstance(value, Node):
+            yield value.tag, node_position(value)
+            for child in value.children():
+                yield from positions(child)
+    assert list(positions(fast)) == list(positions(plain))
+
+
+def test_syntax_errors_match():
+    source = "void main() {\n  int x = ;\n}\n"
+    plain = CompilerSession().compile(source)
+    fast = CompilerSession(fast_lexer=True).compile(source)
+    assert [d.format() for d in fast.errors] == [d.format() for d in plain.errors]
+    assert fast.errors
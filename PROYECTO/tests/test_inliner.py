@@ -0,0 +1,93 @@
+# PROYECTO/tests/test_inliner.py
+
+import io
+
+import pytest
+
+from CompilerSession import CompilerSession
+from Runner import BACKENDS, format_stats, load_program
+
+SOURCE = """
+int factorial(int n) {
+    if (n <= 1) { return 1; }
+    return n * factorial(n - 1);
+}
+int suma_hasta(int n, int total) {
+    if (n == 0) { return total; }
+    return suma_hasta(n - 1, total + n);
+}
+int fib(int n) {
+    if (n < 2) { return n; }
+    return fib(n - 1) + fib(n - 2);
+}
+int cuadrado(int x) { return x * x; }
+float mitad(int a) { float m = a / 2.0; print(m); return m; }
+void main() {
+    print(factorial(20));
+    print(suma_hasta(50000, 0));
+    print(fib(10));
+    print(cuadrado(7) + cuadrado(3));
+    float z = mitad(9);
+    print(z);
+}
+"""
+
+OUTPUT = "2432902008176640000\n1250025000\n55\n58\n4.5\n4.5\n"
+
+
+def compile_ok(source, **options):
+    result = CompilerSession(**options).compile(source)
+    assert result.ok, [d.format() for d in result.errors]
+    return result
+
+
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+def test_tail_calls_run_without_recursion(backend):
+    # suma_hasta llega a 50000 llamadas anidadas: sólo termina como bucle
+    out = io.StringIO()
+    program, errors = load_program(SOURCE, backend, out)
+    assert not errors
+    program.run()
+    assert out.getvalue() == OUTPUT
+
+
+def test_calls_are_counted_and_reported():
+    result = compile_ok(SOURCE)
+    # factorial (acumulando el producto) y suma_hasta; fib no está en posición final
+    assert result.stats['tail_calls'] == 2
+    # cuadrado dos veces, dentro de la expresión, y mitad antes de la declaración de z
+    assert result.stats['inlined'] == 3
+    assert format_stats(result.stats).startswith(
+        "Optimización: 3 llamadas integradas, 2 llamadas finales convertidas en bucle")
+    messages = [d.message for d in result.warnings]
+    assert "La función 'cuadrado' quedó integrada en todas sus llamadas; se eliminó" in messages
+    assert not any("'_t" in message for message in messages)
+
+    names = [func.name for func in result.ast.functions if func[0] == 'function']
+    assert names == ['factorial', 'suma_hasta', 'fib']
+    factorial = result.ast.functions[0]
+    assert [stmt[0] for stmt in factorial.block.statements] == \
+        ['declaration', 'declaration', 'while', 'return']
+
+
+def test_recursive_and_large_functions_are_not_inlined():
+    source = """
+    int par(int n) { if (n == 0) { return 1; } return impar(n - 1); }
+    int impar(int n) { if (n == 0) { return 0; } return par(n - 1); }
+    int grande(int n) {
+        int a = n + 1; int b = a * 2; int c = b - a; int d = c * c;
+        print(a); print(b); print(c); print(d);
+        return a + b + c + d;
+    }
+    void main() { print(par(6)); print(grande(2)); }
+    """
+    result = compile_ok(source)
+    assert result.stats['inlined'] == 0 and result.stats['tail_calls'] == 0
+    main = result.ast.functions[-1]
+    assert [stmt.value[0] for stmt in main.block.statements] == ['call', 'call']
+
+
+def test_inlining_can_be_disabled():
+    result = compile_ok(SOURCE, inline=False)
+    assert result.stats['inlined'] == result.stats['tail_calls'] == 0
+    assert len(result.ast.functions) == 6
@@ -0,0 +1,80 @@
+# PROYECTO/tests/test_interpreter.py
+
+import io
+import sys
+
+import pytest
+
+from CompilerSession import CompilerSession
+from Runner import load_program
+from Runtime import EvolaRuntimeError
+
+PROGRAM = """
+int factorial(int n) {
+    if (n < 2) { return 1; } else { return n * factorial(n - 1); }
+}
+float mitad(int x) { return x / 2; }
+void main() {
+    print(factorial(5));
+    print(7 / 2); print(0 - 7 / 2); print((0 - 7) % 3); print(7.0 / 2);
+    print(mitad(5));
+    int t = 3.9; print(t);
+    string s = "a"; int i; bool b;
+    for (i = 0; i < 3; i = i + 1) { s = s + "b"; }
+    print(s); print(i > 2 && s == "abbb"); print(b);
+    while (true) { if (i > 5) { print(i); return; } i = i + 1; }
+    print("no llega");
+}
+"""
+
+EXPECTED = "120\n3\n-3\n-1\n3.5\n2.0\n3\nabbb\ntrue\nfalse\n6\n"
+
+
+def run(source, backend='tree'):
+    out = io.StringIO()
+    program, errors = load_program(source, backend, out=out)
+    assert not errors, [d.format() for d in errors]
+    program.run()
+    return out.getvalue()
+
+
+@pytest.mark.parametrize('backend', ['tree', 'vm', 'python', 'asm'])
+def test_program_output(backend):
+    assert run(PROGRAM, backend) == EXPECTED
+
+
+@pytest.mark.parametrize('backend', ['tree', 'vm', 'python', 'asm'])
+def test_runtime_errors(backend):
+    with pytest.raises(EvolaRuntimeError, match="División por cero"):
+        run("void main() { int z = 0; print(1 / z); }", backend)
+
+
+@pytest.mark.parametrize('backend', ['tree', 'vm', 'python', 'asm'])
+def test_reused_slots_never_leak_the_previous_value(backend):
+    # Los dos bloques comparten ranura: b no puede ver el 41 que dejó a
+    program, errors = load_program("void main() { if (true) { int a = 41; print(a); } "
+                                   "if (true) { int b = b + 1; print(b); } }", backend)
+    assert program is None
+    assert [d.phase for d in errors] == ['ambito'] and "propio inicializador" in errors[0].message
+    assert run("void main() { if (true) { int a = 41; print(a); } "
+               "if (true) { int b; print(b + 1); } }", backend) == "41\n1\n"
+
+
+@pytest.mark.parametrize('backend', ['tree', 'python'])
+def test_recursion_limit_is_restored(backend):
+    limit = sys.getrecursionlimit()
+    session = CompilerSession(optimize=False)  # Sin optimizar, la recursión no se vuelve un bucle
+    program, _ = load_program("int f(int n) { if (n == 0) { return 0; } return 1 + f(n - 1); } "
+                              "void main() { print(f(500)); }", backend, io.StringIO(), session)
+    program.run()
+    assert sys.getrecursionlimit() == limit
+    program, _ = load_program("int f(int n) { return 1 + f(n + 1); } void main() { print(f(0)); }",
+                              backend, io.StringIO(), session)
+    with pytest.raises(EvolaRuntimeError, match="Recursión demasiado profunda"):
+        program.run()
+    assert sys.getrecursionlimit() == limit
+
+
+def test_checked_programs_only():
+    program, errors = load_program("void main() { print(x); }")
+    assert program is None and errors[0].phase == 'ambito'
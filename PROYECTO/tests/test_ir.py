@@ -0,0 +1,66 @@
+# PROYECTO/tests/test_ir.py
+
+from CompilerSession import CompilerSession
+from IR import build_ir
+from SSA import dominates
+
+SOURCE = """
+int suma(int n) {
+    int total = 0;
+    int i;
+    for (i = 0; i < n && total < 100; i = i + 1) {
+        if (i % 2 == 0) { total = total + i; } else { int x = i; total = total - x; }
+    }
+    return total;
+    print(total);
+}
+void main() { float f = suma(10); print(f); }
+"""
+
+
+def build(source, ssa=True):
+    result = CompilerSession(optimize=False).compile(source)
+    assert result.ok, [d.format() for d in result.errors]
+    return build_ir(result.ast, result.frame_sizes, ssa=ssa)
+
+
+def instructions(function):
+    for block in function.blocks:
+        yield from block.phis
+        yield from block.instrs
+        yield block.terminator
+
+
+def test_every_block_ends_in_one_terminator_and_edges_agree():
+    function = build(SOURCE, ssa=False).function('suma')
+    for block in function.blocks:
+        assert block.terminator.op in ('jump', 'branch', 'return')
+        assert all(instr.op not in ('jump', 'branch', 'return') for instr in block.instrs)
+        assert block.succs == block.terminator.targets
+        for succ in block.succs:
+            assert block in succ.preds
+    # El print después del return no tiene camino desde la entrada
+    assert not any(instr.op == 'print' for instr in instructions(function))
+
+
+def test_ssa_assigns_each_version_once_and_phis_match_predecessors():
+    module = build(SOURCE)
+    for function in module.functions:
+        dests = [instr.dest for instr in instructions(function) if instr.dest is not None]
+        assert len(dests) == len(set(dests))
+        for block in function.blocks:
+            for phi in block.phis:
+                assert len(phi.args) == len(block.preds) and None not in phi.args
+
+    suma = module.function('suma')
+    header = suma.blocks[1]
+    assert {phi.dest.name for phi in header.phis} >= {'total_1', 'i_2'}
+    # La cabecera del bucle domina todo el cuerpo y lo que sigue
+    assert all(dominates(suma, header.index, b.index) for b in suma.blocks[1:])
+    assert 'phi' in module.dump() and 'to_float' in module.dump()
+
+
+def test_phases_are_timed():
+    module = build(SOURCE)
+    assert set(module.timings) == {'grafo', 'dominadores', 'fronteras', 'phi', 'renombrado'}
+    assert "instrucciones" in module.timing_report()
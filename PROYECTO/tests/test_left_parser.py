@@ -0,0 +1,75 @@
+# PROYECTO/tests/test_left_parser.py
+
+import pytest
+
+from Lexer import lexer
+import Parser
+import LeftParser
+from CompilerSession import CompilerSession
+from ASTNodes import is_node
+
+PROGRAMS = [
+    """
+    int suma(int a, int b) {
+        int resultado = a + b - 1 - 2;
+        return resultado;
+    }
+    void main() {
+        int z = suma(1, 2 * 3 / 4 % 5);
+        bool flag = z < 3 == true || z > 4 && false || true;
+        if (flag) { print(z); } else { print(0); }
+        while (z > 0) { z = z - 1; }
+        for (z = 0; z < 3; z = z + 1) { print("i"); }
+        return;
+    }""",
+    """
+    int factorial(int n) {
+        if (n < 2) {
+            return 1;
+        } else {
+            return n * factorial(n - 1);
+        }
+    }
+    void main() {
+        int result = factorial(5);
+        print(result);
+    }""",
+]
+
+
+def parse_with(parser, source):
+    lexer.input(source)
+    lexer.lineno = 1
+    return parser.parse(lexer=lexer)
+
+
+@pytest.mark.parametrize('source', PROGRAMS)
+def test_left_grammar_builds_identical_ast(source):
+    expected = parse_with(Parser.parser, source)
+    assert expected is not None
+    assert parse_with(LeftParser.parser, source) == expected
+
+
+def positions(node):
+    """Recorre el AST y devuelve (tipo, línea, columna) de cada nodo"""
+    if isinstance(node, list):
+        return [pos for child in node for pos in positions(child)]
+    if not is_node(node):
+        return []
+    own = [(node[0], node.line, node.col)]
+    return own + [pos for child in node[1:] for pos in positions(child)]
+
+
+@pytest.mark.parametrize('source', PROGRAMS)
+def test_left_grammar_keeps_node_positions(source):
+    expected = positions(CompilerSession('right').parse(source))
+    assert expected[1][1:] == (2, 9)  # ('function', línea 2, columna del nombre)
+    assert positions(CompilerSession('left').parse(source)) == expected
+
+
+def test_fold_right_matches_right_recursive_chains():
+    assert LeftParser._fold_right(['a']) == 'a'
+    chain = ['a', ('-', (1, 3)), 'b', ('-', (1, 7)), 'c']
+    node = LeftParser._fold_right(chain)
+    assert node == ('-', 'a', ('-', 'b', 'c'))
+    assert (node.line, node.col, node[2].col) == (1, 3, 7)
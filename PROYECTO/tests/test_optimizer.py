@@ -0,0 +1,72 @@
+# PROYECTO/tests/test_optimizer.py
+
+import io
+
+from CompilerSession import CompilerSession
+from Runner import load_program
+
+SOURCE = """
+int doble(int n) { return n * 2; }
+void main() {
+    int x = 2 + 3 * 4;
+    float f = 7 / 2 + 0.5;
+    int y = x * 1 + 0;
+    float g = y * 1.0;
+    bool b = true && x > 3;
+    string s = "a" + "b";
+    if (1 < 2) { print(s); } else { print("nunca"); }
+    if (false) { print("nunca"); }
+    if (true) { int x = 100; print(x); }
+    while (false) { print("nunca"); }
+    int i;
+    for (i = 5; 1 > 2; i = i + 1) { print("nunca"); }
+    print(x); print(f); print(y); print(g); print(b); print(i);
+    print(doble(1 + 1) / 0 == 0);
+}
+"""
+
+
+def optimized_main(source):
+    # Sin integrar doble: la llamada es la que impide plegar la división por cero
+    result = CompilerSession(inline=False).compile(source)
+    assert result.ok, [d.format() for d in result.errors]
+    return result.ast.functions[-1].block.statements
+
+
+def test_constants_and_identities_are_folded():
+    decl_x, decl_f, decl_y, decl_g, decl_b, decl_s = optimized_main(SOURCE)[:6]
+    assert decl_x.init == ('number', 14) and decl_x.init.ty == 'int'
+    # 7 / 2 es división entera (3) antes de sumar el float
+    assert decl_f.init == ('number', 3.5) and decl_f.init.ty == 'float'
+    assert decl_y.init == ('id', 'x')
+    # y * 1.0 es float: reemplazarlo por y cambiaría su tipo
+    assert decl_g.init == ('*', ('id', 'y'), ('number', 1.0))
+    assert decl_b.init == ('>', ('id', 'x'), ('number', 3))
+    assert decl_s.init == ('string', 'ab')
+
+
+def test_constant_conditions_drop_dead_branches():
+    statements = optimized_main(SOURCE)[6:]
+    assert statements[0] == ('print', ('id', 's'))
+    # La rama que declara variables conserva su bloque para no mezclar ámbitos
+    assert statements[1][0] == 'if' and statements[1].else_block is None
+    assert statements[2] == ('declaration', 'int', 'i', None)
+    # Del for sólo queda la inicialización
+    assert statements[3] == ('assignment', 'i', ('number', 5))
+
+
+def test_optimized_program_behaves_like_unoptimized():
+    outputs = []
+    for optimize in (False, True):
+        session = CompilerSession(optimize=optimize)
+        out = io.StringIO()
+        program, errors = load_program(SOURCE.replace(" / 0 == 0", " == 4"), 'tree', out, session)
+        assert not errors
+        program.run()
+        outputs.append(out.getvalue())
+    assert outputs[0] == outputs[1] == "ab\n100\n14\n3.5\n14\n14.0\ntrue\n5\ntrue\n"
+
+
+def test_division_by_zero_is_left_for_run_time():
+    print_stmt = optimized_main(SOURCE)[-1]
+    assert print_stmt.value.left == ('/', ('call', 'doble', [('number', 2)]), ('number', 0))
@@ -0,0 +1,45 @@
+# PROYECTO/tests/test_resolver.py
+
+from CompilerSession import CompilerSession
+
+SOURCE = """
+int suma(int a, int b) {
+    int total = a + b;
+    if (total > 10) { int extra = 1; total = total + extra; }
+    else { int otra = 2; int mas = otra; total = mas; }
+    return total;
+}
+void main() {
+    int i = 0;
+    for (i = 0; i < 3; i = i + 1) { int x = suma(i, 1); print(x); }
+}
+"""
+
+
+def test_declarations_and_uses_share_addresses():
+    # Sin integrar suma en main: interesan las direcciones dentro de suma
+    result = CompilerSession(inline=False).compile(SOURCE)
+    assert result.ok
+    suma, main = result.ast.functions
+    a, b = suma.params
+    decl_total, if_stmt, return_stmt = suma.block.statements
+    assert (a.addr, b.addr, decl_total.addr) == ((0, 0), (0, 1), (0, 2))
+    assert decl_total.init.left.addr == a.addr and decl_total.init.right.addr == b.addr
+    assert return_stmt.value.addr == decl_total.addr
+
+    extra, assign = if_stmt.then_block.statements
+    assert extra.addr == (1, 3)
+    assert assign.addr == decl_total.addr and assign.value.right.addr == extra.addr
+    # El bloque else reutiliza las ranuras liberadas por el then
+    otra, mas, _ = if_stmt.else_block.statements
+    assert (otra.addr, mas.addr) == ((1, 3), (1, 4))
+    assert result.frame_sizes == {'suma': 5, 'main': 2}
+
+    decl_i, for_stmt = main.block.statements
+    assert for_stmt.init.addr == for_stmt.update.value.left.addr == decl_i.addr
+    assert for_stmt.body.statements[0].addr == (1, 1)
+
+
+def test_invalid_programs_are_not_resolved():
+    result = CompilerSession().compile("void main() { print(y); }")
+    assert result.errors_for('ambito') and result.frame_sizes is None
@@ -0,0 +1,57 @@
+# PROYECTO/tests/test_semantic_analyzer.py
+
+from CompilerSession import CompilerSession
+from SemanticAnalyzer import SemanticAnalyzer
+
+
+def analyze(source):
+    ast = CompilerSession().parse(source)
+    analyzer = SemanticAnalyzer()
+    analyzer.check_program(ast)
+    return ast, analyzer
+
+
+def test_nodes_are_annotated_with_symbol_and_type():
+    ast, analyzer = analyze("""
+    float escala(int a) { return a * 1.5; }
+    void main() { int x = 2; float y = escala(x) + x; print(y); }
+    """)
+    assert not analyzer.scope_errors and not analyzer.get_errors()
+
+    main_block = ast.functions[1].block
+    decl_x, decl_y, print_y = main_block.statements
+    assert decl_x.sym['type'] == 'int' and decl_x.ty == 'int'
+    add = decl_y.init
+    assert add.ty == 'float'
+    call, x_use = add.left, add.right
+    assert call.sym is ast.functions[0].sym and call.ty == 'float'
+    assert x_use.sym is decl_x.sym and x_use.ty == 'int'
+    assert print_y.value.sym is decl_y.sym
+
+
+def test_block_scopes_are_nested():
+    ast, analyzer = analyze("""
+    void main() {
+        int x = 1;
+        if (x > 0) { int y = x; print(y); } else { int y = 2; print(y); }
+        while (x < 3) { int x = 5; print(x); }
+        print(y);
+    }
+    """)
+    # Cada rama declara su propia 'y'; el 'x' del while oculta al de afuera
+    assert analyzer.get_scope_errors() == [
+        "Error: La variable 'y' no está declarada en este ámbito (línea 6, columna 15)"]
+    assert not analyzer.get_errors()  # Sin errores de tipo en cascada
+    decl_x, if_stmt, while_stmt, _ = ast.functions[0].block.statements
+    inner_x = while_stmt.body.statements[0]
+    assert while_stmt.condition.left.sym is decl_x.sym
+    assert while_stmt.body.statements[1].value.sym is inner_x.sym is not decl_x.sym
+
+
+def test_scope_and_type_errors_are_collected_together():
+    _, analyzer = analyze("""
+    int f(int a) { return a; }
+    void main() { int x = 1; int x = 2; string s = f(x, 1); z = "a"; if (x) { print(1); } }
+    """)
+    assert len(analyzer.scope_errors) == 3
+    assert analyzer.get_errors() == ["If statement condition must be boolean, got 'int'."]
@@ -0,0 +1,65 @@
+# PROYECTO/tests/test_source_stream.py
+
+import pytest
+
+from CompilerSession import CompilerSession
+from Diagnostics import DiagnosticCollector
+from FastLexer import TokenStream, tokenize
+from SourceStream import ChunkedTokenStream, mapped_chunks
+from tests.test_fast_lexer import TRICKY
+from tests.test_interpreter import PROGRAM
+
+# Cadenas y comentarios que cruzan pedazos, UTF-8 de dos bytes y un número partido
+ACROSS = ('string s = "ñandú \\"con\\" comillas\n y salto";\n'
+          '/* comentario largo: ' + 'á' * 40 + ' */ float f = 12.5; x == y;\n'
+          '"sin cerrar\n /* tampoco')
+
+
+def write(tmp_path, source):
+    path = tmp_path / "fuente.txt"
+    path.write_bytes(source.encode('utf-8'))
+    return str(path)
+
+
+def located(diagnostics):
+    return [(d.line, d.column, d.message) for d in diagnostics.errors]
+
+
+def whole_tokens(source):
+    diagnostics = DiagnosticCollector(source)
+    tokens = [(tok.type, tok.value, tok.lexpos, tok.lineno, tok.col)
+              for tok in TokenStream(tokenize(source, diagnostics))]
+    return tokens, located(diagnostics)
+
+
+def stream_tokens(path, chunk_size):
+    session = CompilerSession()
+    stream = ChunkedTokenStream.from_file(path, session.diagnostics, chunk_size)
+    session.diagnostics.reset(None, index=stream)
+    tokens = [(tok.type, tok.value, tok.lexpos, tok.lineno, tok.col) for tok in stream]
+    return tokens, located(session.diagnostics)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 1 << 20])
+def test_tokens_do_not_depend_on_the_chunk_size(tmp_path, chunk_size):
+    for source in (PROGRAM, TRICKY, ACROSS, "", " \n\t"):
+        path = write(tmp_path, source)
+        assert stream_tokens(path, chunk_size) == whole_tokens(source)
+
+
+def test_chunks_decode_split_utf8(tmp_path):
+    path = write(tmp_path, "ñ" * 10)
+    assert "".join(mapped_chunks(path, 3)) == "ñ" * 10
+    assert list(mapped_chunks(write(tmp_path, ""), 3)) == []
+
+
+def test_compile_file_matches_compile(tmp_path):
+    plain = CompilerSession().compile(PROGRAM)
+    streamed = CompilerSession().compile_file(write(tmp_path, PROGRAM), chunk_size=5)
+    assert streamed.ok and streamed.ast == plain.ast
+    assert streamed.frame_sizes == plain.frame_sizes
+
+    source = "void main() {\n  int x = ;\n}\n"
+    plain = CompilerSession().compile(source)
+    streamed = CompilerSession().compile_file(write(tmp_path, source))
+    assert [d.format() for d in streamed.errors] == [d.format() for d in plain.errors]
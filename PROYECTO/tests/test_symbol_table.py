@@ -0,0 +1,63 @@
+# PROYECTO/tests/test_symbol_table.py
+
+from ScopeChecker import SymbolTable
+
+
+class CopyingSymbolTable(SymbolTable):
+    """Historial como antes: copia todos los ámbitos y funciones en cada cambio"""
+    def _record_scope_state(self, action):
+        self.copied_history.append({
+            'action': action,
+            'scopes': [dict(scope) for scope in self.scope_stack],
+            'functions': dict(self.functions),
+        })
+
+
+def copied_report(history):
+    report = ["=== HISTORIAL DE ÁMBITOS ==="]
+    for i, state in enumerate(history, 1):
+        report.append(f"\nPaso {i}: {state['action']}")
+        for j, scope in enumerate(state['scopes']):
+            scope_name = "Global" if j == 0 else f"Local {j}"
+            vars_in_scope = [f"{name} (tipo: {info['type']})" for name, info in scope.items()]
+            report.append(f"  {scope_name}: {', '.join(vars_in_scope) if vars_in_scope else '(vacío)'}")
+        if state['functions']:
+            report.append("  Funciones: " + ", ".join(state['functions'].keys()))
+    return "\n".join(report)
+
+
+def exercise(table):
+    table.add_variable('g', 'int')
+    table.add_function('f', [('int', 'a')], 'int')
+    table.enter_scope()
+    table.add_variable('a', 'int')
+    table.enter_scope()
+    table.add_variable('b', 'float')
+    table.exit_scope()
+    table.add_variable('c', 'string')  # Después de cerrar el ámbito interno
+    table.enter_scope()
+    table.add_variable('b', 'bool')
+    table.exit_scope()
+    table.exit_scope()
+    table.add_function('main', [], 'void')
+    table.add_variable('h', 'bool')
+
+
+def test_history_report_matches_full_copies():
+    table = SymbolTable(record_history=True)
+    exercise(table)
+
+    reference = CopyingSymbolTable(record_history=True)
+    reference.copied_history = []
+    exercise(reference)
+
+    assert len(table.scope_history) == len(reference.copied_history) == 14
+    assert table.get_scope_history_report() == copied_report(reference.copied_history)
+
+
+def test_history_is_opt_in():
+    table = SymbolTable()
+    exercise(table)
+    assert table.scope_history == []
+    assert table.lookup_variable('h')['type'] == 'bool'
+    assert table.lookup_variable('a') is None
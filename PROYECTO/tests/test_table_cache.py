@@ -0,0 +1,23 @@
+# PROYECTO/tests/test_table_cache.py
+
+import Parser
+import TableCache
+
+
+def test_grammar_hash_is_stable():
+    assert TableCache.grammar_hash(Parser) == TableCache.grammar_hash(Parser)
+
+
+def test_tables_are_built_once_and_reused(tmp_path, monkeypatch):
+    monkeypatch.setenv('EVOLA_CACHE_DIR', str(tmp_path))
+
+    TableCache.build_parser(Parser, debug=False)
+    assert TableCache.TABLE_STATS['Parser']['cache_hit'] is False
+    assert list(tmp_path.glob('parser-*.pickle'))
+
+    parser = TableCache.build_parser(Parser, debug=False)
+    assert TableCache.TABLE_STATS['Parser']['cache_hit'] is True
+
+    Parser.lexer.input("void main() { int x = 1 + 2; print(x); }")
+    ast = parser.parse(lexer=Parser.lexer)
+    assert ast[0] == 'program'
@@ -0,0 +1,81 @@
+# PROYECTO/tests/test_token_dump.py
+
+import pytest
+
+from ASTBuilder import ASTBuilder
+from CompilerSession import CompilerSession
+from TokenDump import TokenDump, TokenDumpError, format_trace, main, read_dump
+from tests.test_interpreter import PROGRAM
+
+
+class TokenList(list):
+    record = list.append
+
+
+def parse_with(*traces):
+    class Both:
+        def record(self, tok):
+            for trace in traces:
+                trace.record(tok)
+    return CompilerSession().parse(PROGRAM, trace=Both())
+
+
+def test_dump_round_trips_the_tokens_the_parser_read():
+    tokens, dump = TokenList(), TokenDump()
+    assert parse_with(tokens, dump) == CompilerSession().parse(PROGRAM)
+    expected = [(tok.type, tok.value, tok.lineno, tok.lexpos) for tok in tokens]
+    data = dump.to_bytes()
+    assert read_dump(data) == expected
+    assert dump.count == len(expected)
+    # Unos cuatro bytes por token, frente a unos cien de la traza de texto
+    assert len(data) * 10 < len(format_trace(expected).encode('utf-8'))
+
+
+def test_large_values_and_gaps_use_longer_varints():
+    class Tok:
+        def __init__(self, type, value, lexpos, lineno):
+            self.type, self.value, self.lexpos, self.lineno = type, value, lexpos, lineno
+    tokens = [Tok('INT_NUM', 2 ** 70, 5, 1), Tok('FLOAT_NUM', 1.0, 100000, 3000),
+              Tok('INT_NUM', 1, 100001, 3000), Tok('STRING_LITERAL', "ñ\n", 100003, 3000)]
+    dump = TokenDump()
+    for tok in tokens:
+        dump.record(tok)
+    decoded = read_dump(dump.to_bytes())
+    assert decoded == [(t.type, t.value, t.lineno, t.lexpos) for t in tokens]
+    assert [type(value) for _, value, _, _ in decoded] == [int, float, int, str]
+
+
+def test_reader_prints_the_text_trace(tmp_path, capsys):
+    builder = ASTBuilder()
+    tokens = TokenList()
+    builder.build_ast(PROGRAM, tokens)
+    builder.parse_trace = [{'type': tok.type, 'value': tok.value, 'lineno': tok.lineno,
+                            'lexpos': tok.lexpos} for tok in tokens]
+    text_path = tmp_path / "parse_trace.txt"
+    builder.save_trace_to_file(str(text_path))
+
+    dump = TokenDump()
+    CompilerSession().parse(PROGRAM, trace=dump)
+    dump_path = tmp_path / "parse_trace.evtk"
+    dump.save(str(dump_path))
+    assert main([str(dump_path)]) == 0
+    assert capsys.readouterr().out == text_path.read_text(encoding='utf-8')
+
+    with pytest.raises(TokenDumpError):
+        read_dump(b"EVTK\x01\x05")
+    (tmp_path / "otro.evtk").write_bytes(b"texto")
+    assert main([str(tmp_path / "otro.evtk")]) == 1
+
+
+@pytest.mark.parametrize('data', [
+    b"EVTK\x01\x01\x02\xff\xfe\x00\x00",             # nombre de tipo con UTF-8 inválido
+    b"EVTK\x01\x01\x02ID\x00\x01\x05\x00\x00\x00",  # índice de tipo fuera de la tabla
+    b"EVTK\x01\x01\x02ID\x00\x01\x00\x03\x00\x00",  # índice de valor fuera de la tabla
+])
+def test_corrupt_dumps_raise_token_dump_error(tmp_path, capsys, data):
+    with pytest.raises(TokenDumpError):
+        read_dump(data)
+    path = tmp_path / "roto.evtk"
+    path.write_bytes(data)
+    assert main([str(path)]) == 1
+    assert str(path) in capsys.readouterr().err
@@ -0,0 +1,59 @@
+# PROYECTO/tests/test_transpiler.py
+
+import io
+import subprocess
+import sys
+from collections import OrderedDict
+
+from CompilerSession import CompilerSession
+import Transpiler
+from Transpiler import CACHE_STATS, PythonProgram, compile_python, standalone_source, transpile
+
+SOURCE = """
+int cuadrado(int x) { return x * x; }
+void main() {
+    int x = 7;
+    if (x > 0) { int x = 2; print(cuadrado(x)); }
+    print(x / 2);
+    float f = x;
+    print(f / 2);
+}
+"""
+EXPECTED = "4\n3\n3.5\n"
+
+
+def test_shadowed_variables_get_distinct_names():
+    python_source = transpile(CompilerSession().compile(SOURCE).ast)
+    assert "x_0 = 7" in python_source and "x_1 = 2" in python_source
+    assert "_int_div(x_0, 2)" in python_source
+
+
+def test_code_objects_are_cached_per_source():
+    result = CompilerSession().compile(SOURCE)
+    before = dict(CACHE_STATS)
+    outputs = []
+    for _ in range(2):
+        out = io.StringIO()
+        PythonProgram.from_ast(result.ast, result.frame_sizes, out).run()
+        outputs.append(out.getvalue())
+    assert outputs == [EXPECTED, EXPECTED]
+    assert CACHE_STATS['hits'] - before['hits'] >= 1
+
+
+def test_code_cache_keeps_only_the_most_recently_used(monkeypatch):
+    monkeypatch.setattr(Transpiler, 'CODE_CACHE', OrderedDict())
+    monkeypatch.setattr(Transpiler, 'CODE_CACHE_SIZE', 2)
+    before = dict(CACHE_STATS)
+    first, second, third = (compile_python(f"x = {i}") for i in range(3))
+    assert len(Transpiler.CODE_CACHE) == 2 and CACHE_STATS['evictions'] - before['evictions'] == 1
+    assert compile_python("x = 1") is second and compile_python("x = 2") is third
+    assert compile_python("x = 0") is not first  # Desalojado: se compila de nuevo
+    assert compile_python("x = 2") is third
+
+
+def test_standalone_module_runs_without_the_compiler(tmp_path):
+    path = tmp_path / "programa.py"
+    path.write_text(standalone_source(CompilerSession().compile(SOURCE).ast), encoding='utf-8')
+    completed = subprocess.run([sys.executable, str(path)], capture_output=True, text=True,
+                               cwd=tmp_path, check=True)
+    assert completed.stdout == EXPECTED
@@ -232,4 +232,3 @@ if __name__ == '__main__':
     # Now the import from PROYECTO.TypeChecker should work
     run_type_checker_tests()
 
-```
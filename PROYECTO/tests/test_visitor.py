@@ -0,0 +1,25 @@
+# PROYECTO/tests/test_visitor.py
+
+from ASTNodes import node_at
+from ScopeChecker import SymbolTable
+from TypeChecker import TypeChecker
+
+
+def test_dispatch_handles_symbolic_and_named_operators():
+    symbols = SymbolTable()
+    symbols.add_variable('x', 'int')
+    checker = TypeChecker(symbols)
+
+    symbolic = node_at((1, 3), '+', node_at((1, 1), 'id', 'x'), node_at((1, 5), 'number', 2.5))
+    assert checker.infer_expression_type(symbolic) == 'float'
+    assert checker.infer_expression_type(('lt', ('id', 'x'), ('number', 1))) == 'bool'
+    assert checker.infer_expression_type(('+', ('string', 'a'), ('string', 'b'))) == 'string'
+    assert not checker.get_errors()
+
+
+def test_dispatch_tables_are_built_per_class():
+    tables = TypeChecker._dispatch_tables
+    assert set(tables) == {'statement', 'expression'}
+    by_kind, by_tag = tables['expression']
+    assert by_tag['plus'] is by_tag['+'] is TypeChecker._infer_binary
+    assert by_kind[node_at(None, 'call', 'f', []).kind] is TypeChecker._infer_call